@@ -6,10 +6,22 @@ import folium
 from folium.plugins import MarkerCluster
 from streamlit_folium import folium_static
 
+from vorges_eat.loader import (
+    enable_copy_on_write,
+    load_data,
+    load_download_csv,
+    load_image,
+    load_search_index,
+)
+from vorges_eat.plotting import for_table
+
+# Copy-on-Write do pandas para os frames compartilhados (ver vorges_eat/loader.py)
+enable_copy_on_write()
+
 st.set_page_config(page_title='Home', page_icon= '📊')
 
 
-image = Image.open('Logo Preto Sem Fundo.png')
+image = load_image('Logo Preto Sem Fundo.png', width=120)
 st.sidebar.image( image, width = 120)
 
 st.sidebar.markdown('# Vorges Eat')
@@ -21,11 +33,12 @@ st.sidebar.write('**Visão:** Entregar e oferecer o melhor serviço de Restauran
 st.sidebar.markdown("""---""")
 st.sidebar.write('Faça o Download dos dados aqui:')
 #===================================== Botão de Download ====================
-data_processed = pd.read_csv('datasets/data_processed.csv')
+# O csv é montado uma vez por processo e compartilhado entre as sessões
+data_processed = load_download_csv()
 
 st.sidebar.download_button(
         label = 'Download',
-        data = data_processed.to_csv( index=False, sep=';'),
+        data = data_processed,
         file_name = 'data_processed',
         mime = 'text/csv'
 )
@@ -34,6 +47,28 @@ st.sidebar.download_button(
 
 st.write('# Vorges Eat Company Dashboard')
 
+#============================= Busca de Restaurantes ==================
+# Busca por nome, localidade ou endereço, com prefixos e erros de digitação
+# (índice invertido e de trigramas, ver vorges_eat/search.py)
+SEARCH_COLUMNS = [
+    'restaurant_name',
+    'cuisines',
+    'city',
+    'country',
+    'locality',
+    'address',
+    'aggregate_rating',
+]
+
+query = st.text_input('Buscar restaurante:', placeholder='Nome, localidade ou endereço')
+if query:
+    positions, _ = load_search_index().search(query, limit=50)
+    if len(positions) == 0:
+        st.write(f'Nenhum restaurante encontrado para "{query}".')
+    else:
+        results = load_data(columns=SEARCH_COLUMNS).take(positions)
+        st.dataframe(for_table(results.reset_index(drop=True)))
+
 #============================= Vídeo Inicial ==========================
 #image2 = Image.open('home.jpg')
 #st.image(image2, caption= 'Seja Bem-Vindo (a)', width=620)
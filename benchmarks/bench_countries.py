@@ -0,0 +1,136 @@
+# Benchmark das métricas da página Países a cada rerun:
+# - linha de base: o código original da página, com os filtros por df.loc
+#   (isin) sobre o dataframe com os tipos originais (texto e float64), as
+#   quatro varreduras dos cartões e os cinco groupby('country') dos gráficos;
+# - as mesmas métricas sobre as linhas do índice de filtros (tipos compactos);
+# - uma seleção no cubo de métricas + duas agregações (total e por país).
+# Também mede a execução completa da página.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_countries
+
+# Libraries
+import glob
+import time
+import timeit
+
+import pandas as pd
+
+from vorges_eat.cube import Cube, build_cube
+from vorges_eat.filters import FilterIndex
+from vorges_eat.loader import load_data
+
+SCALES = [1, 10, 100]
+
+# Seleção padrão da página
+COUNTRIES = ['Brazil', 'England', 'Qatar', 'South Africa', 'Canada', 'Australia']
+PRICE_TYPES = ['expensive', 'gourmet', 'normal', 'cheap']
+
+PAGE = 'pages/1_*Countries.py'
+
+
+# Linha de base (página original): filtros por df.loc e uma passada por
+# métrica
+def metrics_baseline(df):
+    df = df.loc[df['country'].isin(COUNTRIES), :]
+    df = df.loc[df['price_type'].isin(PRICE_TYPES), :]
+    cards = (
+        df['restaurant_id'].shape[0],
+        df.loc[:, 'country'].nunique(),
+        df.loc[:, 'city'].nunique(),
+        df.loc[:, 'cuisines'].nunique(),
+    )
+    charts = [
+        df.loc[:, ['restaurant_id', 'country']].groupby('country').nunique(),
+        df.loc[:, ['city', 'country']].groupby('country').nunique(),
+        df.loc[:, ['votes', 'country']].groupby('country').mean(),
+        df.loc[:, ['average_cost_for_two', 'country']].groupby('country').mean(),
+        df.loc[:, ['aggregate_rating', 'country']].groupby('country').mean(),
+    ]
+    return cards, charts
+
+
+# Dataframe com os tipos originais, antes dos tipos compactos (category e
+# float32) do processamento
+def original_dtypes(df):
+    dtypes = {}
+    for col, dtype in df.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            dtypes[col] = object
+        elif dtype == 'float32':
+            dtypes[col] = 'float64'
+    return df.astype(dtypes)
+
+
+# Uma passada por métrica sobre as linhas do índice de filtros
+def metrics_groupby(df, index):
+    df = df.take(index.select(country=COUNTRIES, price_type=PRICE_TYPES))
+    cards = (
+        df['restaurant_id'].shape[0],
+        df['country'].nunique(),
+        df['city'].nunique(),
+        df['cuisines'].nunique(),
+    )
+    charts = [
+        df.loc[:, ['restaurant_id', 'country']].groupby('country', observed=True).nunique(),
+        df.loc[:, ['city', 'country']].groupby('country', observed=True).nunique(),
+        df.loc[:, ['votes', 'country']].groupby('country', observed=True).mean(),
+        df.loc[:, ['average_cost_for_two', 'country']].groupby('country', observed=True).mean(),
+        df.loc[:, ['aggregate_rating', 'country']].groupby('country', observed=True).mean(),
+    ]
+    return cards, charts
+
+
+# Caminho novo: um filtro nas células do cubo e duas agregações
+def metrics_cube(cube):
+    selection = cube.slice({'country': COUNTRIES, 'price_type': PRICE_TYPES})
+    totals = selection.rollup(distinct=['country', 'city', 'cuisines'])
+    by_country = selection.rollup(['country'], distinct=['city'])
+    return totals, by_country
+
+
+def best_ms(func, number=10):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+# Execução da página no AppTest do streamlit, com os caches do processo já
+# carregados (o mapa folium domina o tempo). Cada execução usa uma sessão
+# nova: o AppTest do streamlit 1.29 não consegue repetir o run de uma página
+# com st.radio e format_func (o modo do mapa).
+def page_rerun_ms(runs=5):
+    from streamlit.testing.v1 import AppTest
+
+    path = glob.glob(PAGE)[0]
+    AppTest.from_file(path, default_timeout=120).run()
+    times = []
+    for _ in range(runs):
+        at = AppTest.from_file(path, default_timeout=120)
+        start = time.perf_counter()
+        at.run()
+        times.append((time.perf_counter() - start) * 1000)
+    return min(times)
+
+
+def main():
+    base = load_data()
+
+    print(f"{'escala':>6} {'linhas':>9} {'células':>8} {'base df.loc (ms)':>17} "
+          f"{'groupby x5 + cartões (ms)':>26} {'cubo (ms)':>10} {'base / cubo':>12}")
+    for scale in SCALES:
+        df = pd.concat([base] * scale, ignore_index=True)
+        df['restaurant_id'] = pd.RangeIndex(len(df), dtype='int32')
+        legacy = original_dtypes(df)
+        index = FilterIndex(df)
+        cube = Cube(build_cube(df))
+
+        baseline = best_ms(lambda: metrics_baseline(legacy))
+        old = best_ms(lambda: metrics_groupby(df, index))
+        new = best_ms(lambda: metrics_cube(cube))
+        print(f"{scale:>5}x {len(df):>9} {len(cube.cells):>8} {baseline:>17.2f} "
+              f"{old:>26.2f} {new:>10.2f} {baseline / new:>11.1f}x")
+
+    print(f"\nexecução da página, caches carregados (melhor de 5): {page_rerun_ms():.0f} ms")
+
+
+if __name__ == '__main__':
+    main()
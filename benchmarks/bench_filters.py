@@ -0,0 +1,54 @@
+# Benchmark dos filtros do menu lateral: isin + .loc encadeados (um frame
+# novo por filtro) contra o índice de bitmaps (FilterIndex) + um único take.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_filters
+
+# Libraries
+import timeit
+
+import pandas as pd
+
+from vorges_eat.filters import FilterIndex
+from vorges_eat.loader import load_data
+
+SCALES = [1, 10, 100]
+
+# Seleção padrão das páginas
+COUNTRIES = ['Brazil', 'England', 'Qatar', 'South Africa', 'Canada', 'Australia']
+PRICE_TYPES = ['expensive', 'gourmet', 'normal', 'cheap']
+
+
+def filter_isin(df):
+    df = df.loc[df['country'].isin(COUNTRIES), :]
+    df = df.loc[df['price_type'].isin(PRICE_TYPES), :]
+    return df
+
+
+def filter_index(df, index):
+    return df.take(index.select(country=COUNTRIES, price_type=PRICE_TYPES))
+
+
+def best_ms(func, number=20):
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1000
+
+
+def main():
+    base = load_data()
+
+    print(f"{'escala':>6} {'linhas':>9} {'montar índice (ms)':>19} {'isin+loc (ms)':>14} "
+          f"{'select (ms)':>12} {'select+take (ms)':>17}")
+    for scale in SCALES:
+        df = pd.concat([base] * scale, ignore_index=True)
+        build = best_ms(lambda: FilterIndex(df), number=1)
+        index = FilterIndex(df)
+        pd.testing.assert_frame_equal(filter_isin(df), filter_index(df, index))
+
+        isin = best_ms(lambda: filter_isin(df))
+        select = best_ms(lambda: index.select(country=COUNTRIES, price_type=PRICE_TYPES))
+        take = best_ms(lambda: filter_index(df, index))
+        print(f"{scale:>5}x {len(df):>9} {build:>19.2f} {isin:>14.3f} {select:>12.3f} {take:>17.3f}")
+
+
+if __name__ == '__main__':
+    main()
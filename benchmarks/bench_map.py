@@ -0,0 +1,110 @@
+# Benchmark do mapa da página Países: o laço antigo (iterrows + um
+# folium.Marker com Popup e Icon por restaurante), o mapa em lote
+# (vorges_eat.maps.build_map: popups vetorizados + FastMarkerCluster com
+# callback javascript) e o mapa interativo (só a área visível inicial, vinda
+# da grade espacial, no modo automático: a 100x a área inicial já passa do
+# limite do mapa de densidade). Mede a montagem do mapa, a geração do HTML que vai
+# para o navegador e o tamanho desse HTML.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_map
+
+# Libraries
+import time
+
+import folium
+import pandas as pd
+from folium.plugins import MarkerCluster
+
+from vorges_eat.loader import load_data
+from vorges_eat.maps import MAP_COLUMNS, base_map, build_map, viewport_layer
+from vorges_eat.spatial import GRID_COLUMNS, GridClusters, viewport_bounds
+
+SCALES = [1, 10, 100]
+
+# O laço antigo leva minutos (e alguns GB) acima disso
+LEGACY_MAX_ROWS = 70_000
+
+
+# Mapa como era montado na página antes do modo em lote
+def build_map_legacy(dataframe):
+    f = folium.Figure(width=1920, height=1080)
+
+    m = folium.Map(max_bounds=True).add_to(f)
+
+    marker_cluster = MarkerCluster().add_to(m)
+
+    for _, line in dataframe.iterrows():
+
+        name = line["restaurant_name"]
+        price_for_two = line["average_cost_for_two"]
+        cuisine = line["cuisines"]
+        currency = line["currency"]
+        rating = line["aggregate_rating"]
+        color = f'{line["color_name"]}'
+
+        html = "<p><strong>{}</strong></p>"
+        html += "<p>Price: {},00 ({}) para dois"
+        html += "<br />Type: {}"
+        html += "<br />Aggragate Rating: {}/5.0"
+        html = html.format(name, price_for_two, currency, cuisine, rating)
+
+        popup = folium.Popup(
+            folium.Html(html, script=True),
+            max_width=500,
+        )
+
+        folium.Marker(
+            [line["latitude"], line["longitude"]],
+            popup=popup,
+            icon=folium.Icon(color=color, icon="home", prefix="fa"),
+        ).add_to(marker_cluster)
+
+    return m
+
+
+# Mapa interativo na primeira renderização: mapa base + camada da área
+# visível que enquadra todos os pontos. A grade é montada uma vez por versão
+# dos dados no app, então fica fora da medição.
+def viewport_builder(dataframe, width=1024, height=768):
+    grid = GridClusters(dataframe)
+    center, zoom = grid.fit(width, height)
+    bounds = viewport_bounds(center, zoom, width, height)
+
+    def build(df):
+        m = base_map()
+        viewport_layer(grid, df, None, bounds, zoom).add_to(m)
+        return m
+
+    return build
+
+
+# Tempo de montagem, tempo de render do HTML e tamanho do HTML
+def measure(build, dataframe):
+    start = time.perf_counter()
+    m = build(dataframe)
+    built = time.perf_counter()
+    html = m.get_root().render()
+    rendered = time.perf_counter()
+    return built - start, rendered - built, len(html.encode()) / 2**10
+
+
+def main():
+    base = load_data(columns=list(dict.fromkeys(MAP_COLUMNS + GRID_COLUMNS)))
+
+    print(f"{'escala':>6} {'pontos':>8} {'modo':>7} {'montar (s)':>11} {'html (s)':>9} "
+          f"{'total (s)':>10} {'html (KB)':>10}")
+    for scale in SCALES:
+        df = pd.concat([base] * scale, ignore_index=True)
+        modes = [('lote', build_map), ('visível', viewport_builder(df))]
+        if len(df) <= LEGACY_MAX_ROWS:
+            modes.insert(0, ('antigo', build_map_legacy))
+
+        for mode, build in modes:
+            build_s, render_s, size_kb = measure(build, df)
+            print(f"{scale:>5}x {len(df):>8} {mode:>7} {build_s:>11.2f} {render_s:>9.2f} "
+                  f"{build_s + render_s:>10.2f} {size_kb:>10.0f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+# Benchmark da busca de restaurantes da Home: uma varredura com
+# str.contains nos três campos contra o índice invertido + trigramas
+# (vorges_eat.search.SearchIndex). Na escala "100x únicos" cada cópia do
+# dataset recebe um endereço diferente, então o índice não se beneficia de
+# registros repetidos.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_search
+
+# Libraries
+import time
+import timeit
+
+import pandas as pd
+
+from vorges_eat.loader import load_data
+from vorges_eat.search import SEARCH_FIELDS, SearchIndex
+
+SCALES = [1, 10, 100]
+
+QUERIES = ['pizza', 'pizzza', 'p', 'conaught place', 'starbuks', 'burger king']
+
+
+# Caminho sem índice: substring em cada campo de cada linha (sem prefixo
+# por palavra nem tolerância a erros)
+def search_scan(df, query):
+    mask = None
+    for column in SEARCH_FIELDS:
+        found = df[column].astype(str).str.contains(query, case=False, regex=False)
+        mask = found if mask is None else mask | found
+    return mask.to_numpy().nonzero()[0][:50]
+
+
+def best_ms(func, number=5):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def main():
+    base = load_data(columns=list(SEARCH_FIELDS))
+
+    frames = [(f'{scale}x', pd.concat([base] * scale, ignore_index=True)) for scale in SCALES]
+    frames.append((
+        '100x únicos',
+        pd.concat(
+            [base.assign(address=base['address'] + f' {i}') for i in range(100)], ignore_index=True
+        ),
+    ))
+
+    print(f"{'escala':>12} {'linhas':>8} {'montar índice (s)':>18} {'varredura (ms)':>15} "
+          f"{'índice (ms)':>12} {'pior índice (ms)':>17}")
+    for label, df in frames:
+        start = time.perf_counter()
+        index = SearchIndex(df)
+        build_s = time.perf_counter() - start
+
+        scan = [best_ms(lambda: search_scan(df, query), number=1) for query in QUERIES]
+        indexed = [best_ms(lambda: index.search(query)) for query in QUERIES]
+        print(f"{label:>12} {len(df):>8} {build_s:>18.2f} {sum(scan) / len(scan):>15.2f} "
+              f"{sum(indexed) / len(indexed):>12.2f} {max(indexed):>17.2f}")
+
+
+if __name__ == '__main__':
+    main()
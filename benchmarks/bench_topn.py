@@ -0,0 +1,49 @@
+# Benchmark das tabelas top N (Culinária e Perguntas de Negócio): o padrão
+# sort_values(...).head(n) contra vorges_eat.ranking.top_n (seleção parcial
+# + ordenação só dos candidatos). Confere também que as duas formas
+# devolvem as mesmas linhas.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_topn
+
+# Libraries
+import timeit
+
+import pandas as pd
+
+from vorges_eat.loader import load_data
+from vorges_eat.ranking import top_n
+
+SCALES = [1, 10, 100]
+
+# (nome, colunas, sentido, n) das tabelas das páginas
+TABLES = [
+    ('culinária top 10', ['aggregate_rating', 'votes', 'average_cost_for_two'], [False, False, True], 10),
+    ('mais votos', ['votes', 'restaurant_id'], [False, True], 10),
+    ('maior nota', ['aggregate_rating', 'restaurant_id'], [False, True], 10),
+    ('maior preço', ['average_cost_for_two', 'restaurant_id'], [False, True], 10),
+    ('menor nota', ['aggregate_rating', 'restaurant_id'], [True, True], 30),
+]
+
+
+def best_ms(func, number=5):
+    return min(timeit.repeat(func, number=number, repeat=3)) / number * 1000
+
+
+def main():
+    base = load_data()
+
+    print(f"{'escala':>6} {'linhas':>8} {'tabela':>17} {'sort + head (ms)':>17} {'top_n (ms)':>11} {'iguais':>7}")
+    for scale in SCALES:
+        df = pd.concat([base] * scale, ignore_index=True)
+        df['restaurant_id'] = pd.RangeIndex(len(df), dtype='int64')
+
+        for name, by, ascending, n in TABLES:
+            old = best_ms(lambda: df.sort_values(by, ascending=ascending).head(n))
+            new = best_ms(lambda: top_n(df, by, ascending, n))
+            same = top_n(df, by, ascending, n).index.equals(df.sort_values(by, ascending=ascending).head(n).index)
+            print(f"{scale:>5}x {len(df):>8} {name:>17} {old:>17.2f} {new:>11.2f} {str(same):>7}")
+
+
+if __name__ == '__main__':
+    main()
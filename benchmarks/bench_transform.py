@@ -0,0 +1,91 @@
+# Benchmark das derivações de price_type, country, color_name e cuisines:
+# versão linha a linha (.apply) contra a versão vetorizada do processing.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.bench_transform
+
+# Libraries
+import time
+
+import pandas as pd
+
+from vorges_eat.processing import (
+    FILE_PATH,
+    COUNTRIES,
+    COLORS,
+    rename_columns,
+    country_name,
+    color_name,
+    create_price_tye,
+    first_cuisine,
+)
+
+SCALES = [1, 10, 100]
+
+
+#========================================================================
+#==================== Implementações ====================================
+#========================================================================
+
+# Versão antiga, uma chamada Python por linha e por coluna
+def _price_type_row(price_range):
+    if price_range == 1:
+        return "cheap"
+    elif price_range == 2:
+        return "normal"
+    elif price_range == 3:
+        return "expensive"
+    else:
+        return "gourmet"
+
+
+def derive_rowwise(df):
+    out = pd.DataFrame(index=df.index)
+    out["price_type"] = df["price_range"].apply(lambda x: _price_type_row(x))
+    out["country"] = df["country_code"].apply(lambda x: COUNTRIES[x])
+    out["color_name"] = df["rating_color"].apply(lambda x: COLORS[x])
+    out["cuisines"] = df["cuisines"].apply(lambda x: x.split(",")[0])
+    return out
+
+
+# Versão atual, operações vetorizadas sobre a coluna inteira
+def derive_vectorized(df):
+    out = pd.DataFrame(index=df.index)
+    out["price_type"] = create_price_tye(df["price_range"])
+    out["country"] = country_name(df["country_code"])
+    out["color_name"] = color_name(df["rating_color"])
+    out["cuisines"] = first_cuisine(df["cuisines"])
+    return out
+
+
+#========================================================================
+#==================== Medição ===========================================
+#========================================================================
+
+def best_of(func, df, repeat=3):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(df)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    base = rename_columns(pd.read_csv(FILE_PATH)).dropna()
+
+    print(f"{'escala':>6} {'linhas':>9} {'apply (s)':>10} {'vetor (s)':>10} "
+          f"{'apply (linhas/s)':>17} {'vetor (linhas/s)':>17} {'ganho':>7}")
+    for scale in SCALES:
+        df = pd.concat([base] * scale, ignore_index=True)
+        pd.testing.assert_frame_equal(derive_rowwise(df), derive_vectorized(df))
+
+        rowwise = best_of(derive_rowwise, df)
+        vectorized = best_of(derive_vectorized, df)
+        rows = len(df)
+        print(f"{scale:>5}x {rows:>9} {rowwise:>10.3f} {vectorized:>10.3f} "
+              f"{rows / rowwise:>17,.0f} {rows / vectorized:>17,.0f} {rowwise / vectorized:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
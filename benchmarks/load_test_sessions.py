@@ -0,0 +1,144 @@
+# Teste de carga: N sessões simultâneas de uma página do dashboard, medindo
+# o RSS do processo. Compara o frame compartilhado do loader ('shared') com
+# o comportamento antigo de montar os dados em cada sessão ('per-session').
+#
+# Cada sessão executa o script da página em uma thread, em "bare mode" do
+# Streamlit (sem servidor: os widgets devolvem o valor padrão), e o namespace
+# da página é mantido vivo até o fim, como as sessões abertas no servidor.
+# Cada modo roda em um processo separado, para o RSS de um não contaminar o
+# outro.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.load_test_sessions
+#   python -m benchmarks.load_test_sessions --sessions 50 --page "pages/2_🏙️_Cities.py"
+
+# Libraries
+import argparse
+import json
+import logging
+import runpy
+import subprocess
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import psutil
+
+MODES = ['shared', 'per-session']
+DEFAULT_PAGE = 'pages/2_🏙️_Cities.py'
+
+
+def mb(value):
+    return value / 1024 ** 2
+
+
+# Mede o pico de RSS em uma thread separada enquanto as sessões rodam
+class PeakRSS:
+    def __init__(self, interval=0.005):
+        self.process = psutil.Process()
+        self.interval = interval
+        self.peak = self.process.memory_info().rss
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def _sample(self):
+        while not self._stop.is_set():
+            self.peak = max(self.peak, self.process.memory_info().rss)
+            time.sleep(self.interval)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._thread.join()
+
+
+def run_mode(mode, page, sessions):
+    from vorges_eat import loader
+
+    # Sem servidor, o Streamlit avisa a cada chamada que não há sessão
+    logging.getLogger('streamlit').setLevel(logging.ERROR)
+
+    if mode == 'per-session':
+        # Sem o cache do processo: cada sessão lê e monta o próprio frame
+        loader._cached = lambda name, file_path, build: build(file_path)
+
+    # Devolve o namespace da página (mantido vivo) e o tempo da sessão
+    def session(barrier=None):
+        if barrier is not None:
+            barrier.wait()
+        start = time.perf_counter()
+        namespace = runpy.run_path(page, run_name='__main__')
+        return namespace, time.perf_counter() - start
+
+    # Uma sessão de aquecimento: imports, cache e compilação da página. O
+    # tempo dela (carga a frio) fica fora dos percentis das sessões.
+    _, cold = session()
+    process = psutil.Process()
+    rss_idle = process.memory_info().rss
+
+    barrier = threading.Barrier(sessions)
+    start = time.perf_counter()
+    with PeakRSS() as peak:
+        with ThreadPoolExecutor(max_workers=sessions) as pool:
+            runs = list(pool.map(lambda _: session(barrier), range(sessions)))
+    elapsed = time.perf_counter() - start
+    rss_after = process.memory_info().rss
+    p50, p95 = np.percentile([seconds for _, seconds in runs], [50, 95])
+
+    return {
+        'mode': mode,
+        'sessions': len(runs),
+        'rss_idle_mb': mb(rss_idle),
+        'rss_peak_mb': mb(peak.peak),
+        'rss_after_mb': mb(rss_after),
+        'seconds': elapsed,
+        'cold_seconds': cold,
+        'session_p50': p50,
+        'session_p95': p95,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Teste de carga com sessões simultâneas.')
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--page', default=DEFAULT_PAGE)
+    parser.add_argument('--mode', choices=MODES, help='roda apenas um modo (uso interno)')
+    args = parser.parse_args()
+
+    if args.mode:
+        print(json.dumps(run_mode(args.mode, args.page, args.sessions)))
+        return
+
+    results = []
+    for mode in MODES:
+        out = subprocess.run(
+            [sys.executable, '-m', 'benchmarks.load_test_sessions',
+             '--mode', mode, '--page', args.page, '--sessions', str(args.sessions)],
+            capture_output=True, text=True,
+        )
+        if out.returncode != 0:
+            # Código negativo = morto por sinal (ex.: -9, falta de memória)
+            results.append({'mode': mode, 'returncode': out.returncode})
+            continue
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    print(f'Página: {args.page} | sessões simultâneas: {args.sessions}')
+    print(f"{'modo':<12} {'RSS ocioso':>11} {'RSS pico':>10} {'RSS final':>10} "
+          f"{'final - ocioso':>15} {'tempo':>8} {'a frio':>8} {'sessão p50':>11} {'sessão p95':>11}")
+    for r in results:
+        if 'returncode' in r:
+            print(f"{r['mode']:<12} processo encerrado com código {r['returncode']}")
+            continue
+        print(f"{r['mode']:<12} {r['rss_idle_mb']:>8.1f} MB {r['rss_peak_mb']:>7.1f} MB "
+              f"{r['rss_after_mb']:>7.1f} MB {r['rss_after_mb'] - r['rss_idle_mb']:>12.1f} MB "
+              f"{r['seconds']:>7.2f}s {r['cold_seconds']:>7.2f}s "
+              f"{r['session_p50']:>10.2f}s {r['session_p95']:>10.2f}s")
+
+
+if __name__ == '__main__':
+    main()
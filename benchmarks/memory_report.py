@@ -0,0 +1,112 @@
+# Relatório de memória do dataframe processado: tipos originais (object,
+# int64, float64) contra os tipos compactos do loader (COMPACT_DTYPES), e a
+# memória das projeções que as páginas pedem ao loader (load_data com
+# columns=...), que compartilham as colunas do frame do cache.
+#
+# Uso (na raiz do repositório):
+#   python -m benchmarks.memory_report
+
+# Libraries
+import sys
+
+import pandas as pd
+
+from vorges_eat.filters import FILTER_COLUMNS
+from vorges_eat.hierarchy import HIERARCHY_COLUMNS
+from vorges_eat.loader import clear_cache, load_data
+from vorges_eat.maps import MAP_COLUMNS
+from vorges_eat.processing import FILE_PATH, process_data, compact_dtypes
+from vorges_eat.search import SEARCH_FIELDS
+from vorges_eat.spatial import GRID_COLUMNS
+
+# Projeções pedidas pelas páginas e pelas estruturas do loader (None é o
+# frame completo)
+PROJECTIONS = [
+    None,
+    FILTER_COLUMNS,
+    GRID_COLUMNS,
+    HIERARCHY_COLUMNS,
+    MAP_COLUMNS,
+    list(SEARCH_FIELDS),
+    ["cuisines", "aggregate_rating", "restaurant_id"],
+]
+
+
+def memory_mb(series_or_frame):
+    return series_or_frame.memory_usage(deep=True) / 1024 ** 2
+
+
+# Buffers de um frame: {(endereço, bytes): bytes} dos arrays numpy (os
+# códigos e as categorias das colunas category) e {id: bytes} dos textos
+# das colunas object
+def frame_buffers(frame):
+    arrays, texts = {}, {}
+    for column in frame.columns:
+        values = frame[column]._values
+        if isinstance(values, pd.Categorical):
+            parts = [values.codes, values.categories.to_numpy()]
+        else:
+            parts = [values]
+        for array in parts:
+            arrays[(array.__array_interface__['data'][0], array.nbytes)] = array.nbytes
+            if array.dtype == object:
+                texts.update((id(text), sys.getsizeof(text)) for text in array)
+    return arrays, texts
+
+
+def buffers_mb(buffers):
+    arrays, texts = buffers
+    return (sum(arrays.values()) + sum(texts.values())) / 1024 ** 2
+
+
+# Memória das projeções: a soma de cada uma contada à parte (como se fossem
+# cópias) contra os buffers distintos que elas realmente ocupam
+def projections_report():
+    clear_cache()
+    frames = [load_data(columns=columns) for columns in PROJECTIONS]
+
+    separate = sum(buffers_mb(frame_buffers(frame)) for frame in frames)
+    arrays, texts = {}, {}
+    for frame in frames:
+        frame_arrays, frame_texts = frame_buffers(frame)
+        arrays.update(frame_arrays)
+        texts.update(frame_texts)
+
+    print()
+    print(f'Projeções do loader: {len(frames)} frames')
+    print(f'Soma das projeções contadas à parte: {separate:.2f} MB')
+    print(f'Memória distinta ocupada:            {buffers_mb((arrays, texts)):.2f} MB '
+          f'(frame completo: {buffers_mb(frame_buffers(frames[0])):.2f} MB)')
+
+
+def main():
+    before = process_data(FILE_PATH)
+    after = compact_dtypes(before)
+
+    report = pd.DataFrame({
+        'tipo antes': before.dtypes.astype(str),
+        'tipo depois': after.dtypes.astype(str),
+        'antes (MB)': memory_mb(before).drop('Index'),
+        'depois (MB)': memory_mb(after).drop('Index'),
+    })
+    report['redução'] = 1 - report['depois (MB)'] / report['antes (MB)']
+
+    pd.set_option('display.width', 200)
+    print(report.to_string(formatters={
+        'antes (MB)': '{:.3f}'.format,
+        'depois (MB)': '{:.3f}'.format,
+        'redução': '{:.0%}'.format,
+    }))
+
+    total_before = memory_mb(before).sum()
+    total_after = memory_mb(after).sum()
+    print()
+    print(f'Linhas: {len(before)}')
+    print(f'Total antes:  {total_before:.2f} MB')
+    print(f'Total depois: {total_after:.2f} MB ({1 - total_after / total_before:.0%} menor)')
+
+    projections_report()
+
+
+if __name__ == '__main__':
+    main()
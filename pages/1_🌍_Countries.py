@@ -1,142 +1,64 @@
 # Libraries
 import pandas as pd
 import numpy as np
-import inflection
 import plotly.express as px
 from PIL import Image
 import streamlit as st
 import matplotlib.pyplot as plt
 import folium
 from folium.plugins import MarkerCluster
-from streamlit_folium import folium_static
-
-
-#========================================================================
-#==================== Variáveis Auxiliares ==============================
-#========================================================================
-FILE_PATH = 'datasets/zomato.csv'
-
-COUNTRIES = {
-    1: "India",
-    14: "Australia",
-    30: "Brazil",
-    37: "Canada",
-    94: "Indonesia",
-    148: "New Zeland",
-    162: "Philippines",
-    166: "Qatar",
-    184: "Singapure",
-    189: "South Africa",
-    191: "Sri Lanka",
-    208: "Turkey",
-    214: "United Arab Emirates",
-    215: "England",
-    216: "United States of America",
-}
+from streamlit_folium import st_folium
+
+from vorges_eat.loader import (
+    data_version,
+    enable_copy_on_write,
+    load_cube,
+    load_data,
+    load_filter_index,
+    load_grid_clusters,
+    load_image,
+)
+from vorges_eat.maps import (
+    LAYER_CACHE,
+    MAP_COLUMNS,
+    base_map,
+    layer_key,
+    returned_view,
+    viewport_layer,
+)
+from vorges_eat.plotting import for_plotly, for_table
+from vorges_eat.spatial import viewport_bounds
 
+# Copy-on-Write do pandas para os frames compartilhados (ver vorges_eat/loader.py)
+enable_copy_on_write()
 
-COLORS = {
-    "3F7E00": "darkgreen",
-    "5BA829": "green",
-    "9ACD32": "lightgreen",
-    "CDD614": "orange",
-    "FFBA00": "red",
-    "CBCBC8": "darkred",
-    "FF7800": "darkred",
-}
 
 #========================================================================
-#==================== Funções Auxiliares ================================
+#========================== Carregar os Dados ===========================
 #========================================================================
-
-# renomear as colunas em snakecase
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-
-    return df
-
-# Substituir o código do país pelo seu nome
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-
-# Substituir o código da cor por seu nome
-def color_name(color_code):
-    return COLORS[color_code]
-
-# Substituir o price_range pelas nomes
-def create_price_tye(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-    
-# Ajustar as ordens das colunas
-def adjust_columns_order(dataframe):
-    df = dataframe.copy()
-    new_cols_order = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "address",
-        "locality",
-        "locality_verbose",
-        "longitude",
-        "latitude",
-        "cuisines",
-        "price_type",
-        "average_cost_for_two",
-        "currency",
-        "has_table_booking",
-        "has_online_delivery",
-        "is_delivering_now",
-        "aggregate_rating",
-        "rating_color",
-        "color_name",
-        "rating_text",
-        "votes",
-    ]
-    return df.loc[:, new_cols_order]
-
-# Processar e ransformar os dados
-def process_data(file_path):
-    df = pd.read_csv(file_path)
-    df = df.dropna()
-    df = rename_columns(df)
-    df["price_type"] = df.loc[:, "price_range"].apply(lambda x: create_price_tye(x))
-    df["country"] = df.loc[:, "country_code"].apply(lambda x: country_name(x))
-    df["color_name"] = df.loc[:, "rating_color"].apply(lambda x: color_name(x))
-    df["cuisines"] = df.loc[:, "cuisines"].apply(lambda x: x.split(",")[0])
-    df = df.drop_duplicates()
-    df = adjust_columns_order(df)
-    df.to_csv('datasets/data_processed.csv', index=False)
-    return df
-
-# Carregar os dados
-df_raw = pd.read_csv(FILE_PATH)
-
-# Copy
-df1 = df_raw.copy()
-
-# Chamar a função para renomear as colunas
-df1 = rename_columns( df1 )
-
-
-# Chamar a função para processar os dados
-df2 = process_data(FILE_PATH)
+# Índice dos filtros do menu lateral, compartilhado entre as sessões
+filter_index = load_filter_index()
+
+# Cubo de métricas pré-agregadas (ver vorges_eat/cube.py)
+cube = load_cube()
+
+# Grade de clusters e índice espacial do mapa (ver vorges_eat/spatial.py)
+grid = load_grid_clusters()
+
+# Colunas do mapa para todas as linhas (a área visível é consultada com as
+# posições do dataframe completo)
+map_data = load_data(columns=MAP_COLUMNS)
+
+# Colunas da tabela de restaurantes próximos
+NEAR_COLUMNS = [
+    "restaurant_name",
+    "city",
+    "cuisines",
+    "aggregate_rating",
+    "average_cost_for_two",
+    "currency",
+]
+near_data = load_data(columns=NEAR_COLUMNS)
 
 #========================================================================
 #========================== Menu Lateral ================================
@@ -153,7 +75,7 @@ with open('style.css') as f:
     
 
 #============================= Imagem Inicial ==========================
-image = Image.open('countries.jpg')
+image = load_image('countries.jpg', width=620)
 st.image(image, caption= 'Urban Cafe, Tehran, Iran', width=620)
 
 st.markdown("""---""")
@@ -161,7 +83,7 @@ st.markdown("""---""")
 #===========================
 # Criar o menu lateral
 #===========================
-image = Image.open('Logo Preto Sem Fundo.png')
+image = load_image('Logo Preto Sem Fundo.png', width=120)
 st.sidebar.image( image, width = 120)
 
 st.sidebar.markdown('# Vorges Eat')
@@ -173,7 +95,7 @@ st.sidebar.markdown('## Filtros')
 # Filtro 1
 countries = st.sidebar.multiselect(
     'Escolha os Países que deseja visualizar:',
-    df2.loc[:,'country'].unique().tolist(),
+    filter_index.values('country'),
     default=['Brazil','England','Qatar','South Africa','Canada','Australia']
 )
 st.sidebar.markdown("""---""")
@@ -181,22 +103,82 @@ st.sidebar.markdown("""---""")
 # Filtro 2
 price_type_filter = st.sidebar.multiselect(
     'Escolha o Tipo de Preço Avaliado:',
-    df2.loc[:,'price_type'].unique().tolist(),
+    filter_index.values('price_type'),
     default = ['expensive', 'gourmet', 'normal', 'cheap']
 )
 st.sidebar.markdown("""---""")
 
+# Restaurantes próximos: o ponto pode ser digitado ou escolhido clicando no
+# mapa (o clique preenche a latitude e a longitude). O último valor devolvido
+# pelo mapa já está no session_state antes dos campos serem criados, então o
+# clique é aplicado neste mesmo rerun.
+map_value = st.session_state.get('mapa_restaurantes') or {}
+clicked = map_value.get('last_clicked')
+if clicked and clicked != st.session_state.get('map_click'):
+    st.session_state['map_click'] = clicked
+    st.session_state['near_lat'], st.session_state['near_lon'] = clicked['lat'], clicked['lng']
+
+st.sidebar.markdown('## Restaurantes Próximos')
+near_lat = st.sidebar.number_input(
+    'Latitude:', min_value=-90.0, max_value=90.0, value=None,
+    format='%.6f', placeholder='Clique no mapa', key='near_lat',
+)
+near_lon = st.sidebar.number_input(
+    'Longitude:', min_value=-180.0, max_value=180.0, value=None,
+    format='%.6f', placeholder='Clique no mapa', key='near_lon',
+)
+near_radius = st.sidebar.slider('Raio da busca (km):', 1, 100, 10)
+near_count = st.sidebar.slider('Quantidade de restaurantes:', 1, 50, 10)
+st.sidebar.markdown("""---""")
+
+# Modo do mapa: no automático, áreas com muitos restaurantes viram um mapa
+# de densidade (ver vorges_eat/maps.py)
+MAP_MODE_LABELS = {
+    'auto': 'Automático',
+    'clusters': 'Marcadores e clusters',
+    'heatmap': 'Mapa de calor',
+}
+DENSITY_WEIGHT_LABELS = {
+    None: 'Quantidade de restaurantes',
+    'votes': 'Quantidade de votos',
+    'aggregate_rating': 'Nota dos restaurantes',
+}
+
+st.sidebar.markdown('## Mapa')
+map_mode = st.sidebar.radio(
+    'Modo do mapa:', list(MAP_MODE_LABELS), format_func=MAP_MODE_LABELS.get,
+)
+density_weight = st.sidebar.selectbox(
+    'Peso do mapa de calor:', list(DENSITY_WEIGHT_LABELS), format_func=DENSITY_WEIGHT_LABELS.get,
+)
+st.sidebar.markdown("""---""")
+
 #========================================================================
 #========================== Ativando filtros ============================
 #========================================================================
 
-# Filtro 1
-linhas_selecionadas_countries = df2['country'].isin( countries )
-df2 = df2.loc[linhas_selecionadas_countries, :]
+# Filtros 1 e 2: bitmaps pré-calculados (OR entre os valores, AND entre os
+# filtros) resolvem as linhas selecionadas
+linhas_selecionadas = filter_index.select(
+    country=countries,
+    price_type=price_type_filter,
+)
 
-# Filtro 2
-linhas_selecionadas_price = df2['price_type'].isin( price_type_filter )
-df2 = df2.loc[linhas_selecionadas_price, :]
+# Métricas dos cartões e dos gráficos: os mesmos filtros aplicados uma vez
+# nas células do cubo, e duas agregações dessa seleção (total e por país)
+country_cube = cube.slice({"country": countries, "price_type": price_type_filter})
+
+totals = country_cube.rollup(distinct=["country", "city", "cuisines"]).iloc[0]
+
+country_metrics = country_cube.rollup(["country"], distinct=["city"]).rename(
+    columns={
+        "restaurants": "restaurant_id",
+        "distinct_city": "city",
+        "votes_mean": "votes",
+        "cost_mean": "average_cost_for_two",
+        "rating_mean": "aggregate_rating",
+    }
+)
 
 #========================================================================
 #========================== Layout no Streamlit =========================
@@ -209,76 +191,97 @@ with st.container():
     col1, col2, col3, col4 = st.columns(4)
     
     with col1:
-        dist_restaurant = df2['restaurant_id'].shape[0]
+        dist_restaurant = int(totals['restaurants'])
         col1.metric('Restaurante Únicos', dist_restaurant)
         
     
     with col2:
-        dist_country = df2.loc[:, 'country'].nunique()
+        dist_country = int(totals['distinct_country'])
         col2.metric('Países Registrados', dist_country)
     
     
     with col3:
-        dist_city = df2.loc[:, 'city'].nunique()
+        dist_city = int(totals['distinct_city'])
         col3.metric('Cidades Registradas', dist_city)
         
     
     with col4:
-        dist_cuisine = df2.loc[:, 'cuisines'].nunique()
+        dist_cuisine = int(totals['distinct_cuisines'])
         col4.metric('Tipos Culinários', dist_cuisine)
         
 
 #===========================  DESENHAR O MAPA
-def create_map(dataframe):
-    f = folium.Figure(width=1920, height=1080)
-
-    m = folium.Map(max_bounds=True).add_to(f)
-
-    marker_cluster = MarkerCluster().add_to(m)
-
-    for _, line in dataframe.iterrows():
-
-        name = line["restaurant_name"]
-        price_for_two = line["average_cost_for_two"]
-        cuisine = line["cuisines"]
-        currency = line["currency"]
-        rating = line["aggregate_rating"]
-        color = f'{line["color_name"]}'
-
-        html = "<p><strong>{}</strong></p>"
-        html += "<p>Price: {},00 ({}) para dois"
-        html += "<br />Type: {}"
-        html += "<br />Aggragate Rating: {}/5.0"
-        html = html.format(name, price_for_two, currency, cuisine, rating)
-
-        popup = folium.Popup(
-            folium.Html(html, script=True),
-            max_width=500,
-        )
-
-        folium.Marker(
-            [line["latitude"], line["longitude"]],
-            popup=popup,
-            icon=folium.Icon(color=color, icon="home", prefix="fa"),
-        ).add_to(marker_cluster)
-
-    folium_static(m, width=1024, height=768)
-    
-map_df = df2.loc[df2["country"].isin(countries), :]
-
-create_map(map_df)
+# Mapa interativo: o mapa base é sempre o mesmo e só a camada com os
+# restaurantes (ou clusters) da área visível é trocada quando o mapa é
+# movido (ver vorges_eat/maps.py e vorges_eat/spatial.py)
+MAP_WIDTH = 1024
+MAP_HEIGHT = 768
+
+def create_map(positions):
+    # Ao mudar os filtros, o mapa enquadra a seleção; depois segue a área
+    # visível devolvida pelo próprio mapa. A área devolvida é lida do
+    # session_state antes de montar a camada, então mover o mapa custa um
+    # rerun só (a área que o mapa tinha antes do enquadramento é ignorada).
+    center, zoom = grid.fit(MAP_WIDTH, MAP_HEIGHT, positions)
+    view = returned_view(map_value)
+    if st.session_state.get('map_fit') != (center, zoom):
+        st.session_state['map_fit'] = (center, zoom)
+        st.session_state['map_view'] = (viewport_bounds(center, zoom, MAP_WIDTH, MAP_HEIGHT), zoom)
+        st.session_state['map_seen'] = view
+    elif view is not None and view != st.session_state.get('map_seen'):
+        st.session_state['map_view'] = view
+        st.session_state['map_seen'] = view
+
+    # Camada da área visível, renderizada uma vez por seleção (filtros,
+    # área, zoom e modo) e reaproveitada entre reruns e sessões
+    bounds, view_zoom = st.session_state['map_view']
+    key = layer_key(
+        data_version(),
+        {'country': countries, 'price_type': price_type_filter},
+        (bounds, view_zoom),
+        map_mode,
+        density_weight,
+    )
+    layer = LAYER_CACHE.get(key, lambda: viewport_layer(
+        grid, map_data, positions, bounds, view_zoom, mode=map_mode, weight=density_weight,
+    ))
+
+    st_folium(
+        base_map(),
+        key='mapa_restaurantes',
+        width=MAP_WIDTH,
+        height=MAP_HEIGHT,
+        returned_objects=['bounds', 'zoom', 'last_clicked'],
+        center=center,
+        zoom=zoom,
+        feature_group_to_add=layer,
+    )
+
+create_map(linhas_selecionadas)
+
+#===========================  RESTAURANTES PRÓXIMOS
+# Os mais próximos do ponto escolhido, dentro do raio, pelo índice espacial
+# da grade (só as células em volta do ponto são lidas)
+if near_lat is not None and near_lon is not None:
+    st.markdown('### Restaurantes próximos ao ponto escolhido')
+
+    positions, distances = grid.nearest(
+        near_lat, near_lon, k=near_count, radius_km=near_radius, positions=linhas_selecionadas,
+    )
+    if len(positions) == 0:
+        st.write(f'Nenhum restaurante a até {near_radius} km do ponto.')
+    else:
+        near_df = near_data.take(positions).assign(distance_km=distances.round(2))
+        st.dataframe(for_table(near_df.reset_index(drop=True)))
 #=================================================================================
 
 with st.container():
     # GRAFICO 1
-    cols = ['restaurant_id','country']
-    
-    aux = ( df2.loc[:, cols].groupby('country')
-                            .nunique()
+    aux = ( country_metrics.loc[:, ['country', 'restaurant_id']]
                             .sort_values('restaurant_id', ascending= False)
-                            .reset_index() )
+                            .reset_index(drop=True) )
     
-    fig = px.bar( aux, x='country', y='restaurant_id', 
+    fig = px.bar( for_plotly(aux), x='country', y='restaurant_id', 
                        text='restaurant_id', 
                        title='Quantidade de Restaurantes por País', 
                        labels={'country': 'País', 'restaurant_id': 'Qtde Restaurantes'})
@@ -286,14 +289,11 @@ with st.container():
     st.plotly_chart(fig)
 #=======================================================
     # GRAFICO 2
-    cols = ['city','country']
-
-    aux = ( df2.loc[:, cols].groupby('country')
-                          .nunique()
+    aux = ( country_metrics.loc[:, ['country', 'city']]
                           .sort_values('city', ascending = False)
-                          .reset_index() )
+                          .reset_index(drop=True) )
 
-    fig = px.bar(aux, x='country', 
+    fig = px.bar(for_plotly(aux), x='country', 
                   y='city', 
                   labels={'country': 'País', 'city': 'Cidade'},
                   color="country",
@@ -302,14 +302,11 @@ with st.container():
     st.plotly_chart(fig)
 #=======================================================
     # GRAFICO 3
-    cols = ['votes','country']
-
-    aux = ( df2.loc[:, cols].groupby('country')
-                          .mean()
+    aux = ( country_metrics.loc[:, ['country', 'votes']]
                           .sort_values('votes', ascending = False)
-                          .reset_index() )
+                          .reset_index(drop=True) )
 
-    fig = px.bar( aux, x='country', 
+    fig = px.bar( for_plotly(aux), x='country', 
                       y='votes',  
                       title='Média de Avaliações',
                       color="country",
@@ -318,14 +315,11 @@ with st.container():
     st.plotly_chart(fig)
 #=======================================================
     # GRAFICO 4
-    cols = ['average_cost_for_two','country']
-
-    aux = ( df2.loc[:, cols].groupby('country')
-                          .mean()
+    aux = ( country_metrics.loc[:, ['country', 'average_cost_for_two']]
                           .sort_values('average_cost_for_two', ascending = False)
-                          .reset_index() )
+                          .reset_index(drop=True) )
 
-    fig = px.bar(aux, 
+    fig = px.bar(for_plotly(aux), 
              x='country', 
              y='average_cost_for_two', 
              labels={'country':'País', 'average_cost_for_two':'Média de Preço de um prato para duas pessoas'}, 
@@ -335,14 +329,11 @@ with st.container():
     st.plotly_chart(fig)
 #=======================================================
     # GRAFICO 5
-    cols = ['aggregate_rating', 'country']
-
-    aux= ( df2.loc[:, cols].groupby('country')
-                         .mean()
+    aux = ( country_metrics.loc[:, ['country', 'aggregate_rating']]
                          .sort_values('aggregate_rating', ascending = False)
-                         .reset_index() )
+                         .reset_index(drop=True) )
 
-    fig = px.scatter( aux, 
+    fig = px.scatter( for_plotly(aux), 
            x='country', 
            y='aggregate_rating', 
            color='country',
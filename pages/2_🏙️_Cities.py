@@ -1,7 +1,6 @@
 # Libraries
 import pandas as pd
 import numpy as np
-import inflection
 import plotly.express as px
 from PIL import Image
 import streamlit as st
@@ -10,132 +9,46 @@ import folium
 from folium.plugins import MarkerCluster
 from streamlit_folium import folium_static
 
+from vorges_eat.loader import (
+    enable_copy_on_write,
+    load_cube,
+    load_data,
+    load_filter_index,
+    load_hierarchy,
+    load_image,
+    load_place_index,
+)
+from vorges_eat.plotting import for_plotly
+
+# Copy-on-Write do pandas para os frames compartilhados (ver vorges_eat/loader.py)
+enable_copy_on_write()
+
 #========================================================================
-#==================== Variáveis Auxiliares ==============================
+#========================== Carregar os Dados ===========================
 #========================================================================
-FILE_PATH = 'datasets/zomato.csv'
-
-COUNTRIES = {
-    1: "India",
-    14: "Australia",
-    30: "Brazil",
-    37: "Canada",
-    94: "Indonesia",
-    148: "New Zeland",
-    162: "Philippines",
-    166: "Qatar",
-    184: "Singapure",
-    189: "South Africa",
-    191: "Sri Lanka",
-    208: "Turkey",
-    214: "United Arab Emirates",
-    215: "England",
-    216: "United States of America",
-}
+# Apenas as colunas usadas nesta página são lidas do snapshot parquet (os
+# demais gráficos vêm do cubo de métricas)
+COLUMNS = [
+    "country",
+    "city",
+    "price_type",
+    "aggregate_rating",
+]
 
+# Dados processados, compartilhados entre as sessões (ver vorges_eat/loader.py)
+df2 = load_data(columns=COLUMNS)
 
-COLORS = {
-    "3F7E00": "darkgreen",
-    "5BA829": "green",
-    "9ACD32": "lightgreen",
-    "CDD614": "orange",
-    "FFBA00": "red",
-    "CBCBC8": "darkred",
-    "FF7800": "darkred",
-}
+# Índice dos filtros do menu lateral, compartilhado entre as sessões
+filter_index = load_filter_index()
 
-#========================================================================
-#==================== Funções Auxiliares ================================
-#========================================================================
+# Cubo de métricas pré-agregadas (ver vorges_eat/cube.py)
+cube = load_cube()
 
-# renomear as colunas em snakecase
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-
-    return df
-
-# Substituir o código do país pelo seu nome
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-
-# Substituir o código da cor por seu nome
-def color_name(color_code):
-    return COLORS[color_code]
-
-# Substituir o price_range pelas nomes
-def create_price_tye(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-    
-# Ajustar as ordens das colunas
-def adjust_columns_order(dataframe):
-    df = dataframe.copy()
-    new_cols_order = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "address",
-        "locality",
-        "locality_verbose",
-        "longitude",
-        "latitude",
-        "cuisines",
-        "price_type",
-        "average_cost_for_two",
-        "currency",
-        "has_table_booking",
-        "has_online_delivery",
-        "is_delivering_now",
-        "aggregate_rating",
-        "rating_color",
-        "color_name",
-        "rating_text",
-        "votes",
-    ]
-    return df.loc[:, new_cols_order]
-
-# Processar e ransformar os dados
-def process_data(file_path):
-    df = pd.read_csv(file_path)
-    df = df.dropna()
-    df = rename_columns(df)
-    df["price_type"] = df.loc[:, "price_range"].apply(lambda x: create_price_tye(x))
-    df["country"] = df.loc[:, "country_code"].apply(lambda x: country_name(x))
-    df["color_name"] = df.loc[:, "rating_color"].apply(lambda x: color_name(x))
-    df["cuisines"] = df.loc[:, "cuisines"].apply(lambda x: x.split(",")[0])
-    df = df.drop_duplicates()
-    df = adjust_columns_order(df)
-    df.to_csv('datasets/data_processed.csv', index=False)
-    return df
-
-# Carregar os dados
-df_raw = pd.read_csv(FILE_PATH)
-
-# Copy
-df1 = df_raw.copy()
-
-# Chamar a função para renomear as colunas
-df1 = rename_columns( df1 )
-
-
-# Chamar a função para processar os dados
-df2 = process_data(FILE_PATH)
+# Hierarquia país > cidade > localidade pré-agregada (ver vorges_eat/hierarchy.py)
+hierarchy = load_hierarchy()
+
+# Países, cidades e localidades ordenados, com o autocompletar das cidades
+places = load_place_index()
 
 #========================================================================
 #========================== Menu Lateral ================================
@@ -146,7 +59,7 @@ st.header('Vorges Eat Marktplace: Dashboard Cidades')
 
 
 #============================= Imagem Inicial ==========================
-image = Image.open('cities.jpg')
+image = load_image('cities.jpg', width=620)
 st.image(image, caption= 'New York, United States', width=620)
 
 st.markdown("""---""")
@@ -154,7 +67,7 @@ st.markdown("""---""")
 #===========================
 # Criar o menu lateral
 #===========================
-image = Image.open('Logo Preto Sem Fundo.png')
+image = load_image('Logo Preto Sem Fundo.png', width=120)
 st.sidebar.image( image, width = 120)
 
 st.sidebar.markdown('# Vorges Eat')
@@ -166,7 +79,7 @@ st.sidebar.markdown('## Filtros')
 # Filtro 1
 countries = st.sidebar.multiselect(
     'Escolha os Países que deseja visualizar:',
-    df2.loc[:,'country'].unique().tolist(),
+    places.countries,
     default=['Brazil','England','Qatar','South Africa','Canada','Australia']
 )
 st.sidebar.markdown("""---""")
@@ -174,16 +87,37 @@ st.sidebar.markdown("""---""")
 # Filtro 2
 price_type_filter = st.sidebar.multiselect(
     'Escolha o Tipo de Preço Avaliado:',
-    df2.loc[:,'price_type'].unique().tolist(),
+    filter_index.values('price_type'),
     default = ['expensive', 'gourmet', 'normal', 'cheap']
 )
 st.sidebar.markdown("""---""")
 
-# Filtro 3
+# Filtro 3: as cidades disponíveis são as dos países escolhidos. A busca
+# aceita erros de digitação e nomes de localidades; as cidades encontradas
+# passam a ser a seleção do filtro.
+city_query = st.sidebar.text_input(
+    'Buscar cidade ou localidade:', placeholder='Ex.: Cape Twon, Connaught Place',
+)
+city_matches = places.complete(city_query, countries)
+
+if len(city_matches) > 0:
+    st.sidebar.caption(
+        'Encontradas: ' + ', '.join(
+            name if kind == 'city' else f'{name} ({city})'
+            for name, kind, city in city_matches[['name', 'kind', 'city']].itertuples(index=False)
+        )
+    )
+    default_cities = list(dict.fromkeys(city_matches['city']))
+else:
+    if city_query:
+        st.sidebar.caption('Nenhuma cidade ou localidade encontrada nos países escolhidos.')
+    default_cities = ['London','Doha','Pretoria','Cape Town','Durban','Rio de Janeiro']
+
+city_options = places.cities(countries)
 cities = st.sidebar.multiselect(
     'Escolha as Cidades que deseja visualizar:',
-    df2.loc[:,'city'].unique().tolist(),
-    default=['London','Doha','Pretoria','Cape Town','Durban','Rio de Janeiro']
+    city_options,
+    default=[city for city in default_cities if city in city_options]
 )
 st.sidebar.markdown("""---""")
 
@@ -191,17 +125,21 @@ st.sidebar.markdown("""---""")
 #========================== Ativando filtros ============================
 #========================================================================
 
-# Filtro 1
-linhas_selecionadas_countries = df2['country'].isin( countries )
-df2 = df2.loc[linhas_selecionadas_countries, :]
-
-# Filtro 2
-linhas_selecionadas_price = df2['price_type'].isin( price_type_filter )
-df2 = df2.loc[linhas_selecionadas_price, :]
+# Filtros 1, 2 e 3: bitmaps pré-calculados (OR entre os valores, AND entre
+# os filtros) resolvem as linhas selecionadas, e o dataframe é montado uma vez
+linhas_selecionadas = filter_index.select(
+    country=countries,
+    price_type=price_type_filter,
+    city=cities,
+)
+df2 = df2.take(linhas_selecionadas)
 
-# Filtro 3
-linhas_selecionadas_cities = df2['city'].isin( cities )
-df2 = df2.loc[linhas_selecionadas_cities, :]
+# Os mesmos filtros, aplicados nas células do cubo
+cube_filters = {
+    "country": countries,
+    "price_type": price_type_filter,
+    "city": cities,
+}
 
 #========================================================================
 #========================== Layout no Streamlit =========================
@@ -215,19 +153,17 @@ with st.container():
     # GRAFICO 1
 
     group_df = (
-        df2.loc[
-            (df2["aggregate_rating"] >= 4) & (df2["country"].isin(countries)),
-            ["restaurant_id", "country", "city"],
-        ]
-        .groupby(["country", "city"])
-        .count()
-        .reset_index()
+        cube.rollup(
+            ["country", "city"],
+            where={**cube_filters, "rating_band": lambda band: band >= 4},
+        )
+        .loc[:, ["country", "city", "restaurants"]]
+        .rename(columns={"restaurants": "restaurant_id"})
         .sort_values(["restaurant_id"], ascending=[False])
-        
     )
     
     fig = px.bar(
-        group_df.head(10),
+        for_plotly(group_df.head(10)),
         x="city",
         y="restaurant_id",
         text="restaurant_id",
@@ -247,18 +183,17 @@ with st.container():
 
     # GRAFICO 2
     group_df = (
-        df2.loc[
-            (df2["aggregate_rating"] < 4) & (df2["country"].isin(countries)),
-            ["restaurant_id", "country", "city"],
-        ]
-        .groupby(["country", "city"])
-        .count()
+        cube.rollup(
+            ["country", "city"],
+            where={**cube_filters, "rating_band": lambda band: band < 4},
+        )
+        .loc[:, ["country", "city", "restaurants"]]
+        .rename(columns={"restaurants": "restaurant_id"})
         .sort_values(["restaurant_id", "city"], ascending=[False, True])
-        .reset_index()
     )
 
     fig = px.bar(
-        group_df.head(10),
+        for_plotly(group_df.head(10)),
         x="city",
         y="restaurant_id",
         text="restaurant_id",
@@ -277,7 +212,7 @@ with st.container():
 #=================================================================================
      # GRAFICO 3
     fig_box = px.box(
-    df2,
+    for_plotly(df2),
     x="country",
     y="aggregate_rating",
     color="country",
@@ -293,18 +228,13 @@ with st.container():
 
     # Agrupe por país e cidade, calcule a média da avaliação e conte o número de restaurantes
     group_df = (
-        df2.loc[
-            df2["country"].isin(countries),
-            ["restaurant_id", "country", "city", "aggregate_rating"],
-        ]
-        .groupby(["country", "city"])
-        .agg({"aggregate_rating": "mean", "restaurant_id": "count"})
-        .reset_index()
-        .rename(columns={"restaurant_id": "num_restaurants"})
+        cube.rollup(["country", "city"], where=cube_filters)
+        .loc[:, ["country", "city", "rating_mean", "restaurants"]]
+        .rename(columns={"rating_mean": "aggregate_rating", "restaurants": "num_restaurants"})
     )
 
     fig_scatter = px.scatter(
-        group_df,
+        for_plotly(group_df),
         x="num_restaurants",
         y="aggregate_rating",
         color="country",
@@ -318,15 +248,14 @@ with st.container():
 #=================================================================================
      # GRAFICO 5
     group_df = (
-        df2.loc[df2["country"].isin(countries), ["cuisines", "country", "city"]]
-        .groupby(["country", "city"])
-        .nunique()
+        cube.rollup(["country", "city"], where=cube_filters, distinct=["cuisines"])
+        .loc[:, ["country", "city", "distinct_cuisines"]]
+        .rename(columns={"distinct_cuisines": "cuisines"})
         .sort_values(["cuisines", "city"], ascending=[False, True])
-        .reset_index()
     )
 
     fig = px.bar(
-        group_df.head(10),
+        for_plotly(group_df.head(10)),
         x="city",
         y="cuisines",
         text="cuisines",
@@ -342,6 +271,54 @@ with st.container():
     st.plotly_chart(fig)
 #=================================================================================
 
+#========================================================================
+#==================== Detalhamento por Localidade =======================
+#========================================================================
+# País > cidade > localidade: cada nível aberto é uma consulta à hierarquia
+# pré-agregada, com todos os restaurantes (sem os filtros do menu lateral)
+st.markdown('### Detalhamento: País > Cidade > Localidade')
+
+DRILL_LABELS = {
+    'country': 'País',
+    'city': 'Cidade',
+    'locality': 'Localidade',
+    'restaurants': 'Restaurantes',
+    'rating_mean': 'Avaliação Média',
+    'cost_mean': 'Custo Médio para Dois',
+    'delivery_share': 'Entrega Online (%)',
+}
+
+with st.container():
+    col1, col2 = st.columns(2)
+
+    drill_country = col1.selectbox(
+        'País:', hierarchy.children().index.tolist(), index=None, placeholder='Todos os países',
+    )
+    drill_city = col2.selectbox(
+        'Cidade:',
+        hierarchy.children((drill_country,)).index.tolist() if drill_country else [],
+        index=None,
+        placeholder='Todas as cidades',
+        disabled=drill_country is None,
+    )
+
+    drill_path = tuple(p for p in (drill_country, drill_city) if p is not None)
+    node = hierarchy.node(drill_path)
+
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric('Restaurantes', int(node['restaurants']))
+    col2.metric('Avaliação Média', f"{node['rating_mean']:.2f}")
+    col3.metric('Custo Médio para Dois', f"{node['cost_mean']:.2f}")
+    col4.metric('Entrega Online', f"{node['delivery_share']:.1%}")
+
+    drill_df = hierarchy.children(drill_path)
+    drill_df = drill_df.assign(
+        rating_mean=drill_df['rating_mean'].round(2),
+        cost_mean=drill_df['cost_mean'].round(2),
+        delivery_share=(drill_df['delivery_share'] * 100).round(1),
+    )
+    st.dataframe(drill_df.reset_index().rename(columns=DRILL_LABELS), hide_index=True)
+
 
 
 
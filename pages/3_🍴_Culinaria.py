@@ -1,7 +1,6 @@
 # Libraries
 import pandas as pd
 import numpy as np
-import inflection
 import plotly.express as px
 from PIL import Image
 import streamlit as st
@@ -10,134 +9,48 @@ import folium
 from folium.plugins import MarkerCluster
 from streamlit_folium import folium_static
 
+from vorges_eat.loader import (
+    enable_copy_on_write,
+    load_cube,
+    load_cuisine_ranking,
+    load_data,
+    load_filter_index,
+    load_image,
+)
+from vorges_eat.plotting import for_plotly, for_table
+from vorges_eat.ranking import top_n
+
+# Copy-on-Write do pandas para os frames compartilhados (ver vorges_eat/loader.py)
+enable_copy_on_write()
 
-#========================================================================
-#==================== Variáveis Auxiliares ==============================
-#========================================================================
-FILE_PATH = 'datasets/zomato.csv'
-
-COUNTRIES = {
-    1: "India",
-    14: "Australia",
-    30: "Brazil",
-    37: "Canada",
-    94: "Indonesia",
-    148: "New Zeland",
-    162: "Philippines",
-    166: "Qatar",
-    184: "Singapure",
-    189: "South Africa",
-    191: "Sri Lanka",
-    208: "Turkey",
-    214: "United Arab Emirates",
-    215: "England",
-    216: "United States of America",
-}
-
-
-COLORS = {
-    "3F7E00": "darkgreen",
-    "5BA829": "green",
-    "9ACD32": "lightgreen",
-    "CDD614": "orange",
-    "FFBA00": "red",
-    "CBCBC8": "darkred",
-    "FF7800": "darkred",
-}
 
 #========================================================================
-#==================== Funções Auxiliares ================================
+#========================== Carregar os Dados ===========================
 #========================================================================
+# Colunas dos cartões e da tabela de restaurantes
+RESTAURANT_COLUMNS = [
+    "restaurant_id",
+    "restaurant_name",
+    "country",
+    "city",
+    "cuisines",
+    "average_cost_for_two",
+    "currency",
+    "aggregate_rating",
+    "votes",
+]
 
-# renomear as colunas em snakecase
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-
-    return df
-
-# Substituir o código do país pelo seu nome
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-
-# Substituir o código da cor por seu nome
-def color_name(color_code):
-    return COLORS[color_code]
-
-# Substituir o price_range pelas nomes
-def create_price_tye(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-    
-# Ajustar as ordens das colunas
-def adjust_columns_order(dataframe):
-    df = dataframe.copy()
-    new_cols_order = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "address",
-        "locality",
-        "locality_verbose",
-        "longitude",
-        "latitude",
-        "cuisines",
-        "price_type",
-        "average_cost_for_two",
-        "currency",
-        "has_table_booking",
-        "has_online_delivery",
-        "is_delivering_now",
-        "aggregate_rating",
-        "rating_color",
-        "color_name",
-        "rating_text",
-        "votes",
-    ]
-    return df.loc[:, new_cols_order]
-
-
-# Processar e ransformar os dados
-def process_data(file_path):
-    df = pd.read_csv(file_path)
-    df = df.dropna()
-    df = rename_columns(df)
-    df["price_type"] = df.loc[:, "price_range"].apply(lambda x: create_price_tye(x))
-    df["country"] = df.loc[:, "country_code"].apply(lambda x: country_name(x))
-    df["color_name"] = df.loc[:, "rating_color"].apply(lambda x: color_name(x))
-    df["cuisines"] = df.loc[:, "cuisines"].apply(lambda x: x.split(",")[0])
-    df = df.drop_duplicates()
-    df = adjust_columns_order(df)
-    df.to_csv('datasets/data_processed.csv', index=False)
-    return df
-
-# Carregar os dados
-df_raw = pd.read_csv(FILE_PATH)
-
-# Copy
-df1 = df_raw.copy()
-
-# Chamar a função para renomear as colunas
-df1 = rename_columns( df1 )
-
-
-# Chamar a função para processar os dados
-df2 = process_data(FILE_PATH)
+# Dados processados, compartilhados entre as sessões (ver vorges_eat/loader.py)
+restaurants = load_data(columns=RESTAURANT_COLUMNS)
+
+# Índice dos filtros do menu lateral, compartilhado entre as sessões
+filter_index = load_filter_index()
+
+# Cubo de métricas pré-agregadas (ver vorges_eat/cube.py)
+cube = load_cube()
+
+# Ranking dos restaurantes por culinária, para os cartões
+cuisine_ranking = load_cuisine_ranking()
 
 #========================================================================
 #========================== Menu Lateral ================================
@@ -148,7 +61,7 @@ st.header('Vorges Eat Marktplace: Dashboard Tipo Culinário')
 
 
 #============================= Imagem Inicial ==========================
-image = Image.open('culinary.jpg')
+image = load_image('culinary.jpg', width=620)
 st.image(image, caption= 'New York, United States', width=620)
 
 st.markdown("""---""")
@@ -156,7 +69,7 @@ st.markdown("""---""")
 #===========================
 # Criar o menu lateral
 #===========================
-image = Image.open('Logo Preto Sem Fundo.png')
+image = load_image('Logo Preto Sem Fundo.png', width=120)
 st.sidebar.image( image, width = 120)
 
 st.sidebar.markdown('# Vorges Eat')
@@ -170,7 +83,7 @@ st.sidebar.markdown('## Filtros')
 # Filtro 1
 countries = st.sidebar.multiselect(
     'Escolha os Países que deseja visualizar:',
-    df2.loc[:,'country'].unique().tolist(),
+    filter_index.values('country'),
     default=['Brazil','England','Qatar','South Africa','Canada','Australia']
 )
 st.sidebar.markdown("""---""")
@@ -178,23 +91,34 @@ st.sidebar.markdown("""---""")
 # Filtro 2
 price_type_filter = st.sidebar.multiselect(
     'Escolja o Tipo de Preço Avaliado:',
-    df2.loc[:,'price_type'].unique().tolist(),
+    filter_index.values('price_type'),
     default = ['expensive', 'gourmet', 'normal', 'cheap']
 )
 st.sidebar.markdown("""---""")
 
+# Culinárias dos cartões de melhor restaurante
+card_cuisines = st.sidebar.multiselect(
+    'Culinárias dos cartões de melhor restaurante:',
+    list(cuisine_ranking.groups),
+    default=['Italian', 'American', 'Arabian', 'Japanese', 'Brazilian']
+)
+st.sidebar.markdown("""---""")
+
 
 #========================================================================
 #========================== Ativando filtros ============================
 #========================================================================
 
-# Filtro 1
-linhas_selecionadas_countries = df2['country'].isin( countries )
-df2 = df2.loc[linhas_selecionadas_countries, :]
+# Filtros 1 e 2: bitmaps pré-calculados (OR entre os valores, AND entre os
+# filtros) resolvem as linhas selecionadas, e o dataframe é montado uma vez
+linhas_selecionadas = filter_index.select(
+    country=countries,
+    price_type=price_type_filter,
+)
+df2 = restaurants.take(linhas_selecionadas)
 
-# Filtro 2
-linhas_selecionadas_price = df2['price_type'].isin( price_type_filter )
-df2 = df2.loc[linhas_selecionadas_price, :]
+# Os mesmos filtros, aplicados nas células do cubo
+cube_filters = {"country": countries, "price_type": price_type_filter}
 
 
 #========================================================================
@@ -202,110 +126,45 @@ df2 = df2.loc[linhas_selecionadas_price, :]
 #========================================================================
 
 # Funções auxiliares para criação dos gráficos
-def top_cuisines():
-
-    cuisines = {
-        "Italian": "",
-        "American": "",
-        "Arabian": "",
-        "Japanese": "",
-        "Brazilian": "",
-    }
-
-    cols = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "cuisines",
-        "average_cost_for_two",
-        "currency",
-        "aggregate_rating",
-        "votes",
-    ]
-
-    for key in cuisines.keys():
-
-        lines = df2["cuisines"] == key
-
-        cuisines[key] = (
-            df2.loc[lines, cols]
-            .sort_values(["aggregate_rating", "restaurant_id"], ascending=[False, True])
-            .iloc[0, :]
-            .to_dict()
-        )
+def top_cuisines(selected):
 
-    return cuisines
+    # Melhor restaurante de todas as culinárias de uma vez, pelo ranking
+    # pré-calculado (ver vorges_eat/ranking.py), só entre as linhas filtradas
+    best = restaurants.take(cuisine_ranking.top(1, linhas_selecionadas))
+    best = {row["cuisines"]: row for row in best.to_dict("records")}
 
-#========================================================================
+    # Culinárias sem restaurantes na seleção ficam sem cartão
+    return {cuisine: best[cuisine] for cuisine in selected if cuisine in best}
 
-def write_metrics():
-
-    cuisines = top_cuisines()
-
-    italian, american, arabian, japonese, brazilian = st.columns(len(cuisines))
-
-    with italian:
-        st.metric(
-            label=f'Italian: {cuisines["Italian"]["restaurant_name"]}',
-            value=f'{cuisines["Italian"]["aggregate_rating"]}/5.0',
-            help=f"""
-            País: {cuisines["Italian"]['country']}\n
-            Cidade: {cuisines["Italian"]['city']}\n
-            Média Prato para dois: {cuisines["Italian"]['average_cost_for_two']} ({cuisines["Italian"]['currency']})
-            """,
-            
-            )
-
-        with american:
-            st.metric(
-                label=f'American: {cuisines["American"]["restaurant_name"]}',
-                value=f'{cuisines["American"]["aggregate_rating"]}/5.0',
-                help=f"""
-                País: {cuisines["American"]['country']}\n
-                Cidade: {cuisines["American"]['city']}\n
-                Média Prato para dois: {cuisines["American"]['average_cost_for_two']} ({cuisines["American"]['currency']})
-            """,
-            )
-
-        with arabian:
-            st.metric(
-                label=f'Arabian: {cuisines["Arabian"]["restaurant_name"]}',
-                value=f'{cuisines["Arabian"]["aggregate_rating"]}/5.0',
-                help=f"""
-                País: {cuisines["Arabian"]['country']}\n
-                Cidade: {cuisines["Arabian"]['city']}\n
-                Média Prato para dois: {cuisines["Arabian"]['average_cost_for_two']} ({cuisines["Arabian"]['currency']})
-            """,
-            )
-
-        with japonese:
-            st.metric(
-                label=f'Japanese: {cuisines["Japanese"]["restaurant_name"]}',
-                value=f'{cuisines["Japanese"]["aggregate_rating"]}/5.0',
-                help=f"""
-                País: {cuisines["Japanese"]['country']}\n
-                Cidade: {cuisines["Japanese"]['city']}\n
-                Média Prato para dois: {cuisines["Japanese"]['average_cost_for_two']} ({cuisines["Japanese"]['currency']})
-            """,
-            )
-
-        with brazilian:
-            st.metric(
-                label=f'Brazilian: {cuisines["Brazilian"]["restaurant_name"]}',
-                value=f'{cuisines["Brazilian"]["aggregate_rating"]}/5.0',
-                help=f"""
-                País: {cuisines["Brazilian"]['country']}\n
-                Cidade: {cuisines["Brazilian"]['city']}\n
-                Média Prato para dois: {cuisines["Brazilian"]['average_cost_for_two']} ({cuisines["Brazilian"]['currency']})
-            """,
-            )
+# Colunas de percentual (0-100) com duas casas e o símbolo %
+def percent_columns(dataframe):
+    return {col: st.column_config.NumberColumn(col, format="%.2f%%") for col in dataframe.columns}
+
+#========================================================================
 
+def write_metrics(selected, per_row=5):
+
+    cuisines = top_cuisines(selected)
+    names = list(cuisines)
+
+    for i in range(0, len(names), per_row):
+        for column, name in zip(st.columns(per_row), names[i:i + per_row]):
+            best = cuisines[name]
+            with column:
+                st.metric(
+                    label=f'{name}: {best["restaurant_name"]}',
+                    value=f'{best["aggregate_rating"]:.1f}/5.0',
+                    help=f"""
+                    País: {best['country']}\n
+                    Cidade: {best['city']}\n
+                    Média Prato para dois: {best['average_cost_for_two']} ({best['currency']})
+                    """,
+                )
 
     return None
 
 # Escreva os cartões métricas na tela
-write_metrics()
+write_metrics(card_cuisines)
 
 #========================================================================
 
@@ -323,12 +182,13 @@ cols = [
 ]
 
 
-# Ordenar DataFrame pelos critérios desejados
-df_top10 = df2.sort_values(by=["aggregate_rating", "votes", "average_cost_for_two"],
-                          ascending=[False, False, True]).head(10)
+# Os 10 primeiros pelos critérios desejados (seleção parcial, sem ordenar
+# o dataframe inteiro; ver vorges_eat/ranking.py)
+df_top10 = top_n(df2, ["aggregate_rating", "votes", "average_cost_for_two"],
+                 [False, False, True], n=10)
 
 # Exibir a tabela no Streamlit
-st.dataframe(df_top10[cols].reset_index(drop=True))
+st.dataframe(for_table(df_top10[cols].reset_index(drop=True)))
 
 st.write("Top 10 restaurantes com a maior média de avaliação, maior número de votos e com o preço médio para dois menor.")
 
@@ -337,19 +197,16 @@ st.markdown("""---""")
 # GRAFICOS
 with st.container():
     
-    lines = df2["country"].isin(countries)
-
     grouped_df = (
-            df2.loc[lines, ["aggregate_rating", "cuisines"]]
-            .groupby("cuisines")
-            .mean()
+            cube.rollup(["cuisines"], where=cube_filters)
+            .loc[:, ["cuisines", "rating_mean"]]
+            .rename(columns={"rating_mean": "aggregate_rating"})
             .sort_values("aggregate_rating", ascending=False)
-            .reset_index()
             .head(10)
         )
 
     fig = px.bar(
-        grouped_df.head(10),
+        for_plotly(grouped_df.head(10)),
         x="cuisines",
         y="aggregate_rating",
         text="aggregate_rating",
@@ -368,19 +225,16 @@ with st.container():
 
 
     #GRAFICO 2
-    lines = df2["country"].isin(countries)
-
     grouped_df = (
-            df2.loc[lines, ["aggregate_rating", "cuisines"]]
-            .groupby("cuisines")
-            .mean()
+            cube.rollup(["cuisines"], where=cube_filters)
+            .loc[:, ["cuisines", "rating_mean"]]
+            .rename(columns={"rating_mean": "aggregate_rating"})
             .sort_values("aggregate_rating", ascending=True)
-            .reset_index()
             .head(10)
         )
 
     fig = px.bar(
-        grouped_df.head(10),
+        for_plotly(grouped_df.head(10)),
         x="cuisines",
         y="aggregate_rating",
         text="aggregate_rating",
@@ -402,13 +256,13 @@ with st.container():
 
     st.markdown("##### Tabela com % preço por tipo culinário")
     
-    # Agrupe os dados pelo tipo culinário
-    grouped_data = df2.groupby('cuisines')['price_type'].value_counts(normalize=True).unstack() *100
-
-    grouped_data_percent_formatted = grouped_data.applymap(lambda x: f'{x:.2f}%')
+    # Percentual de cada tipo de preço por tipo culinário, direto das células
+    # do cubo (só as combinações que existem na seleção). Os números seguem
+    # numéricos até o navegador: o formato vem do column_config.
+    grouped_data = cube.crosstab('cuisines', 'price_type', where=cube_filters, normalize='index') *100
+    grouped_data = grouped_data.rename(columns=str)
 
-    #st.dataframe(grouped_data_percent_formatted)
-    st.dataframe(grouped_data_percent_formatted.style.set_table_styles([{'selector': 'table', 'props': [('font-size', '16px')]}]))
+    st.dataframe(grouped_data, column_config=percent_columns(grouped_data))
 
     st.markdown("""---""")
 
@@ -417,15 +271,8 @@ with st.container():
 
     st.markdown("##### Tabela com % preço por País")
     
-    # Agrupe os dados pelo tipo culinário
-    grouped_data_country = df2.groupby('country')['price_type'].value_counts(normalize=True).unstack() *100
-
-    grouped_data_percent_formatted_country = grouped_data_country.applymap(lambda x: f'{x:.2f}%')
-
-    #st.dataframe(grouped_data_percent_formatted)
-    st.dataframe(grouped_data_percent_formatted_country.style.set_table_styles([{'selector': 'table', 'props': [('font-size', '16px')]}]))
-
-    
-
-
+    # Percentual de cada tipo de preço por país, também a partir do cubo
+    grouped_data_country = cube.crosstab('country', 'price_type', where=cube_filters, normalize='index') *100
+    grouped_data_country = grouped_data_country.rename(columns=str)
 
+    st.dataframe(grouped_data_country, column_config=percent_columns(grouped_data_country))
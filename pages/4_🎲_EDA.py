@@ -1,7 +1,6 @@
 # Libraries
 import pandas as pd
 import numpy as np
-import inflection
 import plotly.express as px
 from PIL import Image
 import streamlit as st
@@ -10,40 +9,11 @@ import folium
 from folium.plugins import MarkerCluster
 from streamlit_folium import folium_static
 
+from vorges_eat.loader import enable_copy_on_write, load_data, load_filter_index, load_image, load_raw_data
+
+# Copy-on-Write do pandas para os frames compartilhados (ver vorges_eat/loader.py)
+enable_copy_on_write()
 
-#========================================================================
-#==================== Variáveis Auxiliares ==============================
-#========================================================================
-FILE_PATH = 'datasets/zomato.csv'
-
-COUNTRIES = {
-    1: "India",
-    14: "Australia",
-    30: "Brazil",
-    37: "Canada",
-    94: "Indonesia",
-    148: "New Zeland",
-    162: "Philippines",
-    166: "Qatar",
-    184: "Singapure",
-    189: "South Africa",
-    191: "Sri Lanka",
-    208: "Turkey",
-    214: "United Arab Emirates",
-    215: "England",
-    216: "United States of America",
-}
-
-
-COLORS = {
-    "3F7E00": "darkgreen",
-    "5BA829": "green",
-    "9ACD32": "lightgreen",
-    "CDD614": "orange",
-    "FFBA00": "red",
-    "CBCBC8": "darkred",
-    "FF7800": "darkred",
-}
 
 #========================================================================
 #==================== Funções Auxiliares ================================
@@ -62,82 +32,6 @@ def get_numerical_attributes(dataframe):
 def get_cat_attributes(dataframe):
     return dataframe.select_dtypes(exclude=['int64','float64'])
 
-# renomear as colunas em snakecase 
-def rename_columns(dataframe):
-    df = dataframe.copy()
-    title = lambda x: inflection.titleize(x)
-    snakecase = lambda x: inflection.underscore(x)
-    spaces = lambda x: x.replace(" ", "")
-    cols_old = list(df.columns)
-    cols_old = list(map(title, cols_old))
-    cols_old = list(map(spaces, cols_old))
-    cols_new = list(map(snakecase, cols_old))
-    df.columns = cols_new
-
-    return df
-
-# Substituir o código do país pelo seu nome
-def country_name(country_id):
-    return COUNTRIES[country_id]
-
-
-# Substituir o código da cor por seu nome
-def color_name(color_code):
-    return COLORS[color_code]
-
-# Substituir o price_range pelas nomes
-def create_price_tye(price_range):
-    if price_range == 1:
-        return "cheap"
-    elif price_range == 2:
-        return "normal"
-    elif price_range == 3:
-        return "expensive"
-    else:
-        return "gourmet"
-    
-# Ajustar as ordens das colunas
-def adjust_columns_order(dataframe):
-    df = dataframe.copy()
-    new_cols_order = [
-        "restaurant_id",
-        "restaurant_name",
-        "country",
-        "city",
-        "address",
-        "locality",
-        "locality_verbose",
-        "longitude",
-        "latitude",
-        "cuisines",
-        "price_type",
-        "average_cost_for_two",
-        "currency",
-        "has_table_booking",
-        "has_online_delivery",
-        "is_delivering_now",
-        "aggregate_rating",
-        "rating_color",
-        "color_name",
-        "rating_text",
-        "votes",
-    ]
-    return df.loc[:, new_cols_order]
-
-# Processar e ransformar os dados
-def process_data(file_path):
-    df = pd.read_csv(file_path)
-    df = df.dropna()
-    df = rename_columns(df)
-    df["price_type"] = df.loc[:, "price_range"].apply(lambda x: create_price_tye(x))
-    df["country"] = df.loc[:, "country_code"].apply(lambda x: country_name(x))
-    df["color_name"] = df.loc[:, "rating_color"].apply(lambda x: color_name(x))
-    df["cuisines"] = df.loc[:, "cuisines"].apply(lambda x: x.split(",")[0])
-    df = df.drop_duplicates()
-    df = adjust_columns_order(df)
-    df.to_csv('datasets/data_processed.csv', index=False)
-    return df
-
 # Função - Medidas Estatísticas
 def get_first_order_statistics(dataframe):
     # Métricas de Tendência Central
@@ -159,18 +53,13 @@ def get_first_order_statistics(dataframe):
     return m
 
 
-# Carregar os dados
-df_raw = pd.read_csv(FILE_PATH)
-
-# Copy
-df1 = df_raw.copy()
+# Carregar os dados (brutos e processados), compartilhados entre as sessões
+df1 = load_raw_data()
 
-# Chamar a função para renomear as colunas
-df1 = rename_columns( df1 )
+df2 = load_data()
 
-
-# Chamar a função para processar os dados
-df2 = process_data(FILE_PATH)
+# Índice dos filtros do menu lateral, compartilhado entre as sessões
+filter_index = load_filter_index()
 
 
 def dataframe_dimensions(dataframe):
@@ -189,14 +78,14 @@ st.markdown("""---""")
 
 
 #============================= Imagem Inicial ==========================
-image2 = Image.open('eda.jpg')
+image2 = load_image('eda.jpg', width=620)
 st.image(image2, caption= 'Exploratory Data Analysis', width=620)
 
 
 #===========================
 # Criar o menu lateral
 #===========================
-image = Image.open('Logo Preto Sem Fundo.png')
+image = load_image('Logo Preto Sem Fundo.png', width=120)
 st.sidebar.image( image, width = 120)
 
 st.sidebar.markdown('# Vorges Eat')
@@ -210,7 +99,7 @@ st.sidebar.markdown('## Filtros')
 # Filtro 1
 countries = st.sidebar.multiselect(
     'Escolha os Países que deseja visualizar:',
-    df2.loc[:,'country'].unique().tolist(),
+    filter_index.values('country'),
     default=['Brazil','England','Qatar','South Africa','Canada','Australia']
 )
 st.sidebar.markdown("""---""")
@@ -218,7 +107,7 @@ st.sidebar.markdown("""---""")
 # Filtro 2
 price_type_filter = st.sidebar.multiselect(
     'Escolja o Tipo de Preço Avaliado:',
-    df2.loc[:,'price_type'].unique().tolist(),
+    filter_index.values('price_type'),
     default = ['expensive', 'gourmet', 'normal', 'cheap']
 )
 st.sidebar.markdown("""---""")
@@ -228,13 +117,13 @@ st.sidebar.markdown("""---""")
 #========================== Ativando filtros ============================
 #========================================================================
 
-# Filtro 1
-linhas_selecionadas_countries = df2['country'].isin( countries )
-df2 = df2.loc[linhas_selecionadas_countries, :]
-
-# Filtro 2
-linhas_selecionadas_price = df2['price_type'].isin( price_type_filter )
-df2 = df2.loc[linhas_selecionadas_price, :]
+# Filtros 1 e 2: bitmaps pré-calculados (OR entre os valores, AND entre os
+# filtros) resolvem as linhas selecionadas, e o dataframe é montado uma vez
+linhas_selecionadas = filter_index.select(
+    country=countries,
+    price_type=price_type_filter,
+)
+df2 = df2.take(linhas_selecionadas)
 
 
 
@@ -306,7 +195,7 @@ st.write("""---""")
 
 #========================GRAFICO DE HISTOGRAMA VARIAVEIS NUM ======================
 st.markdown('##### Distribuição das variáveis numéricas')
-image = Image.open('hist.png')
+image = load_image('hist.png')
 st.image(image, caption= 'Variáveis Numéricas')
 
 st.write("""---""")
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from vorges_eat.processing import FILE_PATH, compact_dtypes
+
+
+# Quantidade de dataframes aleatórios (sementes) usados em cada teste
+SEEDS = range(20)
+
+COUNTRIES = ["Brazil", "India", "Qatar", "Canada", "England"]
+PRICE_TYPES = ["cheap", "normal", "expensive", "gourmet"]
+RATINGS = [
+    (0.0, "Not rated", "CBCBC8", "darkred"),
+    (2.5, "Average", "FFBA00", "orange"),
+    (3.5, "Good", "9ACD32", "lightgreen"),
+    (4.0, "Very Good", "5BA829", "green"),
+    (4.5, "Excellent", "3F7E00", "darkgreen"),
+]
+
+
+# Restaurantes aleatórios com as colunas e os tipos do dataframe processado
+# (ver vorges_eat/processing.py). Poucos valores distintos por coluna, para
+# haver muitos empates; metade das posições espalhada pelo mundo e metade
+# concentrada numa cidade, para exercitar células grandes e pequenas da
+# grade do mapa.
+def make_restaurants(seed, n_rows=300):
+    rng = np.random.default_rng(seed)
+    spread = n_rows // 2
+
+    country = rng.choice(COUNTRIES, n_rows)
+    city = np.char.add(country, rng.choice([" 1", " 2", " 3"], n_rows))
+    locality = np.char.add(city, rng.choice([" centro", " norte", " sul"], n_rows))
+    rating = rng.integers(len(RATINGS), size=n_rows)
+    latitude = np.concatenate([rng.uniform(-80, 80, spread), rng.normal(-23.55, 0.05, n_rows - spread)])
+    longitude = np.concatenate([rng.uniform(-180, 180, spread), rng.normal(-46.63, 0.05, n_rows - spread)])
+
+    df = pd.DataFrame(
+        {
+            "restaurant_id": rng.permutation(n_rows) + 1000,
+            "restaurant_name": rng.choice(["Pizza Place", "Sushi Bar", "Café", "Grill", "Bistrô"], n_rows),
+            "country": country,
+            "city": city,
+            "address": np.char.add("Rua ", rng.integers(1, 100, n_rows).astype(str)),
+            "locality": locality,
+            "locality_verbose": np.char.add(np.char.add(locality, ", "), city),
+            "longitude": longitude,
+            "latitude": latitude,
+            "cuisines": rng.choice([f"cuisine {i}" for i in range(8)], n_rows),
+            "price_type": rng.choice(PRICE_TYPES, n_rows),
+            "average_cost_for_two": rng.choice([10, 20, 30, 50], n_rows),
+            "currency": rng.choice(["Real(R$)", "Dollar($)"], n_rows),
+            "has_table_booking": rng.integers(0, 2, n_rows),
+            "has_online_delivery": rng.integers(0, 2, n_rows),
+            "is_delivering_now": rng.integers(0, 2, n_rows),
+            "aggregate_rating": np.array([RATINGS[i][0] for i in rating]) + rng.choice([0.0, 0.2, 0.4], n_rows),
+            "rating_color": [RATINGS[i][2] for i in rating],
+            "color_name": [RATINGS[i][3] for i in rating],
+            "rating_text": [RATINGS[i][1] for i in rating],
+            "votes": rng.integers(0, 5, n_rows) * 10,
+        }
+    )
+    return compact_dtypes(df)
+
+
+@pytest.fixture(params=SEEDS)
+def seed(request):
+    return request.param
+
+
+@pytest.fixture
+def rng(seed):
+    return np.random.default_rng(seed)
+
+
+# Dataframe aleatório de cada semente (tamanho também aleatório, incluindo
+# o dataframe vazio)
+@pytest.fixture
+def restaurants(seed, rng):
+    return make_restaurants(seed, int(rng.integers(0, 300)))
+
+
+# Trecho do csv de origem (datasets/zomato.csv) para os testes do ETL
+@pytest.fixture
+def source_csv(tmp_path):
+    source = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), FILE_PATH)
+    path = tmp_path / "zomato.csv"
+    pd.read_csv(source, nrows=400).to_csv(path, index=False)
+    return str(path)
@@ -0,0 +1,113 @@
+import numpy as np
+import pandas as pd
+
+from vorges_eat.cube import CUBE_DIMENSIONS, Cube, build_cube, rating_band
+
+
+# Dados como o cubo os vê: nota arredondada em float64 e a faixa de nota
+def plain(dataframe):
+    return dataframe.assign(
+        aggregate_rating=dataframe["aggregate_rating"].astype('float64').round(6),
+        rating_band=rating_band(dataframe["aggregate_rating"]),
+    )
+
+
+# Filtros aleatórios: listas de valores de algumas dimensões
+def random_where(df, rng):
+    where = {}
+    for dim in rng.choice(CUBE_DIMENSIONS, int(rng.integers(0, 3)), replace=False):
+        values = df[dim].unique().tolist()
+        where[dim] = list(rng.choice(values, int(rng.integers(1, len(values) + 1)), replace=False)) if values else []
+    return where
+
+
+def mask_of(df, where):
+    mask = np.ones(len(df), dtype=bool)
+    for dim, values in where.items():
+        mask &= df[dim].isin(values).to_numpy()
+    return mask
+
+
+def test_rollup_matches_groupby(restaurants, rng):
+    df = plain(restaurants)
+    cube = Cube(build_cube(restaurants))
+
+    for _ in range(5):
+        by = list(rng.choice(["country", "city", "cuisines", "price_type", "rating_band"], int(rng.integers(1, 3)),
+                             replace=False))
+        where = random_where(df, rng)
+        selected = df.loc[mask_of(df, where)]
+
+        expected = (
+            selected.groupby(by, observed=True)
+            .agg(
+                restaurants=("restaurant_id", "count"),
+                votes_sum=("votes", "sum"),
+                cost_max=("average_cost_for_two", "max"),
+                rating_max=("aggregate_rating", "max"),
+                votes_mean=("votes", "mean"),
+                cost_mean=("average_cost_for_two", "mean"),
+                rating_mean=("aggregate_rating", "mean"),
+                distinct_city=("city", "nunique"),
+            )
+            .reset_index()
+        )
+        result = cube.rollup(by, where=where, distinct=["city"])
+        pd.testing.assert_frame_equal(result[expected.columns], expected, check_dtype=False)
+
+
+def test_rollup_total_matches_plain_sums(restaurants, rng):
+    df = plain(restaurants)
+    cube = Cube(build_cube(restaurants))
+    where = random_where(df, rng)
+    selected = df.loc[mask_of(df, where)]
+
+    total = cube.rollup(where=where, distinct=["country", "cuisines"])
+    assert len(total) == 1
+    total = total.iloc[0]
+    assert total["restaurants"] == len(selected)
+    assert total["votes_sum"] == selected["votes"].sum()
+    assert total["distinct_country"] == selected["country"].nunique()
+    assert total["distinct_cuisines"] == selected["cuisines"].nunique()
+    if len(selected):
+        assert np.isclose(total["rating_mean"], selected["aggregate_rating"].mean())
+        assert np.isclose(total["cost_mean"], selected["average_cost_for_two"].mean())
+
+
+def test_slice_matches_where(restaurants, rng):
+    cube = Cube(build_cube(restaurants))
+    where = random_where(plain(restaurants), rng)
+
+    pd.testing.assert_frame_equal(
+        cube.slice(where).rollup(["country"], distinct=["city"]),
+        cube.rollup(["country"], where=where, distinct=["city"]),
+    )
+
+
+def test_rollup_with_callable_filter(restaurants):
+    df = plain(restaurants)
+    cube = Cube(build_cube(restaurants))
+
+    result = cube.rollup(["country"], where={"rating_band": lambda band: band >= 4})
+    expected = df.loc[df["aggregate_rating"] >= 4].groupby("country", observed=True).size()
+    np.testing.assert_array_equal(result["restaurants"], expected.to_numpy())
+    assert result["country"].tolist() == expected.index.tolist()
+
+
+def test_crosstab_matches_pandas(restaurants, rng):
+    df = plain(restaurants)
+    cube = Cube(build_cube(restaurants))
+    where = random_where(df, rng)
+    selected = df.loc[mask_of(df, where)]
+    if len(selected) == 0:
+        return
+
+    for normalize in [False, "index"]:
+        expected = pd.crosstab(
+            selected["country"].astype(str), selected["price_type"].astype(str), normalize=normalize
+        )
+        expected = expected.where(expected > 0).rename_axis(index="country", columns="price_type")
+        result = cube.crosstab("country", "price_type", where=where, normalize=normalize)
+        result.index = result.index.astype(str)
+        result.columns = result.columns.astype(str)
+        pd.testing.assert_frame_equal(result, expected, check_dtype=False)
@@ -0,0 +1,125 @@
+import os
+
+import pandas as pd
+import pytest
+
+from vorges_eat import loader
+from vorges_eat.etl import run_etl, write_atomic
+from vorges_eat.processing import (
+    compact_dtypes,
+    process_data,
+    read_source_version,
+    source_version,
+    source_version_path,
+)
+
+
+# Artefatos do ETL num diretório temporário, lidos pelo loader no lugar dos
+# de datasets/
+@pytest.fixture
+def artifacts(tmp_path, source_csv, monkeypatch):
+    loader.clear_cache()
+    paths = {name: str(tmp_path / name) for name in ("data.csv", "data.parquet", "cube.parquet")}
+    run_etl(source_csv, paths["data.csv"], paths["data.parquet"], paths["cube.parquet"], tiles_dir=None)
+    monkeypatch.setattr(loader, "PROCESSED_READERS", [
+        (paths["data.parquet"], loader.read_parquet_data),
+        (paths["data.csv"], loader.read_processed_data),
+    ])
+    yield paths
+    loader.clear_cache()
+
+
+def test_etl_writes_artifacts_and_source_versions(artifacts, source_csv):
+    expected = process_data(source_csv)
+
+    pd.testing.assert_frame_equal(pd.read_csv(artifacts["data.csv"]), expected, check_dtype=False)
+    pd.testing.assert_frame_equal(pd.read_parquet(artifacts["data.parquet"]), compact_dtypes(expected))
+    for path in artifacts.values():
+        assert read_source_version(path) == source_version(source_csv)
+
+
+def test_freshness_follows_source_content(artifacts, source_csv, tmp_path):
+    parquet = artifacts["data.parquet"]
+    assert loader.processed_is_fresh(source_csv, parquet)
+
+    # Mesmo conteúdo com outro mtime (um git clone, por exemplo): continua valendo
+    copy = tmp_path / "clone.csv"
+    copy.write_bytes(open(source_csv, "rb").read())
+    os.utime(copy, (1, 1))
+    assert loader.processed_is_fresh(str(copy), parquet)
+
+    # Conteúdo diferente, mesmo tamanho: não vale mais
+    content = bytearray(open(source_csv, "rb").read())
+    content[-2:-1] = b"9" if content[-2:-1] != b"9" else b"8"
+    copy.write_bytes(bytes(content))
+    assert not loader.processed_is_fresh(str(copy), parquet)
+
+    # Sem a versão ao lado do artefato ou sem o artefato
+    os.remove(source_version_path(parquet))
+    assert not loader.processed_is_fresh(source_csv, parquet)
+    assert not loader.processed_is_fresh(source_csv, str(tmp_path / "missing.parquet"))
+
+
+def test_load_data_reads_the_fresh_artifact_or_processes_in_memory(artifacts, source_csv, tmp_path):
+    expected = compact_dtypes(process_data(source_csv))
+
+    assert loader.processed_source(source_csv) == artifacts["data.parquet"]
+    pd.testing.assert_frame_equal(loader.load_data(source_csv), expected)
+
+    # Sem o parquet, o csv processado
+    os.remove(artifacts["data.parquet"])
+    assert loader.processed_source(source_csv) == artifacts["data.csv"]
+    pd.testing.assert_frame_equal(loader.load_data(source_csv), expected)
+
+    # Origem alterada: os artefatos (versões antigas) são ignorados
+    stale = tmp_path / "stale.csv"
+    pd.read_csv(source_csv).head(100).to_csv(stale, index=False)
+    assert loader.processed_source(str(stale)) == str(stale)
+    pd.testing.assert_frame_equal(loader.load_data(str(stale)), compact_dtypes(process_data(str(stale))))
+
+
+def test_reading_never_writes(artifacts, source_csv, tmp_path):
+    before = {path: os.stat(path).st_mtime_ns for path in map(str, tmp_path.iterdir())}
+
+    loader.load_data(source_csv)
+    loader.load_data(source_csv, columns=["country", "city"])
+    loader.load_download_csv(source_csv, artifacts["data.csv"])
+
+    after = {path: os.stat(path).st_mtime_ns for path in map(str, tmp_path.iterdir())}
+    assert after == before
+
+
+def test_download_is_served_only_when_fresh(artifacts, source_csv, tmp_path):
+    expected = process_data(source_csv).to_csv(index=False, sep=';')
+    assert loader.load_download_csv(source_csv, artifacts["data.csv"]) == expected
+
+    # Artefato desatualizado: o download vem da origem, não do csv antigo
+    stale = tmp_path / "stale.csv"
+    pd.read_csv(source_csv).head(100).to_csv(stale, index=False)
+    assert loader.load_download_csv(str(stale), artifacts["data.csv"]) == (
+        process_data(str(stale)).to_csv(index=False, sep=';')
+    )
+
+
+def test_write_atomic_replaces_or_keeps_the_old_file(tmp_path):
+    path = tmp_path / "data.csv"
+    path.write_text("antigo")
+
+    def failing(tmp):
+        with open(tmp, "w") as f:
+            f.write("pela metade")
+        raise RuntimeError("falhou")
+
+    with pytest.raises(RuntimeError):
+        write_atomic(str(path), failing)
+    assert path.read_text() == "antigo"
+    assert os.listdir(tmp_path) == ["data.csv"]
+
+    def write(tmp):
+        with open(tmp, "w") as f:
+            f.write("novo")
+
+    write_atomic(str(path), write)
+    assert path.read_text() == "novo"
+    assert os.listdir(tmp_path) == ["data.csv"]
+    assert os.stat(path).st_mode & 0o777 == 0o644
@@ -0,0 +1,37 @@
+import numpy as np
+
+from vorges_eat.filters import FILTER_COLUMNS, FilterIndex
+
+
+def test_select_matches_isin(restaurants, rng):
+    # Valores ausentes não entram em nenhum bitmap
+    df = restaurants.assign(country=restaurants["country"].where(rng.random(len(restaurants)) < 0.9))
+    index = FilterIndex(df)
+
+    filters = {}
+    for col in rng.choice(FILTER_COLUMNS, 2, replace=False):
+        values = df[col].dropna().unique().tolist()
+        chosen = list(rng.choice(values, int(rng.integers(0, len(values) + 1)), replace=False)) if values else []
+        filters[col] = chosen + ["missing value"]
+
+    mask = np.ones(len(df), dtype=bool)
+    for col, values in filters.items():
+        mask &= df[col].isin(values).to_numpy()
+
+    np.testing.assert_array_equal(index.select(**filters), np.flatnonzero(mask))
+
+
+def test_select_without_filters_returns_all_rows(restaurants):
+    index = FilterIndex(restaurants)
+    n_rows = len(restaurants)
+
+    np.testing.assert_array_equal(index.select(), np.arange(n_rows))
+    np.testing.assert_array_equal(index.select(country=None), np.arange(n_rows))
+    assert len(index.select(country=[])) == 0
+
+
+def test_values_in_order_of_appearance(restaurants):
+    index = FilterIndex(restaurants)
+
+    for col in FILTER_COLUMNS:
+        assert index.values(col) == restaurants[col].dropna().unique().tolist()
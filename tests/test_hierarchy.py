@@ -0,0 +1,70 @@
+import numpy as np
+import pandas as pd
+
+from vorges_eat.hierarchy import HIERARCHY_LEVELS, Hierarchy, build_hierarchy
+
+
+# Métricas de um grupo de linhas, calculadas direto com pandas
+def plain_metrics(rows, level):
+    rows = rows.assign(
+        aggregate_rating=rows["aggregate_rating"].astype('float64').round(6),
+        **{level: rows[level].astype(str)},
+    )
+    return (
+        rows.groupby(level)
+        .agg(
+            restaurants=("aggregate_rating", "size"),
+            rating_mean=("aggregate_rating", "mean"),
+            cost_mean=("average_cost_for_two", "mean"),
+            delivery_share=("has_online_delivery", "mean"),
+        )
+        .astype('float64')
+    )
+
+
+def test_children_match_groupby(restaurants, rng):
+    hierarchy = Hierarchy(build_hierarchy(restaurants))
+    df = restaurants.astype({level: str for level in HIERARCHY_LEVELS})
+
+    # Um caminho aleatório até cada profundidade
+    path = ()
+    for level in HIERARCHY_LEVELS:
+        rows = df
+        for parent, value in zip(HIERARCHY_LEVELS, path):
+            rows = rows.loc[rows[parent] == value]
+
+        children = hierarchy.children(path)
+        expected = plain_metrics(rows, level)
+        pd.testing.assert_frame_equal(children.sort_index().astype('float64'), expected, check_names=False)
+
+        # Maiores primeiro; empates pela maior nota
+        key = list(zip(-children["restaurants"], -children["rating_mean"].round(9)))
+        assert key == sorted(key)
+
+        if len(children) == 0:
+            break
+        path = path + (str(rng.choice(children.index)),)
+
+
+def test_node_matches_parent_and_total(restaurants, rng):
+    hierarchy = Hierarchy(build_hierarchy(restaurants))
+
+    total = hierarchy.node()
+    assert total["restaurants"] == len(restaurants)
+    if len(restaurants):
+        assert np.isclose(total["rating_mean"], restaurants["aggregate_rating"].astype('float64').round(6).mean())
+        assert np.isclose(total["delivery_share"], restaurants["has_online_delivery"].mean())
+
+        countries = hierarchy.children()
+        country = str(rng.choice(countries.index))
+        pd.testing.assert_series_equal(hierarchy.node((country,)), countries.loc[country])
+        cities = hierarchy.children((country,))
+        assert cities["restaurants"].sum() == countries.loc[country, "restaurants"]
+
+
+def test_unknown_path_has_no_children(restaurants):
+    hierarchy = Hierarchy(build_hierarchy(restaurants))
+
+    children = hierarchy.children(("Atlantis",))
+    assert len(children) == 0
+    assert list(children.columns) == ["restaurants", "rating_mean", "cost_mean", "delivery_share"]
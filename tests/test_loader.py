@@ -0,0 +1,29 @@
+import subprocess
+import sys
+
+import pandas as pd
+
+from vorges_eat import loader
+
+
+# O import do pacote não muda opções globais do pandas; quem liga o
+# Copy-on-Write é o app
+def test_import_does_not_enable_copy_on_write():
+    code = "import pandas as pd, vorges_eat.loader; print(pd.get_option('mode.copy_on_write'))"
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "False"
+
+
+def test_projections_share_the_cached_columns():
+    loader.clear_cache()
+    with pd.option_context('mode.copy_on_write', True):
+        full = loader.load_data()
+        projection = loader.load_data(columns=["country", "votes"])
+        assert list(projection.columns) == ["country", "votes"]
+        assert (projection["votes"].to_numpy() == full["votes"].to_numpy()).all()
+
+        # Uma sessão que altera a sua cópia não altera o frame do cache
+        projection.loc[0, "votes"] = -1
+        full.loc[1, "votes"] = -1
+        fresh = loader.load_data(columns=["votes"])
+        assert fresh.loc[0, "votes"] != -1 and fresh.loc[1, "votes"] != -1
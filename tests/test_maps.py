@@ -0,0 +1,124 @@
+import folium
+import pytest
+from folium.plugins import HeatMap
+
+from conftest import make_restaurants
+from vorges_eat.maps import (
+    HEATMAP_ROWS,
+    MAP_COLUMNS,
+    MAX_MARKERS,
+    LayerCache,
+    layer_key,
+    viewport_layer,
+)
+from vorges_eat.spatial import GridClusters
+
+
+VIEW = ((-24.0, -23.0, -47.0, -46.0), 10)
+WORLD = (-85.0, 85.0, -180.0, 180.0)
+
+
+# Camada pequena com um marcador; `calls` conta as montagens
+def layer_builder(name, calls):
+    def build():
+        calls.append(name)
+        layer = folium.FeatureGroup(name="Restaurantes")
+        folium.Marker([-23.5, -46.6], popup=name).add_to(layer)
+        return layer
+    return build
+
+
+def test_hit_returns_cached_code_without_rebuilding():
+    cache = LayerCache()
+    calls = []
+
+    first = cache.get("a", layer_builder("a", calls))
+    second = cache.get("a", layer_builder("a", calls))
+
+    assert calls == ["a"]
+    assert second.code is first.code
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_evicts_least_recently_used():
+    cache = LayerCache(max_entries=2)
+    calls = []
+
+    cache.get("a", layer_builder("a", calls))
+    cache.get("b", layer_builder("b", calls))
+    cache.get("a", layer_builder("a", calls))
+    cache.get("c", layer_builder("c", calls))
+    assert len(cache) == 2
+
+    # "b" foi a menos usada: saiu; "a" e "c" continuam no cache
+    cache.get("a", layer_builder("a", calls))
+    cache.get("c", layer_builder("c", calls))
+    cache.get("b", layer_builder("b", calls))
+    assert calls == ["a", "b", "c", "b"]
+
+
+def test_size_cap_in_characters():
+    calls = []
+    size = len(LayerCache().get("a", layer_builder("a", calls)).code)
+    cache = LayerCache(max_chars=2 * size + size // 2)
+
+    for name in ["a", "b", "c"]:
+        cache.get(name, layer_builder(name, calls))
+    assert len(cache) == 2
+    assert cache._chars <= cache.max_chars
+
+    # Uma camada maior que o limite ainda fica (só ela) no cache
+    cache = LayerCache(max_chars=1)
+    cache.get("a", layer_builder("a", calls))
+    cache.get("b", layer_builder("b", calls))
+    assert len(cache) == 1
+    cache.get("b", layer_builder("b", calls))
+    assert calls[-2:] == ["a", "b"]
+
+
+def test_layer_key_ignores_filter_order():
+    key = layer_key(1, {"country": ["Brazil", "India"], "price_type": ["cheap", "gourmet"]}, VIEW)
+
+    assert layer_key(1, {"price_type": ["gourmet", "cheap"], "country": ["India", "Brazil"]}, VIEW) == key
+    assert layer_key(1, {"country": ["Brazil"], "price_type": ["cheap", "gourmet"]}, VIEW) != key
+    assert layer_key(2, {"country": ["Brazil", "India"], "price_type": ["cheap", "gourmet"]}, VIEW) != key
+    assert layer_key(1, {"country": ["Brazil", "India"], "price_type": ["cheap", "gourmet"]}, (VIEW[0], 11)) != key
+    assert layer_key(
+        1, {"country": ["Brazil", "India"], "price_type": ["cheap", "gourmet"]}, VIEW, mode="heatmap"
+    ) != key
+
+
+# Tipo da camada montada: "markers", "clusters" ou "heatmap"
+def layer_kind(layer):
+    (child,) = layer._children.values()
+    if isinstance(child, HeatMap):
+        return "heatmap"
+    return "markers" if child.cluster else "clusters"
+
+
+# Modo automático pela quantidade de restaurantes na área visível, com os
+# limites padrão: a visão do mundo com todos os dados atuais (6929
+# restaurantes) vira mapa de densidade
+@pytest.mark.parametrize(
+    "n_rows, kind",
+    [
+        (MAX_MARKERS, "markers"),
+        (MAX_MARKERS + 1, "clusters"),
+        (HEATMAP_ROWS, "clusters"),
+        (HEATMAP_ROWS + 1, "heatmap"),
+        (6929, "heatmap"),
+    ],
+)
+def test_auto_mode_switches_by_visible_restaurants(n_rows, kind):
+    df = make_restaurants(0, n_rows)
+    grid = GridClusters(df)
+    map_data = df.loc[:, MAP_COLUMNS]
+
+    assert len(grid.within(WORLD)) == n_rows
+    assert layer_kind(viewport_layer(grid, map_data, None, WORLD, 2)) == kind
+    assert layer_kind(viewport_layer(grid, map_data, None, WORLD, 2, mode="heatmap")) == "heatmap"
+    assert layer_kind(viewport_layer(grid, map_data, None, WORLD, 2, mode="clusters")) != "heatmap"
+
+    # Os limites valem para as linhas selecionadas na área, não para o total
+    positions = list(range(min(n_rows, MAX_MARKERS)))
+    assert layer_kind(viewport_layer(grid, map_data, positions, WORLD, 2)) == "markers"
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from vorges_eat.plotting import for_plotly, for_table
+
+
+# float32 volta a float64 com o valor que o float32 representa (4.8 e não
+# 4.800000190734863); as outras colunas ficam como estão
+def test_for_table_widens_float32_columns(restaurants):
+    table = for_table(restaurants)
+
+    assert table["aggregate_rating"].dtype == 'float64'
+    expected = pd.Series([float(str(v)) for v in restaurants["aggregate_rating"]], dtype='float64')
+    pd.testing.assert_series_equal(table["aggregate_rating"].reset_index(drop=True), expected, check_names=False)
+    for col, dtype in restaurants.dtypes.items():
+        if dtype != 'float32':
+            assert table[col].dtype == dtype
+            pd.testing.assert_series_equal(table[col], restaurants[col])
+
+
+def test_for_plotly_also_turns_categories_into_text(restaurants):
+    chart = for_plotly(restaurants)
+
+    for col, dtype in restaurants.dtypes.items():
+        if isinstance(dtype, pd.CategoricalDtype):
+            assert chart[col].dtype == object
+            assert chart[col].tolist() == restaurants[col].astype(str).tolist()
+    pd.testing.assert_frame_equal(
+        chart.select_dtypes('float64'), for_table(restaurants).select_dtypes('float64'),
+    )
@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from vorges_eat.processing import COLORS, COUNTRIES, color_name, country_name, create_price_tye, first_cuisine
+
+
+# Versões linha a linha das derivações (como eram no process_data)
+def price_type_row(price_range):
+    return {1: "cheap", 2: "normal", 3: "expensive"}.get(price_range, "gourmet")
+
+
+def raw_frame(rng, n_rows):
+    cuisines = ["Italian", "Japanese, Sushi", "Brazilian,Bar Food", "Cafe, Desserts, Tea", " Pizza"]
+    return pd.DataFrame(
+        {
+            "price_range": rng.integers(1, 6, n_rows),
+            "country_code": rng.choice(list(COUNTRIES), n_rows),
+            "rating_color": rng.choice(list(COLORS), n_rows),
+            "cuisines": rng.choice(cuisines, n_rows),
+        },
+        index=rng.permutation(n_rows) + 10,
+    )
+
+
+def test_derivations_match_rowwise_apply(rng):
+    df = raw_frame(rng, int(rng.integers(0, 500)))
+
+    derivations = [
+        (create_price_tye, "price_range", price_type_row),
+        (country_name, "country_code", lambda x: COUNTRIES[x]),
+        (color_name, "rating_color", lambda x: COLORS[x]),
+        (first_cuisine, "cuisines", lambda x: x.split(",")[0]),
+    ]
+    for vectorized, column, rowwise in derivations:
+        pd.testing.assert_series_equal(
+            vectorized(df[column]), df[column].apply(rowwise), check_dtype=False, check_names=False
+        )
+
+
+def test_unknown_codes_raise_key_error():
+    with pytest.raises(KeyError):
+        country_name(pd.Series([1, 999, 30]))
+    with pytest.raises(KeyError):
+        color_name(pd.Series(["3F7E00", "000000"]))
+    np.testing.assert_array_equal(create_price_tye(pd.Series([7, 1])), ["gourmet", "cheap"])
@@ -0,0 +1,132 @@
+import numpy as np
+import pandas as pd
+
+from conftest import make_restaurants
+from vorges_eat.processing import compact_dtypes
+from vorges_eat.questions import QUESTION_TABS, QUESTIONS, evaluate_questions, format_number
+
+
+# Valores que aparecem nos filtros das perguntas
+COUNTRIES = ["Brazil", "United States of America", "India", "Qatar"]
+CUISINES = ["Brazilian", "Japanese", "BBQ", "Italian", "American", "Arabian", "Home-made"]
+
+
+def question_frame(seed, n_rows):
+    rng = np.random.default_rng(seed)
+    df = make_restaurants(seed, n_rows).astype({"country": str, "cuisines": str})
+    return compact_dtypes(df.assign(
+        country=rng.choice(COUNTRIES, n_rows),
+        cuisines=rng.choice(CUISINES, n_rows),
+    ))
+
+
+# Linhas que atendem ao where, sem os atalhos do evaluate_questions
+def plain_where(df, where):
+    for column, condition in (where or {}).items():
+        df = df.loc[condition(df[column]) if callable(condition) else df[column].isin(condition)]
+    return df
+
+
+def plain_leader(names):
+    if len(names) == 1:
+        return f"**{names[0]}**"
+    if len(names) == 2:
+        return f"**{names[0]}** (empate com **{names[1]}**)"
+    return f"**{names[0]}** (empate com mais {len(names) - 1})"
+
+
+# Resposta de uma pergunta calculada direto com pandas: (texto, tabela)
+def plain_answer(df, question):
+    df = df.assign(aggregate_rating=df["aggregate_rating"].astype('float64').round(6))
+    table, value, names = None, None, []
+
+    if "total" in question:
+        column, func = question["total"]
+        value = getattr(df[column], func)()
+    elif "group" in question:
+        group = question["group"]
+        (column, func), = question["measures"].items()
+        table = (
+            plain_where(df, question.get("where"))
+            .groupby(group, observed=True)
+            .agg(**{column: (column, func)})
+            .reset_index()
+            .sort_values([column, group], ascending=[question.get("ascending", False), True], kind='stable')
+            .reset_index(drop=True)
+        )
+        if len(table):
+            value = table[column].iloc[0]
+            names = [str(name) for name in table.loc[table[column] == value, group]]
+        if question.get("n") is not None:
+            table = table.head(question["n"])
+    else:
+        rows = plain_where(df, question.get("where"))[question["rows"]]
+        table = rows.sort_values(question["by"], ascending=question["ascending"], kind='stable')
+        by = question["by"][0]
+        if len(table):
+            value = table[by].iloc[0]
+            names = table.loc[table[by] == value, "restaurant_name"].astype(str).tolist()
+        if question["n"] is not None:
+            table = table.head(question["n"])
+        if question.get("reset_index"):
+            table = table.reset_index()
+
+    answer = question.get("answer")
+    if answer is None:
+        text = None
+    elif value is None:
+        text = "Não há dados para responder a esta pergunta."
+    elif isinstance(answer, tuple):
+        text = answer[0] if names[0] == str(question["expect"]) else answer[1]
+    else:
+        text = answer.format(value=format_number(value), leader=plain_leader(names) if names else "")
+    return text, table
+
+
+def test_answers_match_plain_pandas(seed):
+    df = question_frame(seed, 400)
+    answers = evaluate_questions(df)
+    assert list(answers) == list(QUESTION_TABS)
+
+    evaluated = [answer for tab in QUESTION_TABS for answer in answers[tab]]
+    ordered = sorted(QUESTIONS, key=lambda question: list(QUESTION_TABS).index(question["tab"]))
+    assert len(evaluated) == len(ordered)
+
+    for question, answer in zip(ordered, evaluated):
+        text, table = plain_answer(df, question)
+        assert answer["title"] == question["title"]
+        assert answer["text"] == text, question["title"]
+        if table is None:
+            assert answer["table"] is None
+        else:
+            result = answer["table"].astype({col: 'float64' for col in ("aggregate_rating",) if col in table})
+            pd.testing.assert_frame_equal(
+                result.astype({col: str for col in result.select_dtypes('category')}),
+                table.astype({col: str for col in table.select_dtypes('category')}),
+                check_dtype=False,
+                obj=question["title"],
+            )
+
+
+def test_tied_leader_does_not_depend_on_row_order(seed):
+    rng = np.random.default_rng(seed)
+    df = question_frame(seed, 400)
+    # Duas cidades com o mesmo número de restaurantes, as maiores
+    df = df.astype({"city": str}).assign(city=np.where(np.arange(400) % 2 == 0, "Zeta", "Alfa"))
+    df = compact_dtypes(df)
+
+    texts = set()
+    for _ in range(3):
+        shuffled = df.take(rng.permutation(len(df))).reset_index(drop=True)
+        answer = evaluate_questions(shuffled)["Cidade"][0]
+        texts.add(answer["text"])
+    assert texts == {"**Alfa** (empate com **Zeta**) é a cidade que possui mais restaurantes registrados (200)."}
+
+
+def test_no_rows_has_no_answer():
+    df = question_frame(0, 50).astype({"cuisines": str}).assign(cuisines="Thai")
+    answers = evaluate_questions(compact_dtypes(df))
+
+    home_made = answers["Tipos de Culinária"][-4]
+    assert home_made["text"] == "Não há dados para responder a esta pergunta."
+    assert len(home_made["table"]) == 0
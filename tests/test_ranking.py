@@ -0,0 +1,48 @@
+import numpy as np
+import pandas as pd
+
+from vorges_eat.ranking import GroupRanking, top_n
+
+
+# Critério dos cartões de melhor restaurante, com texto no fim para testar
+# a ordenação de colunas não numéricas
+BY = ["aggregate_rating", "votes", "average_cost_for_two", "restaurant_name"]
+ASCENDING = [False, False, True, True]
+
+
+# Valores ausentes nas colunas de ordenação (vão para o fim)
+def with_missing(dataframe, rng):
+    missing = rng.random(len(dataframe)) < 0.1
+    return dataframe.astype({"average_cost_for_two": 'float64'}).assign(
+        aggregate_rating=dataframe["aggregate_rating"].where(~missing),
+        average_cost_for_two=lambda df: df["average_cost_for_two"].where(rng.random(len(df)) < 0.9),
+    )
+
+
+def test_group_ranking_matches_groupby_head(restaurants, rng):
+    df = with_missing(restaurants, rng)
+    ranking = GroupRanking(df, "cuisines", BY, ASCENDING)
+
+    for k in [1, 3]:
+        for positions in [None, np.flatnonzero(rng.random(len(df)) < 0.5)]:
+            selected = df if positions is None else df.take(positions)
+            expected = (
+                selected.reset_index()
+                .sort_values(["cuisines"] + BY, ascending=[True] + ASCENDING, kind='stable', na_position='last')
+                .groupby("cuisines", sort=False, observed=True)
+                .head(k)["index"]
+                .to_numpy()
+            )
+            np.testing.assert_array_equal(ranking.top(k, positions), expected)
+
+
+def test_top_n_matches_sort_values_head(restaurants, rng):
+    df = with_missing(restaurants, rng)
+
+    for n in [0, 1, 10, len(df), len(df) + 5]:
+        expected = df.sort_values(BY, ascending=ASCENDING, kind='stable').head(n)
+        pd.testing.assert_frame_equal(top_n(df, BY, ASCENDING, n=n), expected)
+
+    for col, asc in [("restaurant_name", True), ("cuisines", False), ("aggregate_rating", False)]:
+        expected = df.sort_values(col, ascending=asc, kind='stable').head(10)
+        pd.testing.assert_frame_equal(top_n(df, col, asc, n=10), expected)
@@ -0,0 +1,139 @@
+import numpy as np
+
+from vorges_eat.search import (
+    EXACT_SCORE,
+    FUZZY_MIN_LENGTH,
+    FUZZY_SCORE,
+    FUZZY_THRESHOLD,
+    PREFIX_SCORE,
+    SEARCH_FIELDS,
+    PlaceIndex,
+    SearchIndex,
+    tokenize,
+    trigrams,
+)
+
+
+def jaccard(a, b):
+    a, b = trigrams(a), trigrams(b)
+    return len(a & b) / len(a | b)
+
+
+# Pontuação de uma palavra da busca para um termo, sem índice
+def term_score(word, term):
+    score = 0.0
+    if term == word:
+        score = EXACT_SCORE
+    elif term.startswith(word):
+        score = PREFIX_SCORE
+    if len(word) >= FUZZY_MIN_LENGTH:
+        similarity = jaccard(word, term)
+        if similarity >= FUZZY_THRESHOLD:
+            score = max(score, FUZZY_SCORE * similarity)
+    return score
+
+
+# Pontuação de cada linha para a busca, linha a linha: {posição: pontuação}
+def brute_force_search(dataframe, query):
+    words = list(dict.fromkeys(tokenize(query)))
+    found = {}
+    for position, row in enumerate(dataframe[list(SEARCH_FIELDS)].astype(str).itertuples(index=False)):
+        total = 0.0
+        for word in words:
+            best = max(
+                (term_score(word, term) * weight for text, weight in zip(row, SEARCH_FIELDS.values())
+                 for term in tokenize(text)),
+                default=0.0,
+            )
+            if best == 0:
+                break
+            total += best
+        else:
+            if words:
+                found[position] = total
+    return found
+
+
+# Busca aleatória a partir das palavras dos dados: palavras inteiras,
+# prefixos e palavras com uma letra trocada
+def random_query(dataframe, rng):
+    row = dataframe.iloc[int(rng.integers(len(dataframe)))]
+    words = [word for field in SEARCH_FIELDS for word in tokenize(row[field])]
+    query = []
+    for word in rng.choice(words, int(rng.integers(1, 3))):
+        kind = rng.integers(3)
+        if kind == 1:
+            word = word[: int(rng.integers(1, len(word) + 1))]
+        elif kind == 2 and len(word) > 3:
+            i = int(rng.integers(len(word)))
+            word = word[:i] + "x" + word[i + 1:]
+        query.append(word)
+    return " ".join(query)
+
+
+def test_search_matches_brute_force(restaurants, rng):
+    if len(restaurants) == 0:
+        return
+    index = SearchIndex(restaurants)
+
+    for _ in range(5):
+        query = random_query(restaurants, rng)
+        expected = brute_force_search(restaurants, query)
+
+        positions, scores = index.search(query, limit=len(restaurants))
+        assert sorted(positions.tolist()) == sorted(expected)
+        np.testing.assert_allclose(scores, [expected[p] for p in positions])
+        assert (np.diff(scores) <= 1e-12).all()
+
+        # Com limite, as melhores pontuações
+        positions, scores = index.search(query, limit=5)
+        best = sorted(expected.values(), reverse=True)[:5]
+        np.testing.assert_allclose(scores, best)
+
+
+def test_search_ignores_case_and_accents(restaurants):
+    index = SearchIndex(restaurants)
+    names = restaurants["restaurant_name"].astype(str)
+
+    positions, _ = index.search("BISTRO", limit=len(restaurants))
+    assert set(positions.tolist()) >= set(np.flatnonzero(names == "Bistrô").tolist())
+    assert len(index.search("   ")[0]) == 0
+
+
+def test_place_index_cities_match_unique(restaurants, rng):
+    places = PlaceIndex(restaurants)
+    df = restaurants.astype({"country": str, "city": str})
+
+    assert places.countries == sorted(df["country"].unique())
+    assert places.cities() == sorted(df["city"].unique())
+    countries = list(rng.choice(places.countries, min(2, len(places.countries)), replace=False))
+    assert places.cities(countries) == sorted(df.loc[df["country"].isin(countries), "city"].unique())
+
+
+def test_complete_matches_brute_force(restaurants, rng):
+    if len(restaurants) == 0:
+        return
+    places = PlaceIndex(restaurants)
+    df = restaurants.astype({"country": str, "city": str, "locality": str})
+    names = set(df["city"]) | set(df["locality"])
+    assert set(places.entries["name"]) == names
+
+    for _ in range(5):
+        name = str(rng.choice(sorted(names)))
+        text = name[: int(rng.integers(1, len(name) + 1))]
+        countries = None if rng.random() < 0.5 else [str(rng.choice(places.countries))]
+
+        query = " ".join(tokenize(text))
+        expected = []
+        for i, entry in enumerate(places.entries.itertuples(index=False)):
+            normalized = " ".join(tokenize(entry.name))
+            similarity = jaccard(query, normalized)
+            if normalized.startswith(query):
+                similarity = max(similarity, PREFIX_SCORE)
+            if similarity >= FUZZY_THRESHOLD and (countries is None or entry.country in countries):
+                expected.append((-similarity, i, entry.name))
+        expected = sorted(expected)[:10]
+
+        result = places.complete(text, countries)
+        assert result["name"].tolist() == [name for _, _, name in expected]
+        np.testing.assert_allclose(result["similarity"], [round(-s, 3) for s, _, _ in expected])
@@ -0,0 +1,64 @@
+import numpy as np
+
+from conftest import make_restaurants
+from vorges_eat.spatial import GridClusters, haversine_km
+
+
+# Posições como o GridClusters as lê (float64)
+def coordinates(dataframe):
+    return dataframe["latitude"].to_numpy(dtype='float64'), dataframe["longitude"].to_numpy(dtype='float64')
+
+
+def random_positions(rng, n_rows):
+    if rng.random() < 0.3:
+        return None
+    return np.flatnonzero(rng.random(n_rows) < 0.5)
+
+
+def test_within_matches_brute_force(seed, rng):
+    df = make_restaurants(seed, 500)
+    grid = GridClusters(df)
+    positions = random_positions(rng, len(df))
+    latitudes, longitudes = coordinates(df)
+
+    for _ in range(10):
+        center = int(rng.integers(len(df)))
+        lat_center, lon_center = latitudes[center], longitudes[center]
+        half_lat, half_lon = rng.choice([0.01, 0.1, 1.0, 20.0]), rng.choice([0.01, 0.1, 1.0, 60.0])
+        bounds = (lat_center - half_lat, lat_center + half_lat, lon_center - half_lon, lon_center + half_lon)
+
+        mask = (
+            (latitudes >= bounds[0]) & (latitudes <= bounds[1])
+            & (longitudes >= bounds[2]) & (longitudes <= bounds[3])
+        )
+        if positions is not None:
+            selected = np.zeros(len(df), dtype=bool)
+            selected[positions] = True
+            mask = mask & selected
+
+        np.testing.assert_array_equal(grid.within(bounds, positions), np.flatnonzero(mask))
+
+
+def test_nearest_matches_brute_force(seed, rng):
+    df = make_restaurants(seed, 500)
+    grid = GridClusters(df)
+    positions = random_positions(rng, len(df))
+    latitudes, longitudes = coordinates(df)
+    candidates = np.arange(len(df)) if positions is None else positions
+
+    for _ in range(10):
+        latitude, longitude = rng.uniform(-80, 80), rng.uniform(-180, 180)
+        if rng.random() < 0.5:
+            latitude, longitude = rng.normal(-23.55, 0.05), rng.normal(-46.63, 0.05)
+        k = int(rng.integers(1, 30))
+        radius_km = rng.choice([None, 5.0, 500.0])
+
+        distances = haversine_km(latitude, longitude, latitudes[candidates], longitudes[candidates])
+        order = np.argsort(distances, kind='stable')
+        if radius_km is not None:
+            order = order[distances[order] <= radius_km]
+        order = order[:k]
+
+        idx, found = grid.nearest(latitude, longitude, k=k, radius_km=radius_km, positions=positions)
+        np.testing.assert_array_equal(idx, candidates[order])
+        np.testing.assert_allclose(found, distances[order])
@@ -0,0 +1,104 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+from conftest import make_restaurants
+from vorges_eat.etl import main, run_etl
+from vorges_eat.maps import popup_html
+from vorges_eat.tiles import (
+    CLUSTER_MAX_ZOOM,
+    POINT_FIELDS,
+    POINT_ZOOM,
+    TILES_METADATA,
+    build_tiles,
+    read_tiles,
+    tile_xy,
+    write_tiles,
+)
+
+
+WORLD = (-85.0, 85.0, -180.0, 180.0)
+
+
+def features(tiles, zoom):
+    return [
+        (x, y, feature)
+        for (z, x, y), collection in tiles.items() if z == zoom
+        for feature in collection["features"]
+    ]
+
+
+def test_point_tiles_have_every_restaurant_with_its_popup(seed):
+    df = make_restaurants(seed, 300)
+    points = features(build_tiles(df), POINT_ZOOM)
+    assert len(points) == len(df)
+
+    by_id = {feature["properties"]["restaurant_name"] + str(feature["geometry"]["coordinates"]): (x, y, feature)
+             for x, y, feature in points}
+    popups = popup_html(df)
+    xs, ys = tile_xy(df["latitude"].astype('float64').round(6).to_numpy(),
+                     df["longitude"].astype('float64').round(6).to_numpy(), POINT_ZOOM)
+    for i, row in enumerate(df.itertuples()):
+        coordinates = [round(float(row.longitude), 6), round(float(row.latitude), 6)]
+        x, y, feature = by_id[row.restaurant_name + str(coordinates)]
+        assert (x, y) == (xs[i], ys[i])
+        assert set(feature["properties"]) == set(POINT_FIELDS) | {"popup"}
+        assert feature["properties"]["popup"] == popups.iloc[i]
+        assert feature["properties"]["average_cost_for_two"] == row.average_cost_for_two
+
+
+def test_cluster_tiles_count_every_restaurant(seed):
+    df = make_restaurants(seed, 300)
+    tiles = build_tiles(df)
+    rating = df["aggregate_rating"].astype('float64').round(6)
+
+    for zoom in range(CLUSTER_MAX_ZOOM + 1):
+        clusters = [feature["properties"] for _, _, feature in features(tiles, zoom)]
+        assert sum(c["restaurants"] for c in clusters) == len(df)
+        total = sum(c["restaurants"] * c["aggregate_rating"] for c in clusters)
+        assert np.isclose(total, rating.sum(), atol=0.005 * len(df))
+
+
+def test_read_tiles_returns_the_tiles_of_the_box(tmp_path, seed):
+    df = make_restaurants(seed, 300)
+    write_tiles(df, str(tmp_path))
+
+    world = read_tiles(str(tmp_path), WORLD, 0)["features"]
+    assert sum(feature["properties"]["restaurants"] for feature in world) == len(df)
+
+    # Caixa pequena: só os pontos dos tiles que a cobrem (acima de
+    # POINT_ZOOM, os tiles de POINT_ZOOM)
+    box = (-23.6, -23.5, -46.7, -46.6)
+    found = read_tiles(str(tmp_path), box, POINT_ZOOM + 3)["features"]
+    longitude, latitude = np.array([f["geometry"]["coordinates"] for f in found]).reshape(-1, 2).T
+    inside = df["latitude"].between(box[0], box[1]) & df["longitude"].between(box[2], box[3])
+    assert inside.sum() <= len(found) < len(df)
+    assert ((latitude > box[0] - 0.1) & (latitude < box[1] + 0.1)).all()
+    assert ((longitude > box[2] - 0.1) & (longitude < box[3] + 0.1)).all()
+
+    with open(tmp_path / TILES_METADATA) as f:
+        metadata = json.load(f)
+    assert metadata["maxzoom"] == POINT_ZOOM
+    assert metadata["count"] == sum(len(files) for _, _, files in os.walk(tmp_path)) - 1
+
+
+def test_etl_writes_tiles_unless_disabled(tmp_path, source_csv):
+    outputs = [str(tmp_path / name) for name in ("data.csv", "data.parquet", "cube.parquet")]
+
+    df = run_etl(source_csv, *outputs, tiles_dir=str(tmp_path / "tiles"))
+    world = read_tiles(str(tmp_path / "tiles"), WORLD, 0)["features"]
+    assert sum(feature["properties"]["restaurants"] for feature in world) == len(df)
+    assert sorted(os.listdir(tmp_path / "tiles")) == sorted(
+        [str(zoom) for zoom in range(POINT_ZOOM + 1)] + [TILES_METADATA]
+    )
+
+    main(["--source", source_csv, "--output", outputs[0], "--parquet-output", outputs[1],
+          "--cube-output", outputs[2], "--tiles-output", str(tmp_path / "cli_tiles")])
+    assert os.path.exists(tmp_path / "cli_tiles" / TILES_METADATA)
+
+    main(["--source", source_csv, "--output", outputs[0], "--parquet-output", outputs[1],
+          "--cube-output", outputs[2], "--tiles-output", str(tmp_path / "no_tiles"), "--no-tiles"])
+    assert not os.path.exists(tmp_path / "no_tiles")
+    assert pd.read_csv(outputs[0]).shape[0] == len(df)
@@ -0,0 +1 @@
+from vorges_eat.loader import load_data, load_raw_data
@@ -0,0 +1,148 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+
+#========================================================================
+#==================== Cubo de Métricas ==================================
+#========================================================================
+# Dimensões do cubo: tudo o que as páginas usam para agrupar ou filtrar
+CUBE_DIMENSIONS = [
+    "country",
+    "city",
+    "cuisines",
+    "price_type",
+    "rating_band",
+    "has_table_booking",
+    "has_online_delivery",
+    "is_delivering_now",
+]
+
+# Medidas guardadas em cada célula. Somas e contagens são aditivas e os
+# máximos podem ser combinados com max, então qualquer agrupamento por um
+# subconjunto das dimensões é obtido a partir das células.
+CUBE_MEASURES = {
+    "restaurants": "sum",
+    "votes_sum": "sum",
+    "cost_sum": "sum",
+    "rating_sum": "sum",
+    "cost_max": "max",
+    "rating_max": "max",
+}
+
+_SUM_MEASURES = [measure for measure, func in CUBE_MEASURES.items() if func == "sum"]
+_MAX_MEASURES = [measure for measure, func in CUBE_MEASURES.items() if func == "max"]
+
+
+# Faixa de nota de 0.5 em 0.5 (4.0-4.4 -> 4.0, 4.5-4.9 -> 4.5). As notas têm
+# uma casa decimal, então cortes como ">= 4" ou "< 2.5" são exatos na faixa.
+def rating_band(ratings):
+    return (np.floor(ratings.astype('float64') * 2) / 2).astype('float32')
+
+
+# Materializar o cubo a partir do dataframe processado: uma linha por
+# combinação de dimensões que existe nos dados
+def build_cube(dataframe):
+    # Somas em 64 bits; a nota volta do float32 arredondada, para as médias
+    # baterem com as calculadas sobre o csv (4.9 e não 4.900000095367432)
+    df = dataframe.assign(
+        rating_band=rating_band(dataframe["aggregate_rating"]),
+        votes=dataframe["votes"].astype('int64'),
+        average_cost_for_two=dataframe["average_cost_for_two"].astype('int64'),
+        aggregate_rating=dataframe["aggregate_rating"].astype('float64').round(6),
+    )
+    cells = (
+        df.groupby(CUBE_DIMENSIONS, observed=True)
+        .agg(
+            restaurants=("restaurant_id", "count"),
+            votes_sum=("votes", "sum"),
+            cost_sum=("average_cost_for_two", "sum"),
+            rating_sum=("aggregate_rating", "sum"),
+            cost_max=("average_cost_for_two", "max"),
+            rating_max=("aggregate_rating", "max"),
+        )
+        .reset_index()
+    )
+    return cells
+
+
+class Cube:
+
+    def __init__(self, cells):
+        self.cells = cells
+
+    # Células que atendem aos filtros. Cada filtro é dimensão -> lista de
+    # valores ou uma função que recebe a coluna e devolve uma máscara
+    # (ex.: {"rating_band": lambda band: band >= 4}). None não filtra.
+    def _filter(self, where):
+        cells = self.cells
+        if not where:
+            return cells
+
+        mask = np.ones(len(cells), dtype=bool)
+        for dim, condition in where.items():
+            if condition is None:
+                continue
+            if callable(condition):
+                mask &= np.asarray(condition(cells[dim]), dtype=bool)
+            else:
+                mask &= cells[dim].isin(condition).to_numpy()
+        return cells.loc[mask]
+
+    # Sub-cubo só com as células que atendem aos filtros, para várias
+    # agregações da mesma seleção sem refazer o filtro
+    def slice(self, where):
+        return Cube(self._filter(where))
+
+    # Agrega o cubo pelas dimensões em `by`. Devolve, por grupo:
+    #   restaurants, votes_sum, votes_mean, cost_mean, cost_max, rating_mean,
+    #   rating_max e, para cada dimensão em `distinct`, distinct_<dimensão>
+    #   (quantidade de valores distintos daquela dimensão no grupo).
+    # Os grupos saem ordenados pelas dimensões, como num groupby comum.
+    # Cada restaurant_id aparece em uma única linha dos dados, então
+    # restaurants também é a contagem de restaurantes distintos.
+    def rollup(self, by=(), where=None, distinct=()):
+        by = list(by)
+        cells = self._filter(where)
+
+        if by:
+            # Uma passada de soma e uma de máximo para todas as medidas
+            # (agg com dicionário faz uma passada por coluna)
+            grouped = cells.groupby(by, observed=True)
+            parts = [grouped[_SUM_MEASURES].sum(), grouped[_MAX_MEASURES].max()]
+            parts += [grouped[dim].nunique().rename(f"distinct_{dim}") for dim in distinct]
+            out = pd.concat(parts, axis=1)
+        else:
+            # Total geral: sempre uma linha, mesmo sem nenhuma célula
+            row = {measure: getattr(cells[measure], func)() for measure, func in CUBE_MEASURES.items()}
+            for dim in distinct:
+                row[f"distinct_{dim}"] = cells[dim].nunique()
+            out = pd.DataFrame([row])
+
+        restaurants = out["restaurants"].astype('float64')
+        out = out.drop(columns=["cost_sum", "rating_sum"]).assign(
+            votes_mean=out["votes_sum"] / restaurants,
+            cost_mean=out["cost_sum"] / restaurants,
+            rating_mean=out["rating_sum"] / restaurants,
+        )
+
+        return out.reset_index() if by else out.reset_index(drop=True)
+
+    # Tabela cruzada da quantidade de restaurantes, `index` nas linhas e
+    # `columns` nas colunas, como um pd.crosstab sobre os dados. As células
+    # do cubo entram como pesos, e o crosstab é feito sobre os códigos das
+    # categorias, então só aparecem as linhas e colunas que existem na
+    # seleção. normalize como no pd.crosstab ('index' dá a fração de cada
+    # linha); combinações ausentes ficam NaN.
+    def crosstab(self, index, columns, where=None, normalize=False):
+        cells = self._filter(where)
+        row_codes, rows = pd.factorize(cells[index], sort=True)
+        col_codes, cols = pd.factorize(cells[columns], sort=True)
+
+        table = pd.crosstab(
+            row_codes, col_codes, values=cells["restaurants"].to_numpy(), aggfunc="sum", normalize=normalize,
+        )
+        table = table.where(table > 0)
+        table.index = pd.Index(rows.take(table.index), name=index)
+        table.columns = pd.Index(cols.take(table.columns), name=columns)
+        return table
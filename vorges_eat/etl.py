@@ -0,0 +1,137 @@
+# Libraries
+import argparse
+import json
+import os
+import shutil
+import tempfile
+
+from vorges_eat.cube import build_cube
+from vorges_eat.processing import (
+    FILE_PATH,
+    PROCESSED_FILE_PATH,
+    PARQUET_FILE_PATH,
+    CUBE_FILE_PATH,
+    TILES_DIR_PATH,
+    compact_dtypes,
+    process_data,
+    source_version,
+    source_version_path,
+)
+from vorges_eat.tiles import write_tiles
+
+
+#========================================================================
+#==================== Escrita Atômica ===================================
+#========================================================================
+
+# Escreve em um arquivo temporário no mesmo diretório e troca de nome com
+# os.replace: quem estiver lendo vê o arquivo antigo ou o novo, nunca um
+# arquivo pela metade.
+def write_atomic(output_path, write):
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, tmp_path = tempfile.mkstemp(
+        dir=directory, prefix='.', suffix='.' + os.path.basename(output_path) + '.tmp'
+    )
+    os.close(fd)
+    try:
+        write(tmp_path)
+        with open(tmp_path, 'rb') as f:
+            os.fsync(f.fileno())
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+# O mesmo para um diretório: é montado inteiro num diretório temporário ao
+# lado e só então troca de lugar com o antigo
+def write_atomic_dir(output_dir, write):
+    parent = os.path.dirname(os.path.abspath(output_dir))
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix='.' + os.path.basename(output_dir) + '.')
+    old_dir = tmp_dir + '.old'
+    try:
+        write(tmp_dir)
+        os.chmod(tmp_dir, 0o755)
+        if os.path.exists(output_dir):
+            os.replace(output_dir, old_dir)
+        os.replace(tmp_dir, output_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+    shutil.rmtree(old_dir, ignore_errors=True)
+
+
+#========================================================================
+#==================== ETL ===============================================
+#========================================================================
+
+# Gravar o snapshot parquet (colunar, comprimido e já com os tipos compactos,
+# que são preservados na leitura)
+def write_parquet(dataframe, output_path):
+    df = compact_dtypes(dataframe)
+    write_atomic(
+        output_path,
+        lambda path: df.to_parquet(path, engine='pyarrow', compression='zstd', index=False),
+    )
+
+
+# Gravar, ao lado do artefato, a versão do csv de origem de onde ele veio.
+# É gravada depois do artefato: até lá a versão antiga não bate com a
+# origem e o loader processa os dados em memória.
+def write_source_version(artifact_path, version):
+    def write(path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(version, f, indent=2)
+
+    write_atomic(source_version_path(artifact_path), write)
+
+
+# Processar o csv de origem e gravar os artefatos usados pelos dashboards:
+# o csv com precisão total (download na Home), o parquet (leitura das
+# páginas), o cubo de métricas pré-agregadas e os tiles GeoJSON do mapa
+# (para usar o mapa fora do Streamlit). Com tiles_dir=None os tiles não são
+# gerados.
+def run_etl(
+    file_path=FILE_PATH,
+    output_path=PROCESSED_FILE_PATH,
+    parquet_path=PARQUET_FILE_PATH,
+    cube_path=CUBE_FILE_PATH,
+    tiles_dir=TILES_DIR_PATH,
+):
+    # A versão é lida antes dos dados: se o csv mudar no meio do ETL, os
+    # artefatos ficam marcados com a versão antiga e não são usados
+    version = source_version(file_path)
+    df = process_data(file_path)
+    write_atomic(output_path, lambda path: df.to_csv(path, index=False))
+    write_parquet(df, parquet_path)
+    write_parquet(build_cube(compact_dtypes(df)), cube_path)
+    for artifact_path in (output_path, parquet_path, cube_path):
+        write_source_version(artifact_path, version)
+    if tiles_dir is not None:
+        write_atomic_dir(tiles_dir, lambda path: write_tiles(df, path))
+    return df
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Processa o dataset da Vorges Eat e grava o artefato usado pelo dashboard.'
+    )
+    parser.add_argument('--source', default=FILE_PATH, help='csv de origem (zomato)')
+    parser.add_argument('--output', default=PROCESSED_FILE_PATH, help='csv processado de saída')
+    parser.add_argument('--parquet-output', default=PARQUET_FILE_PATH, help='snapshot parquet de saída')
+    parser.add_argument('--cube-output', default=CUBE_FILE_PATH, help='cubo de métricas de saída')
+    parser.add_argument('--tiles-output', default=TILES_DIR_PATH, help='diretório dos tiles GeoJSON do mapa')
+    parser.add_argument('--no-tiles', action='store_true', help='não gerar os tiles do mapa')
+    args = parser.parse_args(argv)
+
+    tiles_dir = None if args.no_tiles else args.tiles_output
+    df = run_etl(args.source, args.output, args.parquet_output, args.cube_output, tiles_dir)
+    print(f'{df.shape[0]} linhas gravadas em {args.output}, {args.parquet_output} e {args.cube_output}')
+    if tiles_dir is not None:
+        print(f'tiles do mapa gravados em {tiles_dir}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,66 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+
+#========================================================================
+#==================== Índice de Filtros (bitmaps) =======================
+#========================================================================
+# Colunas usadas nos filtros do menu lateral das páginas
+FILTER_COLUMNS = ["country", "price_type", "city", "cuisines"]
+
+
+# Índice com um bitmap (bits empacotados, 1 bit por linha) para cada valor
+# de cada coluna de filtro. Um filtro vira um OR entre os bitmaps dos valores
+# escolhidos em cada coluna e um AND entre as colunas; o resultado são as
+# posições das linhas selecionadas, sem criar dataframes intermediários.
+class FilterIndex:
+
+    def __init__(self, dataframe, columns=FILTER_COLUMNS):
+        self.n_rows = len(dataframe)
+        self._bitmaps = {}
+
+        for col in columns:
+            if col in dataframe.columns:
+                self._bitmaps[col] = self._build_bitmaps(dataframe[col])
+
+    # Um bitmap por valor distinto: as linhas são ordenadas pelo código do
+    # valor uma única vez e cada valor marca apenas o seu trecho
+    def _build_bitmaps(self, series):
+        codes, uniques = pd.factorize(series)
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(uniques) + 1))
+
+        bitmaps = {}
+        for i, value in enumerate(uniques):
+            mask = np.zeros(self.n_rows, dtype=bool)
+            mask[order[bounds[i]:bounds[i + 1]]] = True
+            bitmaps[value] = np.packbits(mask)
+        return bitmaps
+
+    # Valores distintos de uma coluna do índice
+    def values(self, column):
+        return list(self._bitmaps[column].keys())
+
+    # Bitmap (empacotado) das linhas cujo valor em `column` está em `values`
+    def bitmap(self, column, values):
+        bitmaps = self._bitmaps[column]
+        result = np.zeros((self.n_rows + 7) // 8, dtype=np.uint8)
+        for value in values:
+            if value in bitmaps:
+                np.bitwise_or(result, bitmaps[value], out=result)
+        return result
+
+    # Posições das linhas que atendem a todos os filtros, em ordem crescente.
+    # Cada filtro é coluna=lista de valores; None (ou ausente) não filtra.
+    def select(self, **filters):
+        result = None
+        for column, values in filters.items():
+            if values is None:
+                continue
+            bits = self.bitmap(column, values)
+            result = bits if result is None else np.bitwise_and(result, bits, out=result)
+
+        if result is None:
+            return np.arange(self.n_rows)
+        return np.flatnonzero(np.unpackbits(result, count=self.n_rows))
@@ -0,0 +1,96 @@
+# Libraries
+import pandas as pd
+
+
+#========================================================================
+#==================== Hierarquia País > Cidade > Localidade =============
+#========================================================================
+# Níveis da hierarquia, do mais alto para o mais baixo
+HIERARCHY_LEVELS = ["country", "city", "locality"]
+
+# Colunas lidas para montar a hierarquia
+HIERARCHY_COLUMNS = HIERARCHY_LEVELS + ["aggregate_rating", "average_cost_for_two", "has_online_delivery"]
+
+# Somas guardadas em cada nó; as médias saem delas
+_SUMS = ["restaurants", "rating_sum", "cost_sum", "delivery_sum"]
+
+
+# Somas por localidade (as folhas): uma passada de groupby sobre os dados
+def build_hierarchy(dataframe):
+    df = dataframe.assign(
+        aggregate_rating=dataframe["aggregate_rating"].astype('float64').round(6),
+        average_cost_for_two=dataframe["average_cost_for_two"].astype('int64'),
+        has_online_delivery=dataframe["has_online_delivery"].astype('int64'),
+    )
+    return (
+        df.groupby(HIERARCHY_LEVELS, observed=True)
+        .agg(
+            restaurants=("aggregate_rating", "size"),
+            rating_sum=("aggregate_rating", "sum"),
+            cost_sum=("average_cost_for_two", "sum"),
+            delivery_sum=("has_online_delivery", "sum"),
+        )
+        .reset_index()
+    )
+
+
+# Métricas de um conjunto de nós a partir das somas
+def _metrics(sums):
+    return pd.DataFrame(
+        {
+            "restaurants": sums["restaurants"],
+            "rating_mean": sums["rating_sum"] / sums["restaurants"],
+            "cost_mean": sums["cost_sum"] / sums["restaurants"],
+            "delivery_share": sums["delivery_sum"] / sums["restaurants"],
+        },
+        index=sums.index,
+    )
+
+
+# Hierarquia pré-agregada. Os filhos de cada nó (os países, as cidades de
+# um país, as localidades de uma cidade) são calculados uma vez, a partir
+# das somas das folhas, e guardados pelo caminho do nó: abrir um nó é uma
+# busca no dicionário, sem groupby sobre os dados.
+class Hierarchy:
+
+    def __init__(self, leaves):
+        self.leaves = leaves
+        self._children = {}
+
+        totals = leaves[_SUMS].sum().to_frame().T
+        self._total = _metrics(totals).iloc[0]
+
+        for depth in range(len(HIERARCHY_LEVELS)):
+            level = HIERARCHY_LEVELS[depth]
+            sums = (
+                leaves.groupby(HIERARCHY_LEVELS[:depth + 1], observed=True)[_SUMS]
+                .sum()
+                .reset_index()
+                .astype({level: str})
+            )
+            if depth == 0:
+                groups = [((), sums)]
+            else:
+                groups = sums.groupby(HIERARCHY_LEVELS[:depth], observed=True, sort=False)
+            for path, children in groups:
+                path = tuple(str(p) for p in (path if isinstance(path, tuple) else (path,)))
+                children = _metrics(children.set_index(level)[_SUMS])
+                children.index.name = level
+                self._children[path] = children.sort_values(
+                    ["restaurants", "rating_mean"], ascending=[False, False]
+                )
+
+    # Filhos do nó (país) ou (país, cidade); () são os países. Um caminho
+    # que não existe não tem filhos.
+    def children(self, path=()):
+        children = self._children.get(tuple(path))
+        if children is None:
+            return _metrics(pd.DataFrame(columns=_SUMS, dtype='float64'))
+        return children.copy(deep=False)
+
+    # Métricas do próprio nó; () é o total de todos os restaurantes
+    def node(self, path=()):
+        path = tuple(path)
+        if not path:
+            return self._total
+        return self._children[path[:-1]].loc[path[-1]]
@@ -0,0 +1,275 @@
+# Libraries
+import os
+import threading
+
+import pandas as pd
+from PIL import Image
+
+from vorges_eat.cube import Cube, build_cube
+from vorges_eat.filters import FILTER_COLUMNS, FilterIndex
+from vorges_eat.hierarchy import HIERARCHY_COLUMNS, Hierarchy, build_hierarchy
+from vorges_eat.processing import (
+    FILE_PATH,
+    PROCESSED_FILE_PATH,
+    PARQUET_FILE_PATH,
+    CUBE_FILE_PATH,
+    rename_columns,
+    compact_dtypes,
+    process_data,
+    read_processed_data,
+    read_parquet_data,
+    read_source_version,
+    source_version,
+)
+from vorges_eat.questions import QUESTIONS, evaluate_questions
+from vorges_eat.ranking import GroupRanking
+from vorges_eat.search import SEARCH_FIELDS, PlaceIndex, SearchIndex
+from vorges_eat.spatial import GRID_COLUMNS, GridClusters
+
+
+#========================================================================
+#==================== Cache do Processo =================================
+#========================================================================
+# O cache vive no módulo, então é compartilhado por todas as sessões e
+# reruns do Streamlit no mesmo processo. A chave inclui o mtime e o
+# tamanho do arquivo de origem: se o csv mudar, os dados são refeitos.
+_CACHE = {}
+_LOCK = threading.RLock()
+
+
+# Com o Copy-on-Write do pandas, qualquer frame derivado de outro (filtro,
+# seleção de colunas, cópia rasa) se comporta como uma cópia: escrever nele
+# copia só o que foi alterado e nunca altera o frame original. É isso que
+# permite entregar o mesmo frame do cache para todas as sessões. A opção é
+# global, então quem liga é o app (Home.py e cada página, que pode ser
+# aberta direto pela URL), não o import deste módulo: o ETL, os testes e o
+# notebook continuam com o comportamento padrão do pandas.
+def enable_copy_on_write():
+    pd.set_option('mode.copy_on_write', True)
+
+
+# Chave de versão do arquivo (caminho, mtime em ns, tamanho)
+def file_version(file_path):
+    stat = os.stat(file_path)
+    return (os.path.abspath(file_path), stat.st_mtime_ns, stat.st_size)
+
+
+# Busca no cache ou constrói o valor uma única vez por versão do arquivo
+def _cached(name, file_path, build):
+    key = (name,) + file_version(file_path)
+    try:
+        return _CACHE[key]
+    except KeyError:
+        pass
+
+    with _LOCK:
+        if key not in _CACHE:
+            # Descarta versões antigas do mesmo arquivo
+            for old_key in [k for k in _CACHE if k[:2] == key[:2]]:
+                del _CACHE[old_key]
+            _CACHE[key] = build(file_path)
+        return _CACHE[key]
+
+
+# Cada chamada recebe uma cópia rasa do frame compartilhado: nenhum dado é
+# copiado, e alterações feitas por uma sessão ficam só nela (Copy-on-Write,
+# ver enable_copy_on_write).
+def _shared_view(dataframe):
+    return dataframe.copy(deep=False)
+
+
+# Limpar o cache (útil em testes e no notebook)
+def clear_cache():
+    with _LOCK:
+        _CACHE.clear()
+
+
+#========================================================================
+#==================== Funções de Carregamento ===========================
+#========================================================================
+
+# Dados brutos com as colunas em snakecase (antes do processamento)
+def _build_raw_data(file_path):
+    return rename_columns(pd.read_csv(file_path))
+
+
+def load_raw_data(file_path=FILE_PATH):
+    return _shared_view(_cached('raw', file_path, _build_raw_data))
+
+
+# Artefatos do ETL, em ordem de preferência: o parquet é tipado e permite
+# ler só as colunas necessárias; o csv fica como alternativa.
+PROCESSED_READERS = [
+    (PARQUET_FILE_PATH, read_parquet_data),
+    (PROCESSED_FILE_PATH, read_processed_data),
+]
+
+
+# Versão do conteúdo do csv de origem (tamanho e sha256), calculada uma vez
+# por versão do arquivo
+def _source_version(file_path):
+    return _cached('source_version', file_path, source_version)
+
+
+# O artefato do ETL só é usado se foi gerado a partir do conteúdo atual do
+# csv de origem (versão gravada pelo ETL ao lado do artefato). O mtime não
+# serve: um git clone ou um deploy não o preserva.
+def processed_is_fresh(file_path=FILE_PATH, processed_path=PROCESSED_FILE_PATH):
+    if not os.path.exists(processed_path):
+        return False
+    return read_source_version(processed_path) == _source_version(file_path)
+
+
+# Dados processados, prontos para os dashboards, com os tipos compactos
+# (COMPACT_DTYPES). Um único frame por processo é compartilhado por todas
+# as sessões. Este caminho é somente leitura: se nenhum artefato do ETL
+# estiver atualizado, os dados são processados em memória, sem escrever
+# nada em disco.
+# columns: lista opcional de colunas (projeção), na ordem desejada. A
+# projeção sai do frame completo do cache e usa as mesmas colunas em
+# memória (protegidas pelo Copy-on-Write que o app liga): os dados são
+# lidos ou processados uma vez só, qualquer que seja a combinação de
+# colunas pedida pelas páginas. A projeção é montada coluna a coluna: o
+# df.loc[:, columns] copia as colunas quando elas não são um trecho
+# contínuo de um bloco do frame.
+def load_data(file_path=FILE_PATH, columns=None):
+    readers = dict(PROCESSED_READERS)
+
+    def build(path):
+        if path in readers:
+            return readers[path](path)
+        return compact_dtypes(process_data(path))
+
+    df = _cached('processed', processed_source(file_path), build)
+    if columns is None:
+        return _shared_view(df)
+    return pd.DataFrame({column: df[column] for column in columns}, copy=False)
+
+
+# Arquivo de onde os dados processados são lidos (artefato do ETL atualizado
+# ou o csv de origem); é a chave de versão das estruturas derivadas deles
+def processed_source(file_path=FILE_PATH):
+    for processed_path, _ in PROCESSED_READERS:
+        if processed_is_fresh(file_path, processed_path):
+            return processed_path
+    return file_path
+
+
+# Versão dos dados processados (chave de caches fora do loader, como o das
+# camadas do mapa)
+def data_version(file_path=FILE_PATH):
+    return file_version(processed_source(file_path))
+
+
+# Índice de bitmaps dos filtros do menu lateral, montado uma vez por versão
+# dos dados. As posições valem para qualquer projeção de load_data, pois
+# todas vêm do mesmo arquivo e na mesma ordem.
+def load_filter_index(file_path=FILE_PATH):
+    def build(path):
+        return FilterIndex(load_data(file_path, columns=FILTER_COLUMNS))
+
+    return _cached('filter_index', processed_source(file_path), build)
+
+
+# Grade de clusters do mapa por zoom (ver vorges_eat/spatial.py), montada
+# uma vez por versão dos dados. Consultada com as posições do FilterIndex.
+def load_grid_clusters(file_path=FILE_PATH):
+    def build(path):
+        return GridClusters(load_data(file_path, columns=GRID_COLUMNS))
+
+    return _cached('grid_clusters', processed_source(file_path), build)
+
+
+# Cubo de métricas pré-agregadas (ver vorges_eat/cube.py). Lido do
+# artefato do ETL quando atualizado; senão, montado a partir dos dados.
+def load_cube(file_path=FILE_PATH):
+    if processed_is_fresh(file_path, CUBE_FILE_PATH):
+        return _cached('cube', CUBE_FILE_PATH, lambda path: Cube(pd.read_parquet(path)))
+
+    def build(path):
+        return Cube(build_cube(load_data(file_path)))
+
+    return _cached('cube', processed_source(file_path), build)
+
+
+# Hierarquia país > cidade > localidade pré-agregada (ver
+# vorges_eat/hierarchy.py), montada uma vez por versão dos dados
+def load_hierarchy(file_path=FILE_PATH):
+    def build(path):
+        return Hierarchy(build_hierarchy(load_data(file_path, columns=HIERARCHY_COLUMNS)))
+
+    return _cached('hierarchy', processed_source(file_path), build)
+
+
+# Ranking dos restaurantes de cada culinária (ver vorges_eat/ranking.py):
+# maior nota e, no empate, o menor restaurant_id, como nos cartões da
+# página Culinária. Montado uma vez por versão dos dados.
+def load_cuisine_ranking(file_path=FILE_PATH):
+    def build(path):
+        df = load_data(file_path, columns=["cuisines", "aggregate_rating", "restaurant_id"])
+        return GroupRanking(df, "cuisines", ["aggregate_rating", "restaurant_id"], [False, True])
+
+    return _cached('cuisine_ranking', processed_source(file_path), build)
+
+
+# Vocabulário de países, cidades e localidades com o autocompletar dos
+# filtros (ver vorges_eat/search.py), a partir das folhas da hierarquia
+def load_place_index(file_path=FILE_PATH):
+    def build(path):
+        return PlaceIndex(load_hierarchy(file_path).leaves)
+
+    return _cached('place_index', processed_source(file_path), build)
+
+
+# Índice da busca de restaurantes por nome, localidade e endereço (ver
+# vorges_eat/search.py), montado uma vez por versão dos dados
+def load_search_index(file_path=FILE_PATH):
+    def build(path):
+        return SearchIndex(load_data(file_path, columns=list(SEARCH_FIELDS)))
+
+    return _cached('search_index', processed_source(file_path), build)
+
+
+# Respostas de uma aba da página de Perguntas de Negócio (ver
+# vorges_eat/questions.py): as tabelas e os textos das perguntas da aba,
+# calculados só quando a aba é aberta e uma vez por versão dos dados
+def load_answers(tab, file_path=FILE_PATH):
+    def build(path):
+        questions = [question for question in QUESTIONS if question["tab"] == tab]
+        return evaluate_questions(load_data(file_path), questions)[tab]
+
+    return _cached(('answers', tab), processed_source(file_path), build)
+
+
+# Conteúdo do botão de download da Home (csv separado por ';'), gerado uma
+# vez por versão do arquivo em vez de a cada rerun. O csv processado só é
+# servido se estiver em dia com o arquivo original (processed_is_fresh);
+# senão, o download é montado a partir do original.
+def _build_download_csv(file_path):
+    return pd.read_csv(file_path).to_csv(index=False, sep=';')
+
+
+def _build_download_csv_from_source(file_path):
+    return process_data(file_path).to_csv(index=False, sep=';')
+
+
+def load_download_csv(file_path=FILE_PATH, processed_path=PROCESSED_FILE_PATH):
+    if processed_is_fresh(file_path, processed_path):
+        return _cached('download', processed_path, _build_download_csv)
+    return _cached('download_source', file_path, _build_download_csv_from_source)
+
+
+# Imagens das páginas já redimensionadas para a largura exibida. As fotos
+# originais têm ~20 megapixels (~60 MB decodificadas); abrir e reduzir a cada
+# rerun custava memória e CPU por sessão. O redimensionamento segue o que o
+# st.image faria (mesma proporção e filtro), então o resultado é o mesmo.
+def load_image(file_path, width=None):
+    def build(path):
+        with Image.open(path) as image:
+            image.load()
+            if width is None or image.width <= width:
+                return image.copy()
+            height = int(1.0 * image.height * width / image.width)
+            return image.resize((width, height), resample=Image.BILINEAR)
+
+    return _cached(('image', width), file_path, build)
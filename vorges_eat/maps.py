@@ -0,0 +1,415 @@
+# Libraries
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+
+import folium
+import numpy as np
+import pandas as pd
+from branca.element import CssLink, Element, JavascriptLink
+from folium.plugins import FastMarkerCluster, HeatMap
+from jinja2 import Template
+from jinja2.utils import htmlsafe_json_dumps
+from streamlit_folium import generate_leaflet_string, get_full_id
+
+
+#========================================================================
+#==================== Mapa dos Restaurantes =============================
+#========================================================================
+# Colunas usadas pelo mapa (posição, cor do marcador e texto do popup)
+MAP_COLUMNS = [
+    "restaurant_name",
+    "average_cost_for_two",
+    "currency",
+    "cuisines",
+    "aggregate_rating",
+    "color_name",
+    "latitude",
+    "longitude",
+]
+
+# Campos de cada linha de dados do mapa enviada ao navegador (marker_rows)
+MARKER_FIELDS = [
+    "latitude",
+    "longitude",
+    "color_name",
+    "restaurant_name",
+    "average_cost_for_two",
+    "currency",
+    "cuisines",
+    "aggregate_rating",
+]
+
+# Texto do popup de cada restaurante, em partes (texto fixo, campo). É a
+# única definição do popup: o popup_html (tiles GeoJSON) e o MARKER_CALLBACK
+# (mapa da página Países) são montados a partir dela.
+POPUP_PARTS = [
+    ("<p><strong>", "restaurant_name"),
+    ("</strong></p><p>Price: ", "average_cost_for_two"),
+    (",00 (", "currency"),
+    (") para dois<br />Type: ", "cuisines"),
+    ("<br />Aggragate Rating: ", "aggregate_rating"),
+    ("/5.0", None),
+]
+
+
+# Expressão javascript do popup a partir das partes: cada campo é lido da
+# linha (row) pela posição em MARKER_FIELDS; a nota usa a variável rating
+def _popup_js(parts=POPUP_PARTS):
+    terms = []
+    for text, field in parts:
+        terms.append(json.dumps(text))
+        if field == "aggregate_rating":
+            terms.append("rating")
+        elif field is not None:
+            terms.append(f"row[{MARKER_FIELDS.index(field)}]")
+    return " + ".join(terms)
+
+
+# Função javascript chamada pelo FastMarkerCluster para cada linha dos dados
+# (campos de MARKER_FIELDS). Os ícones são criados uma vez por cor. O popup
+# é o mesmo que o folium.Popup(max_width=500) geraria com o popup_html, mas
+# é montado no navegador e só quando é aberto.
+MARKER_CALLBACK = """(function () {
+    var icons = {};
+    function popup(row) {
+        var rating = RATING % 1 === 0 ? RATING.toFixed(1) : String(RATING);
+        return '<div style="width: 100.0%; height: 100.0%;">'
+            + POPUP
+            + "</div>";
+    }
+    return function (row) {
+        var icon = icons[row[2]];
+        if (icon === undefined) {
+            icon = icons[row[2]] = L.AwesomeMarkers.icon({
+                "extraClasses": "fa-rotate-0",
+                "icon": "home",
+                "iconColor": "white",
+                "markerColor": row[2],
+                "prefix": "fa"
+            });
+        }
+        var marker = L.marker(new L.LatLng(row[0], row[1]), {"icon": icon});
+        marker.bindPopup(function () { return popup(row); }, {"maxWidth": 500});
+        return marker;
+    };
+})()""".replace("POPUP", _popup_js()).replace("RATING", f"row[{MARKER_FIELDS.index('aggregate_rating')}]")
+
+
+# Função javascript de cada cluster ([latitude, longitude, restaurantes,
+# nota média]): o mesmo ícone do Leaflet.markercluster (pequeno, médio e
+# grande a partir de 10 e 100 restaurantes)
+CLUSTER_CALLBACK = """function (row) {
+    var size = row[2] < 10 ? "small" : row[2] < 100 ? "medium" : "large";
+    var icon = L.divIcon({
+        "html": "<div><span>" + row[2] + "</span></div>",
+        "className": "marker-cluster marker-cluster-" + size,
+        "iconSize": new L.Point(40, 40)
+    });
+    var marker = L.marker(new L.LatLng(row[0], row[1]), {"icon": icon});
+    marker.bindPopup(
+        "<p><strong>" + row[2] + (row[2] === 1 ? " restaurante" : " restaurantes") + "</strong></p>"
+        + "<p>Nota média: " + row[3].toFixed(2) + "/5.0</p>"
+    );
+    return marker;
+}"""
+
+# Acima disso o mapa mostra os clusters da grade em vez de um marcador por
+# restaurante
+MAX_MARKERS = 2000
+
+# Acima disso (restaurantes na área visível) o modo automático mostra o mapa
+# de densidade em vez dos clusters. Vale em relação a MAX_MARKERS: entre um e
+# outro limite a área ainda é lida pelos clusters; nos dados atuais (cerca
+# de 7 mil restaurantes), a visão do mundo inteiro sem filtros passa do
+# limite e a Índia sozinha (cerca de 3 mil) não.
+HEATMAP_ROWS = 2 * MAX_MARKERS
+
+# Limites do cache de camadas renderizadas: quantidade de camadas e total de
+# caracteres de javascript guardados
+LAYER_CACHE_ENTRIES = 64
+LAYER_CACHE_CHARS = 64 * 2**20
+
+
+# Texto de cada popup (POPUP_PARTS), montado de uma vez para todas as linhas
+# (concatenação de colunas em vez de um format por linha). O mapa monta o
+# mesmo texto no navegador (MARKER_CALLBACK); este é o dos tiles GeoJSON.
+def popup_html(dataframe):
+    html = pd.Series("", index=dataframe.index, dtype=object)
+    for text, field in POPUP_PARTS:
+        html += text
+        if field == "aggregate_rating":
+            html += dataframe[field].astype('float64').round(6).astype(str)
+        elif field is not None:
+            html += dataframe[field].astype(str)
+    return html
+
+
+# Linhas de dados do mapa, com os campos de MARKER_FIELDS. Só os campos do
+# popup vão para o navegador, não o html de cada um.
+def marker_rows(dataframe):
+    return list(
+        zip(
+            dataframe["latitude"].astype('float64').round(6).tolist(),
+            dataframe["longitude"].astype('float64').round(6).tolist(),
+            dataframe["color_name"].astype(str).tolist(),
+            dataframe["restaurant_name"].astype(str).tolist(),
+            dataframe["average_cost_for_two"].tolist(),
+            dataframe["currency"].astype(str).tolist(),
+            dataframe["cuisines"].astype(str).tolist(),
+            dataframe["aggregate_rating"].astype('float64').round(6).tolist(),
+        )
+    )
+
+
+# Trecho de javascript inserido como está na página. O branca transforma a
+# saída de cada elemento em um novo template jinja, o que com o array de
+# marcadores (dezenas de MB em escala) custa mais do que todo o resto.
+class _RawScript(Element):
+
+    _template = Template("{{ this.code }}")
+
+    def __init__(self, code):
+        super().__init__()
+        self.code = code
+
+
+# FastMarkerCluster que recebe as linhas já prontas (sem a validação linha a
+# linha do construtor do folium; as coordenadas do dataset processado já são
+# números válidos) e serializa o array de dados uma única vez. Com
+# cluster=False os marcadores vão para uma camada simples, sem o cluster do
+# navegador (usado para os clusters já calculados no servidor).
+class BatchedMarkers(FastMarkerCluster):
+
+    _template = Template(
+        """
+        {% macro script(this, kwargs) %}
+            var {{ this.get_name() }} = (function(){
+                {{ this.callback }}
+
+                var data = {{ this.data_json }};
+                {%- if this.cluster %}
+                var cluster = L.markerClusterGroup({{ this.options|tojson }});
+                {%- else %}
+                var cluster = L.featureGroup();
+                {%- endif %}
+
+                for (var i = 0; i < data.length; i++) {
+                    var row = data[i];
+                    var marker = callback(row);
+                    marker.addTo(cluster);
+                }
+
+                cluster.addTo({{ this._parent.get_name() }});
+                return cluster;
+            })();
+        {% endmacro %}"""
+    )
+
+    def __init__(self, rows, callback, cluster=True, **kwargs):
+        super().__init__([], callback=callback, **kwargs)
+        self.data_json = htmlsafe_json_dumps(rows)
+        self.cluster = cluster
+
+    # Como o JSCSSMixin.render + MacroElement.render, mas o script entra na
+    # página como _RawScript, sem passar de novo pelo jinja
+    def render(self, **kwargs):
+        figure = self.get_root()
+        for name, url in self.default_js:
+            figure.header.add_child(JavascriptLink(url), name=name)
+        for name, url in self.default_css:
+            figure.header.add_child(CssLink(url), name=name)
+
+        script = self._template.module.__dict__["script"]
+        figure.script.add_child(_RawScript(script(self, kwargs)), name=self.get_name())
+
+
+# Mapa base, sem dados: mundo inteiro, como o mapa original da página
+def base_map():
+    f = folium.Figure(width=1920, height=1080)
+
+    return folium.Map(max_bounds=True).add_to(f)
+
+
+# Camada com um marcador por restaurante, agrupados em clusters no
+# navegador. Os marcadores vão para a página como um único array de dados e
+# são criados pelo MARKER_CALLBACK, em vez de um folium.Marker (e um bloco
+# de javascript) por restaurante.
+def marker_layer(dataframe):
+    layer = folium.FeatureGroup(name="Restaurantes")
+    BatchedMarkers(marker_rows(dataframe), callback=MARKER_CALLBACK).add_to(layer)
+    return layer
+
+
+# Linhas de dados dos clusters: [latitude, longitude, restaurantes, nota média]
+def cluster_rows(clusters):
+    return list(
+        zip(
+            clusters["latitude"].round(6).tolist(),
+            clusters["longitude"].round(6).tolist(),
+            clusters["restaurants"].tolist(),
+            clusters["aggregate_rating"].round(2).tolist(),
+        )
+    )
+
+
+# Camada com os clusters calculados no servidor (ver vorges_eat/spatial.py):
+# um círculo por célula da grade, no centroide, com a quantidade de
+# restaurantes e a nota média. O navegador recebe só os clusters.
+def cluster_layer(clusters):
+    layer = folium.FeatureGroup(name="Restaurantes")
+    BatchedMarkers(cluster_rows(clusters), callback=CLUSTER_CALLBACK, cluster=False).add_to(layer)
+    return layer
+
+
+# Camada de densidade (mapa de calor) a partir das células de
+# GridClusters.density. A intensidade de cada célula é o peso relativo à
+# célula mais pesada da área visível; sem células ou sem peso positivo (a
+# divisão daria NaN ou inf), a camada fica vazia.
+def heatmap_layer(density):
+    layer = folium.FeatureGroup(name="Restaurantes")
+    max_weight = density["weight"].max() if len(density) > 0 else np.nan
+    if np.isfinite(max_weight) and max_weight > 0:
+        intensity = (density["weight"] / max_weight).round(4)
+        rows = list(
+            zip(
+                density["latitude"].round(6).tolist(),
+                density["longitude"].round(6).tolist(),
+                intensity.tolist(),
+            )
+        )
+        HeatMap(rows, radius=20, blur=15, min_opacity=0.3).add_to(layer)
+    return layer
+
+
+# Mapa estático completo (folium_static) com todos os restaurantes
+def build_map(dataframe):
+    m = base_map()
+    marker_layer(dataframe).add_to(m)
+    return m
+
+
+#========================================================================
+#==================== Mapa Interativo (área visível) ====================
+#========================================================================
+# Camada da área visível do mapa: as linhas selecionadas (`positions`, do
+# FilterIndex) dentro de `bounds` vêm do índice espacial da grade. O modo
+# "auto" escolhe pela quantidade de restaurantes visíveis: até MAX_MARKERS,
+# marcadores; até heatmap_rows, os clusters do zoom atual; acima disso, o
+# mapa de densidade (com o peso `weight`, ver GridClusters.density). O modo
+# "clusters" nunca usa o mapa de densidade e o "heatmap" usa sempre. O
+# tamanho da camada não depende do tamanho da seleção.
+def viewport_layer(grid, map_data, positions, bounds, zoom, mode="auto", weight=None, heatmap_rows=HEATMAP_ROWS):
+    visible = grid.within(bounds, positions)
+    if mode == "heatmap" or (mode == "auto" and len(visible) > heatmap_rows):
+        return heatmap_layer(grid.density(bounds, visible, weight))
+    if len(visible) <= MAX_MARKERS:
+        return marker_layer(map_data.take(visible))
+    return cluster_layer(grid.clusters(zoom, visible))
+
+
+# Área visível e zoom devolvidos pelo st_folium, como ((lat_min, lat_max,
+# lon_min, lon_max), zoom); None enquanto o mapa não informou a área
+def returned_view(value):
+    bounds = (value or {}).get("bounds") or {}
+    south_west = bounds.get("_southWest") or {}
+    north_east = bounds.get("_northEast") or {}
+    corners = (south_west.get("lat"), north_east.get("lat"), south_west.get("lng"), north_east.get("lng"))
+    if None in corners or value.get("zoom") is None:
+        return None
+    return tuple(float(c) for c in corners), int(value["zoom"])
+
+
+#========================================================================
+#==================== Cache de Camadas Renderizadas =====================
+#========================================================================
+# Chave normalizada de uma camada: a mesma seleção gera a mesma chave
+# independente da ordem em que os países e tipos de preço foram escolhidos.
+# `version` é a versão dos dados (loader.data_version) e `view` a área
+# visível e o zoom.
+def layer_key(version, filters, view, mode="auto", weight=None):
+    bounds, zoom = view
+    normalized = (
+        version,
+        tuple(sorted((column, tuple(sorted(map(str, values)))) for column, values in filters.items())),
+        tuple(round(float(b), 6) for b in bounds),
+        int(zoom),
+        mode,
+        weight,
+    )
+    return hashlib.sha1(repr(normalized).encode()).hexdigest()
+
+
+# Javascript da camada como o st_folium o envia ao navegador (feature group
+# "feature_group_0", no mapa "map_div")
+def render_layer(layer):
+    m = base_map()
+    layer.add_to(m)
+    layer.render()
+    code = generate_leaflet_string(layer, base_id="feature_group_0")
+    return code.replace(get_full_id(m), "map_div")
+
+
+# Camada já renderizada (por render_layer), entregue ao st_folium no lugar
+# da camada original. Só serve para o st_folium (feature_group_to_add).
+class RenderedLayer(folium.FeatureGroup):
+
+    _template = Template("{% macro script(this, kwargs) %}{{ this.code }}{% endmacro %}")
+
+    def __init__(self, code):
+        super().__init__(name="Restaurantes")
+        self.code = code
+
+    def render(self, **kwargs):
+        pass
+
+
+# Cache LRU das camadas renderizadas, compartilhado por todas as sessões do
+# processo (como o cache do loader). Guarda só o javascript; ao passar de
+# max_entries camadas ou max_chars caracteres, as menos usadas saem.
+class LayerCache:
+
+    def __init__(self, max_entries=LAYER_CACHE_ENTRIES, max_chars=LAYER_CACHE_CHARS):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._chars = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    # Camada da chave `key`; se não estiver no cache, `build()` monta a
+    # camada (folium) e ela é renderizada uma vez
+    def get(self, key, build):
+        with self._lock:
+            code = self._entries.get(key)
+            if code is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return RenderedLayer(code)
+
+        code = render_layer(build())
+
+        with self._lock:
+            self.misses += 1
+            if key not in self._entries:
+                self._entries[key] = code
+                self._chars += len(code)
+                while len(self._entries) > 1 and (
+                    len(self._entries) > self.max_entries or self._chars > self.max_chars
+                ):
+                    _, old = self._entries.popitem(last=False)
+                    self._chars -= len(old)
+        return RenderedLayer(code)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._chars = 0
+
+
+LAYER_CACHE = LayerCache()
@@ -0,0 +1,38 @@
+# Libraries
+import pandas as pd
+
+
+# Converte os tipos compactos do dataframe processado para exibição:
+# colunas float32 voltam a float64 arredondadas na precisão do float32, para
+# os valores aparecerem como 4.4 e não 4.400000095367432; com `categories`,
+# as colunas category também voltam a ser texto.
+def _for_display(dataframe, categories):
+    dtypes = {}
+    for col, dtype in dataframe.dtypes.items():
+        if categories and isinstance(dtype, pd.CategoricalDtype):
+            dtypes[col] = object
+        elif dtype == 'float32':
+            dtypes[col] = 'float64'
+    if not dtypes:
+        return dataframe
+
+    df = dataframe.astype(dtypes)
+    float_cols = [col for col, dtype in dtypes.items() if dtype == 'float64']
+    df[float_cols] = df[float_cols].round(6)
+    return df
+
+
+# Prepara uma tabela (já filtrada ou agregada) para o plotly express:
+# - o plotly (fixado em 5.18 no requirements) agrupa as colunas category com
+#   observed=False e quebra quando há categorias sem nenhuma linha, o que é o
+#   caso normal depois dos filtros, então elas voltam a ser texto;
+# - colunas float32 voltam a float64 arredondadas na precisão do float32,
+#   para os rótulos mostrarem 4.4 e não 4.400000095367432.
+def for_plotly(dataframe):
+    return _for_display(dataframe, categories=True)
+
+
+# Prepara uma tabela para o st.dataframe: só as colunas float32 voltam a
+# float64 arredondadas (as colunas category são exibidas normalmente).
+def for_table(dataframe):
+    return _for_display(dataframe, categories=False)
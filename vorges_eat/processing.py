@@ -0,0 +1,232 @@
+# Libraries
+import hashlib
+import json
+import os
+
+import pandas as pd
+import inflection
+from pandas.api.extensions import take
+
+
+#========================================================================
+#==================== Variáveis Auxiliares ==============================
+#========================================================================
+FILE_PATH = 'datasets/zomato.csv'
+
+PROCESSED_FILE_PATH = 'datasets/data_processed.csv'
+
+PARQUET_FILE_PATH = 'datasets/data_processed.parquet'
+
+CUBE_FILE_PATH = 'datasets/cube.parquet'
+
+TILES_DIR_PATH = 'datasets/tiles'
+
+# Cada artefato do ETL tem ao lado um arquivo com a versão do csv de origem
+# de onde foi gerado (ex.: datasets/data_processed.parquet.source.json)
+SOURCE_VERSION_SUFFIX = '.source.json'
+
+COUNTRIES = {
+    1: "India",
+    14: "Australia",
+    30: "Brazil",
+    37: "Canada",
+    94: "Indonesia",
+    148: "New Zeland",
+    162: "Philippines",
+    166: "Qatar",
+    184: "Singapure",
+    189: "South Africa",
+    191: "Sri Lanka",
+    208: "Turkey",
+    214: "United Arab Emirates",
+    215: "England",
+    216: "United States of America",
+}
+
+
+COLORS = {
+    "3F7E00": "darkgreen",
+    "5BA829": "green",
+    "9ACD32": "lightgreen",
+    "CDD614": "orange",
+    "FFBA00": "red",
+    "CBCBC8": "darkred",
+    "FF7800": "darkred",
+}
+
+
+PRICE_TYPES = {
+    1: "cheap",
+    2: "normal",
+    3: "expensive",
+    4: "gourmet",
+}
+
+
+# Esquema (e ordem) das colunas dos dados processados
+PROCESSED_COLUMNS = [
+    "restaurant_id",
+    "restaurant_name",
+    "country",
+    "city",
+    "address",
+    "locality",
+    "locality_verbose",
+    "longitude",
+    "latitude",
+    "cuisines",
+    "price_type",
+    "average_cost_for_two",
+    "currency",
+    "has_table_booking",
+    "has_online_delivery",
+    "is_delivering_now",
+    "aggregate_rating",
+    "rating_color",
+    "color_name",
+    "rating_text",
+    "votes",
+]
+
+
+# Tipos compactos das colunas processadas: colunas de texto com poucos
+# valores viram category, flags viram int8, coordenadas e notas float32 e
+# contadores int32. Colunas ausentes aqui ficam com o tipo original.
+COMPACT_DTYPES = {
+    "restaurant_id": "int32",
+    "country": "category",
+    "city": "category",
+    "longitude": "float32",
+    "latitude": "float32",
+    "cuisines": "category",
+    "price_type": "category",
+    "average_cost_for_two": "int32",
+    "currency": "category",
+    "has_table_booking": "int8",
+    "has_online_delivery": "int8",
+    "is_delivering_now": "int8",
+    "aggregate_rating": "float32",
+    "rating_color": "category",
+    "color_name": "category",
+    "rating_text": "category",
+    "votes": "int32",
+}
+
+#========================================================================
+#==================== Funções Auxiliares ================================
+#========================================================================
+
+# renomear as colunas em snakecase
+def rename_columns(dataframe):
+    df = dataframe.copy()
+    title = lambda x: inflection.titleize(x)
+    snakecase = lambda x: inflection.underscore(x)
+    spaces = lambda x: x.replace(" ", "")
+    cols_old = list(df.columns)
+    cols_old = list(map(title, cols_old))
+    cols_old = list(map(spaces, cols_old))
+    cols_new = list(map(snakecase, cols_old))
+    df.columns = cols_new
+
+    return df
+
+# Aplica a função apenas nos valores distintos da coluna (via factorize) e
+# expande o resultado pelos códigos. As colunas têm poucas categorias, então
+# o trabalho em Python é proporcional ao número de valores únicos, não de linhas.
+def _map_categories(series, func):
+    codes, uniques = pd.factorize(series)
+    values = func(pd.Series(uniques)).to_numpy()
+    return pd.Series(take(values, codes, allow_fill=True), index=series.index)
+
+# Lookup vetorizado em um dicionário. Códigos desconhecidos geram KeyError,
+# como acontecia com o acesso direto ao dicionário linha a linha.
+def _lookup(series, mapping):
+    def lookup(uniques):
+        result = uniques.map(mapping)
+        missing = result.isna()
+        if missing.any():
+            raise KeyError(sorted(uniques[missing].tolist()))
+        return result
+
+    return _map_categories(series, lookup)
+
+# Substituir o código do país pelo seu nome
+def country_name(country_ids):
+    return _lookup(country_ids, COUNTRIES)
+
+
+# Substituir o código da cor por seu nome
+def color_name(color_codes):
+    return _lookup(color_codes, COLORS)
+
+# Substituir o price_range pelas nomes (qualquer faixa acima de 3 é gourmet)
+def create_price_tye(price_ranges):
+    return _map_categories(price_ranges, lambda x: x.map(PRICE_TYPES).fillna("gourmet"))
+
+# Manter apenas o primeiro tipo culinário da lista
+def first_cuisine(cuisines):
+    return _map_categories(cuisines, lambda x: x.str.split(",", n=1).str[0])
+    
+# Ajustar as ordens das colunas
+def adjust_columns_order(dataframe):
+    df = dataframe.copy()
+    return df.loc[:, PROCESSED_COLUMNS]
+
+# Converter as colunas para os tipos compactos (menos memória por sessão)
+def compact_dtypes(dataframe):
+    dtypes = {col: dtype for col, dtype in COMPACT_DTYPES.items() if col in dataframe.columns}
+    return dataframe.astype(dtypes)
+
+# Processar e ransformar os dados (somente em memória, não escreve em disco)
+def process_data(file_path):
+    df = pd.read_csv(file_path)
+    df = df.dropna()
+    df = rename_columns(df)
+    df["price_type"] = create_price_tye(df.loc[:, "price_range"])
+    df["country"] = country_name(df.loc[:, "country_code"])
+    df["color_name"] = color_name(df.loc[:, "rating_color"])
+    df["cuisines"] = first_cuisine(df.loc[:, "cuisines"])
+    df = df.drop_duplicates()
+    df = adjust_columns_order(df)
+    df = df.reset_index(drop=True)
+    return df
+
+# Ler os dados já processados pelo ETL (python -m vorges_eat.etl),
+# opcionalmente apenas algumas colunas
+def read_processed_data(file_path, columns=None):
+    df = pd.read_csv(file_path, usecols=columns)
+    if columns is not None:
+        df = df.loc[:, list(columns)]
+    return compact_dtypes(df)
+
+# Ler o snapshot parquet: tipado e colunar, só as colunas pedidas são lidas
+def read_parquet_data(file_path, columns=None):
+    if columns is not None:
+        columns = list(columns)
+    return pd.read_parquet(file_path, columns=columns)
+
+
+#========================================================================
+#==================== Versão do Csv de Origem ===========================
+#========================================================================
+
+# Versão do conteúdo de um arquivo: tamanho e sha256. Ao contrário do mtime,
+# ela se mantém num git clone ou num deploy.
+def source_version(file_path):
+    digest = hashlib.sha256()
+    with open(file_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return {"size": os.path.getsize(file_path), "sha256": digest.hexdigest()}
+
+# Arquivo com a versão da origem de um artefato do ETL
+def source_version_path(artifact_path):
+    return artifact_path + SOURCE_VERSION_SUFFIX
+
+# Versão da origem gravada para o artefato (None se não houver)
+def read_source_version(artifact_path):
+    try:
+        with open(source_version_path(artifact_path)) as f:
+            return json.load(f)
+    except (FileNotFoundError, ValueError):
+        return None
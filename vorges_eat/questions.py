@@ -0,0 +1,585 @@
+# Libraries
+import numpy as np
+
+from vorges_eat.ranking import top_n
+
+
+#========================================================================
+#==================== Perguntas de Negócio ==============================
+#========================================================================
+# Abas da página de Perguntas de Negócio, na ordem, e o título de cada uma
+QUESTION_TABS = {
+    "Geral": "Perguntas Gerais",
+    "País": "Perguntas sobre os Países",
+    "Cidade": "Perguntas sobre as Cidades",
+    "Restaurantes": "Perguntas sobre os Restaurantes",
+    "Tipos de Culinária": "Perguntas sobre os Tipos Culinários",
+}
+
+# Colunas de uma tabela de restaurantes
+_RESTAURANT = ["restaurant_id", "restaurant_name", "country", "cuisines", "aggregate_rating"]
+
+# Registro das perguntas. Cada pergunta é um dicionário com a aba, o título,
+# uma especificação da agregação e o texto da resposta. A agregação é uma de:
+#   total:   (coluna, função) sobre todos os dados; a resposta é um número
+#   group:   coluna do agrupamento + measures {coluna: função}, ordenado
+#            pela primeira medida (ascending), empates pelo grupo, e com
+#            no máximo n grupos
+#   rows:    colunas dos restaurantes, ordenados por `by`/`ascending`
+#            (top_n), no máximo n linhas (None são todas); reset_index
+#            mantém o índice original como coluna
+# where filtra as linhas antes da agregação (coluna -> lista de valores ou
+# função que recebe a coluna e devolve uma máscara, como no Cube).
+# O texto da resposta é gerado a partir do resultado: {value} é o total ou
+# o valor do primeiro colocado e {leader} o nome do primeiro colocado (o
+# grupo ou restaurant_name), com os empates. Uma resposta em par (sim, não)
+# é escolhida conforme o primeiro colocado seja `expect` ou não.
+QUESTIONS = [
+    # GERAL
+    {
+        "tab": "Geral",
+        "title": "Quantos restaurantes únicos estão registrados?",
+        "total": ("restaurant_id", "nunique"),
+        "answer": "Há {value} restaurantes únicos registrados.",
+    },
+    {
+        "tab": "Geral",
+        "title": "Quantos países únicos estão registrados?",
+        "total": ("country", "nunique"),
+        "answer": "Há {value} países únicos registrados.",
+    },
+    {
+        "tab": "Geral",
+        "title": "Quantas cidades únicas estão registradas?",
+        "total": ("city", "nunique"),
+        "answer": "Há {value} cidades únicas registradas.",
+    },
+    {
+        "tab": "Geral",
+        "title": "Qual o total de avaliações feitas?",
+        "total": ("votes", "sum"),
+        "answer": "Há um total de {value} avaliações feitas.",
+    },
+    {
+        "tab": "Geral",
+        "title": "Qual o total de tipos de culinária registrados?",
+        "total": ("cuisines", "nunique"),
+        "answer": "Há um total de {value} tipos culinários.",
+    },
+    # PAÍS
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui mais cidades registradas?",
+        "group": "country",
+        "measures": {"city": "nunique"},
+        "answer": "Como mostrado na tabela abaixo, {leader} é o país com mais cidades registradas ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui mais restaurantes registrados?",
+        "group": "country",
+        "measures": {"restaurant_id": "nunique"},
+        "answer": "{leader} é o país com mais restaurantes registrados ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui mais restaurantes com o nível de preço igual a 4 registrados?",
+        "group": "country",
+        "measures": {"restaurant_id": "count"},
+        # price_range 4 é o price_type gourmet
+        "where": {"price_type": ["gourmet"]},
+        "answer": "{leader} é o país com mais restaurantes com nível de preço igual a 4 ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui a maior quantidade de tipos de culinária distintos?",
+        "group": "country",
+        "measures": {"cuisines": "nunique"},
+        "answer": "{leader} é o país com maior quantidade de tipos culinários distintos ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui a maior quantidade de avaliações feitas?",
+        "group": "country",
+        "measures": {"votes": "sum"},
+        "answer": "{leader} é o país com maior quantidade de avaliações feitas ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui a maior quantidade de restaurantes que fazem entrega?",
+        "group": "country",
+        "measures": {"restaurant_id": "count"},
+        "where": {"is_delivering_now": [1]},
+        "answer": "{leader} é o país que possui a maior quantidade de restaurantes que fazem entrega ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui a maior quantidade de restaurantes que aceitam reservas?",
+        "group": "country",
+        "measures": {"restaurant_id": "count"},
+        "where": {"has_table_booking": [1]},
+        "answer": "{leader} é o país que possui a maior quantidade de restaurantes que aceitam reservas ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui, na média, a maior quantidade de avaliações registrada?",
+        "group": "country",
+        "measures": {"votes": "mean"},
+        "answer": "{leader} é o país que possui na média a maior quantidade de avaliações registradas ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui, na média, a maior nota média registrada?",
+        "group": "country",
+        "measures": {"aggregate_rating": "mean"},
+        "answer": "{leader} é o país que possui na média a maior nota média registrada ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual o nome do país que possui, na média, a menor nota média registrada?",
+        "group": "country",
+        "measures": {"aggregate_rating": "mean"},
+        "ascending": True,
+        "answer": "{leader} é o país que possui na média a menor nota média registrada ({value}).",
+    },
+    {
+        "tab": "País",
+        "title": "Qual a média de preço de um prato para dois por país?",
+        "group": "country",
+        "measures": {"average_cost_for_two": "mean"},
+    },
+    # CIDADE
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui mais restaurantes registrados?",
+        "group": "city",
+        "measures": {"restaurant_id": "count"},
+        "answer": "{leader} é a cidade que possui mais restaurantes registrados ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui mais restaurantes com nota média acima de 4?",
+        "group": "city",
+        "measures": {"restaurant_id": "count"},
+        "where": {"aggregate_rating": lambda rating: rating >= 4},
+        "answer": "{leader} é a cidade que mais possui restaurantes com nota média acima de 4 ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui mais restaurantes com nota média abaixo de 2.5?",
+        "group": "city",
+        "measures": {"restaurant_id": "count"},
+        "where": {"aggregate_rating": lambda rating: rating < 2.5},
+        "answer": "{leader} é a cidade que mais possui restaurantes com nota média abaixo de 2.5 ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui o maior valor médio de um prato para dois?",
+        "group": "city",
+        "measures": {"average_cost_for_two": "mean"},
+        "answer": "{leader} é a cidade que possui o maior valor médio de um prato para casal ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui a maior quantidade de tipos de culinária distintas?",
+        "group": "city",
+        "measures": {"cuisines": "nunique"},
+        "n": 10,
+        "answer": "{leader} é a cidade que possui maior quantidade de tipos culinários distintos ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui a maior quantidade de restaurantes que fazem reservas?",
+        "group": "city",
+        "measures": {"restaurant_id": "count"},
+        "where": {"has_table_booking": [1]},
+        "n": 10,
+        "answer": "{leader} é a cidade que possui maior quantidade de restaurantes que fazem reservas ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui a maior quantidade de restaurantes que fazem entregas?",
+        "group": "city",
+        "measures": {"restaurant_id": "count"},
+        "where": {"is_delivering_now": [1]},
+        "n": 10,
+        "answer": "{leader} é a cidade que possui a maior quantidade de restaurantes que fazem entregas ({value}).",
+    },
+    {
+        "tab": "Cidade",
+        "title": "Qual o nome da cidade que possui a maior quantidade de restaurantes que aceitam pedidos online?",
+        "group": "city",
+        "measures": {"restaurant_id": "count"},
+        "where": {"has_online_delivery": [1]},
+        "n": 10,
+        "answer": "{leader} é a cidade que possui maior quantidade de restaurantes que aceitam pedidos online ({value}).",
+    },
+    # RESTAURANTES
+    {
+        "tab": "Restaurantes",
+        "title": "Qual o nome do restaurante que possui a maior quantidade de avaliações?",
+        "rows": ["restaurant_id", "restaurant_name", "country", "votes"],
+        "by": ["votes", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 10,
+        "answer": "{leader} é o nome do restaurante que possui a maior quantidade de avaliações ({value}).",
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Qual o nome do restaurante com a maior nota média?",
+        "rows": ["restaurant_id", "restaurant_name", "country", "aggregate_rating"],
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 10,
+        "answer": "{leader} é o restaurante que possui a maior nota média ({value}).",
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Qual o nome do restaurante que possui o maior valor de uma prato para duas pessoas?",
+        "rows": ["restaurant_id", "restaurant_name", "country", "average_cost_for_two"],
+        "by": ["average_cost_for_two", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 10,
+        "answer": "{leader} é o restaurante com o maior valor de um prato para casal ({value}).",
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Qual o nome do restaurante de tipo de culinária brasileira que possui a menor média de avaliação?",
+        "rows": ["restaurant_id", "restaurant_name", "country", "aggregate_rating", "cuisines"],
+        "where": {"cuisines": ["Brazilian"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [True, True],
+        "n": 10,
+        "answer": "{leader} é o restaurante de culinária brasileira com a menor média de avaliação ({value}).",
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Qual o nome do restaurante de tipo de culinária brasileira, e que é do Brasil, que possui a maior média de avaliação?",
+        "rows": [
+            "restaurant_id", "restaurant_name", "country", "city", "cuisines",
+            "average_cost_for_two", "aggregate_rating", "votes",
+        ],
+        "where": {"country": ["Brazil"], "cuisines": ["Brazilian"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 10,
+        "answer": "{leader} é o restaurante de culinária brasileira com a maior média de avaliação no Brasil ({value}).",
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Os restaurantes que aceitam pedido online são também, na média, os restaurantes que mais possuem avaliações registradas?",
+        "group": "has_online_delivery",
+        "measures": {"votes": "mean"},
+        "expect": 1,
+        "answer": (
+            "**Sim**, conforme mostrado na tabela abaixo os restaurantes que aceitam pedidos online na média possuem maior quantidade de avaliações.",
+            "**Não**, conforme mostrado na tabela abaixo os restaurantes que não aceitam pedidos online na média possuem maior quantidade de avaliações.",
+        ),
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Os restaurantes que fazem reservas são também, na média, os restaurantes que possuem o maior valor médio de um prato para duas pessoas?",
+        "group": "has_table_booking",
+        "measures": {"average_cost_for_two": "mean"},
+        "expect": 1,
+        "answer": (
+            "**Sim**, os restaurantes que fazem reservas possuem na média um maior valor médio no prato para duas pessoas.",
+            "**Não**, os restaurantes que não fazem reservas possuem na média um maior valor médio no prato para duas pessoas.",
+        ),
+    },
+    {
+        "tab": "Restaurantes",
+        "title": "Os restaurantes do tipo de culinária japonesa dos Estados Unidos da América possuem um valor médio de prato para duas pessoas maior que as churrascarias americanas (BBQ)?",
+        "group": "cuisines",
+        "measures": {"average_cost_for_two": "mean"},
+        "where": {"country": ["United States of America"], "cuisines": ["BBQ", "Japanese"]},
+        "expect": "Japanese",
+        "answer": ("**Sim**, conforme demonstrado na tabela abaixo.", "**Não**, conforme demonstrado na tabela abaixo."),
+    },
+    # TIPOS DE CULINÁRIA
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária italiana, qual o nome do restaurante com a maior média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Italian"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 20,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária italiana com a maior média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária italiana, qual o nome do restaurante com a menor média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Italian"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [True, True],
+        "n": 10,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária italiana com a menor média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária americana, qual o nome do restaurante com a maior média de avaliação?",
+        "rows": ["restaurant_id", "restaurant_name", "cuisines", "aggregate_rating"],
+        "where": {"cuisines": ["American"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 30,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária americana com a maior média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária americana, qual o nome do restaurante com a menor média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["American"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [True, True],
+        "n": 10,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária americana com a menor média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária árabe, qual o nome do restaurante com a maior média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Arabian"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 10,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária árabe com a maior média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária árabe, qual o nome do restaurante com a menor média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Arabian"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [True, True],
+        "n": 10,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária árabe com a menor média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária japonesa, qual o nome do restaurante com a maior média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Japanese"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": 20,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária japonesa com a maior média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária japonesa, qual o nome do restaurante com a menor média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Japanese"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [True, True],
+        "n": 10,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária japonesa com a menor média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária caseira, qual o nome do restaurante com a maior média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Home-made"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [False, True],
+        "n": None,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária caseira com a maior média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Dos restaurantes que possuem o tipo de culinária caseira, qual o nome do restaurante com a menor média de avaliação?",
+        "rows": _RESTAURANT,
+        "where": {"cuisines": ["Home-made"]},
+        "by": ["aggregate_rating", "restaurant_id"],
+        "ascending": [True, True],
+        "n": None,
+        "reset_index": True,
+        "answer": "{leader} é o restaurante de culinária caseira com a menor média de avaliação ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Qual o tipo de culinária que possui o maior valor médio de um prato para duas pessoas?",
+        "group": "cuisines",
+        "measures": {"average_cost_for_two": "mean"},
+        "n": 10,
+        "answer": "{leader} é o tipo culinário no qual possui o maior valor médio no prato para duas pessoas ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Qual o tipo de culinária que possui a maior nota média?",
+        "group": "cuisines",
+        "measures": {"aggregate_rating": "mean"},
+        "n": 1,
+        "answer": "{leader} é o tipo culinário que possui a maior nota média ({value}).",
+    },
+    {
+        "tab": "Tipos de Culinária",
+        "title": "Qual o tipo de culinária que possui mais restaurantes que aceitam pedidos online e fazem entregas?",
+        "group": "cuisines",
+        "measures": {"restaurant_id": "count"},
+        "where": {"has_online_delivery": [1], "is_delivering_now": [1]},
+        "n": 1,
+        "answer": "{leader} é o tipo culinário que mais possui restaurantes que aceitam pedidos online e realizam entregas ({value}).",
+    },
+]
+
+
+#========================================================================
+#==================== Avaliação das Perguntas ===========================
+#========================================================================
+# Número no formato brasileiro: 4.194.533 (inteiros) e 4,35
+def format_number(value):
+    if isinstance(value, (int, np.integer)):
+        return f"{int(value):,}".replace(",", ".")
+    return f"{value:,.2f}".replace(",", "_").replace(".", ",").replace("_", ".")
+
+
+# Colunas float32 (COMPACT_DTYPES) em float64, arredondadas como no cubo:
+# médias e tabelas mostram 4.9 e 4.60125, não 4.900000095367432
+def _float64(dataframe):
+    columns = [column for column, dtype in dataframe.dtypes.items() if dtype == 'float32']
+    return dataframe.assign(**{
+        column: dataframe[column].astype('float64').round(6) for column in columns
+    })
+
+
+# Máscara das linhas que atendem ao where (ver QUESTIONS)
+def _mask(dataframe, where):
+    mask = np.ones(len(dataframe), dtype=bool)
+    for column, condition in where.items():
+        if callable(condition):
+            mask &= np.asarray(condition(dataframe[column]), dtype=bool)
+        else:
+            mask &= dataframe[column].isin(condition).to_numpy()
+    return mask
+
+
+# Uma passada de groupby por coluna de agrupamento. As contagens com where
+# entram na mesma passada como a soma de uma máscara (e os grupos sem
+# nenhuma linha saem depois, como num groupby sobre as linhas filtradas);
+# as demais agregações com where precisam de uma passada própria sobre as
+# linhas filtradas. Devolve, para cada pergunta, o resultado por grupo com
+# as colunas das medidas.
+def _group_passes(dataframe, questions):
+    passes = {}
+    for i, question in questions:
+        where = question.get("where")
+        only_counts = all(func == "count" for func in question["measures"].values())
+        key = (question["group"],) if where is None or only_counts else (question["group"], i)
+        passes.setdefault(key, []).append((i, question))
+
+    results = {}
+    for key, members in passes.items():
+        group = key[0]
+        frame = dataframe
+        if len(key) > 1:
+            frame = frame.loc[_mask(frame, members[0][1]["where"])]
+
+        columns, named = {}, {}
+        for i, question in members:
+            masked = len(key) == 1 and question.get("where") is not None
+            mask = _mask(frame, question["where"]) if masked else None
+            for column, func in question["measures"].items():
+                name = f"q{i}_{column}"
+                values = frame[column]
+                if mask is not None:
+                    # contagem com where: soma da máscara das linhas com valor
+                    values = (mask & values.notna().to_numpy()).astype('int64')
+                    func = "sum"
+                columns[name] = values
+                named[name] = (name, func)
+
+        grouped = frame.assign(**columns).groupby(group, observed=True).agg(**named)
+        for i, question in members:
+            out = grouped[[f"q{i}_{column}" for column in question["measures"]]]
+            out.columns = list(question["measures"])
+            if len(key) == 1 and question.get("where") is not None:
+                out = out.loc[out.iloc[:, 0] > 0]
+            results[i] = out
+    return results
+
+
+# O primeiro colocado com os empates: **A**, **A** (empate com **B**) ou
+# **A** (empate com mais N)
+def _leader(names, ties):
+    leader = f"**{names[0]}**"
+    if ties == 2:
+        return f"{leader} (empate com **{names[1]}**)"
+    if ties > 2:
+        return f"{leader} (empate com mais {ties - 1})"
+    return leader
+
+
+# Texto da resposta a partir do valor e do primeiro colocado
+def _answer_text(question, value, names, ties):
+    answer = question.get("answer")
+    if answer is None:
+        return None
+    if value is None:
+        return "Não há dados para responder a esta pergunta."
+    if isinstance(answer, tuple):
+        return answer[0] if names[0] == str(question["expect"]) else answer[1]
+    leader = _leader(names, ties) if names else ""
+    return answer.format(value=format_number(value), leader=leader)
+
+
+# Respostas de todas as perguntas do registro, numa passada sobre os
+# dados: dicionário aba -> lista de {title, text, table}, na ordem de
+# QUESTION_TABS e do registro. table é None nas perguntas de total.
+def evaluate_questions(dataframe, questions=QUESTIONS):
+    dataframe = _float64(dataframe)
+    groups = _group_passes(dataframe, [(i, q) for i, q in enumerate(questions) if "group" in q])
+
+    answers = {tab: [] for tab in QUESTION_TABS}
+    for i, question in enumerate(questions):
+        table, names, ties, value = None, [], 0, None
+
+        if "total" in question:
+            column, func = question["total"]
+            value = getattr(dataframe[column], func)()
+
+        elif "group" in question:
+            group, by = question["group"], list(question["measures"])[0]
+            ranked = (
+                groups[i].reset_index()
+                .sort_values([by, group], ascending=[question.get("ascending", False), True], kind='stable')
+                .reset_index(drop=True)
+            )
+            if len(ranked) > 0:
+                value = ranked[by].iloc[0]
+                ties = int((ranked[by] == value).sum())
+                names = [str(name) for name in ranked[group].iloc[:min(ties, 2)]]
+            n = question.get("n")
+            table = ranked if n is None else ranked.head(n)
+
+        else:
+            frame = dataframe.loc[:, question["rows"]]
+            if question.get("where") is not None:
+                frame = frame.loc[_mask(dataframe, question["where"])]
+            n = question["n"] if question["n"] is not None else len(frame)
+            table = top_n(frame, question["by"], question["ascending"], n)
+            if question.get("reset_index"):
+                table = table.reset_index()
+            by = question["by"][0]
+            if len(table) > 0:
+                value = table[by].iloc[0]
+                ties = int((frame[by] == value).sum())
+                names = [str(name) for name in table["restaurant_name"].iloc[:min(ties, 2)]]
+
+        answers[question["tab"]].append({
+            "title": question["title"],
+            "text": _answer_text(question, value, names, ties),
+            "table": table,
+        })
+    return answers
@@ -0,0 +1,88 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+
+#========================================================================
+#==================== Rankings por Grupo ================================
+#========================================================================
+# Ranking das linhas dentro de cada grupo pelo critério `by`/`ascending`
+# (como no sort_values; empates ficam na ordem original). A ordenação é
+# feita uma vez, com o grupo como primeira chave: as linhas de cada grupo
+# ficam contíguas e já ordenadas. Os k melhores de cada grupo, para
+# qualquer seleção de linhas (posições do FilterIndex), saem de uma passada
+# sobre essa ordem, sem filtro + sort_values por grupo.
+class GroupRanking:
+
+    def __init__(self, dataframe, group, by, ascending=True):
+        if isinstance(ascending, bool):
+            ascending = [ascending] * len(by)
+
+        codes, self.groups = pd.factorize(dataframe[group], sort=True)
+        self.n_rows = len(dataframe)
+
+        # lexsort usa a última chave como a principal
+        keys = []
+        for col, asc in zip(reversed(by), reversed(ascending)):
+            values = _sort_key(dataframe[col])
+            keys.append(values if asc else -values)
+        keys.append(codes)
+
+        self._order = np.lexsort(keys)
+        self._codes = codes[self._order]
+
+    # Posições (no dataframe original) dos k melhores de cada grupo entre as
+    # linhas selecionadas, grupo a grupo e do melhor para o pior
+    def top(self, k=1, positions=None):
+        order, codes = self._order, self._codes
+        if positions is not None:
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[positions] = True
+            keep = selected[order]
+            order, codes = order[keep], codes[keep]
+
+        starts = np.searchsorted(codes, np.arange(len(self.groups)))
+        rank = np.arange(len(order)) - starts[codes]
+        keep = (rank < k) & (codes >= 0)
+        return order[keep]
+
+
+#========================================================================
+#==================== Top N =============================================
+#========================================================================
+# As n primeiras linhas de dataframe.sort_values(by, ascending).head(n),
+# sem ordenar o dataframe inteiro: uma seleção parcial (np.partition) acha
+# o n-ésimo valor da primeira coluna, e só as linhas até esse valor
+# (incluindo os empates) são ordenadas por todas as colunas. Empates
+# restantes ficam na ordem original, como no sort_values com várias
+# colunas; valores ausentes vão para o fim.
+def top_n(dataframe, by, ascending=True, n=10):
+    if isinstance(by, str):
+        by = [by]
+    if isinstance(ascending, bool):
+        ascending = [ascending] * len(by)
+
+    keys = [_sort_key(dataframe[col]) for col in by]
+    keys = [values if asc else -values for values, asc in zip(keys, ascending)]
+
+    candidates = np.arange(len(dataframe))
+    if 0 < n < len(dataframe):
+        threshold = np.partition(keys[0], n - 1)[n - 1]
+        if not np.isnan(threshold):
+            candidates = np.flatnonzero(keys[0] <= threshold)
+
+    # lexsort usa a última chave como a principal; a posição desempata
+    order = np.lexsort([candidates] + [values[candidates] for values in reversed(keys)])
+    return dataframe.take(candidates[order[:max(n, 0)]])
+
+
+# Valores numéricos para a ordenação: categorias pela ordem das categorias,
+# texto pela ordem alfabética; ausentes viram NaN
+def _sort_key(series):
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        codes = series.cat.codes.to_numpy()
+    elif pd.api.types.is_numeric_dtype(series):
+        return series.to_numpy(dtype='float64')
+    else:
+        codes, _ = pd.factorize(series, sort=True)
+    return np.where(codes < 0, np.nan, codes.astype('float64'))
@@ -0,0 +1,273 @@
+# Libraries
+import bisect
+import itertools
+import re
+import unicodedata
+
+import numpy as np
+import pandas as pd
+
+
+#========================================================================
+#==================== Busca de Restaurantes =============================
+#========================================================================
+# Campos pesquisados e o peso de cada um no ranking
+SEARCH_FIELDS = {
+    "restaurant_name": 1.0,
+    "locality": 0.6,
+    "address": 0.5,
+}
+
+# Pontuação de um termo do índice para uma palavra da busca: igual, prefixo
+# ou parecido (trigramas, multiplicado pela similaridade)
+EXACT_SCORE = 1.0
+PREFIX_SCORE = 0.75
+FUZZY_SCORE = 0.5
+
+# Similaridade mínima de trigramas (Jaccard) para um termo parecido, como o
+# limite padrão do pg_trgm; palavras menores que FUZZY_MIN_LENGTH só casam
+# por prefixo
+FUZZY_THRESHOLD = 0.3
+FUZZY_MIN_LENGTH = 3
+
+_WORD = re.compile(r"[a-z0-9]+")
+
+
+# Texto em minúsculas e sem acentos, separado em palavras
+def tokenize(text):
+    text = str(text).lower()
+    if not text.isascii():
+        text = unicodedata.normalize("NFKD", text)
+        text = "".join(c for c in text if not unicodedata.combining(c))
+    return _WORD.findall(text)
+
+
+# Trigramas de uma palavra, com as bordas marcadas ("  pizza " -> "  p",
+# " pi", "piz", ...), como no pg_trgm
+def trigrams(word):
+    padded = f"  {word} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+# Índice invertido dos restaurantes. O índice é montado sobre os registros
+# distintos (nome, localidade, endereço), não sobre as linhas: cada palavra
+# do vocabulário aponta para os registros que a contêm, e cada registro
+# para as suas linhas. O vocabulário é ordenado, então todos os termos com
+# um prefixo formam um trecho contíguo das listas de registros (uma fatia,
+# sem laço); os termos parecidos saem de um índice de trigramas sobre o
+# vocabulário.
+class SearchIndex:
+
+    def __init__(self, dataframe, fields=SEARCH_FIELDS):
+        columns = list(fields)
+        self.n_rows = len(dataframe)
+
+        # Registros distintos e as linhas de cada um
+        keys = dataframe.groupby(columns, sort=False, observed=True, dropna=False).ngroup().to_numpy()
+        _, first = np.unique(keys, return_index=True)
+        records = dataframe[columns].take(first)
+        self.n_records = len(records)
+        self._row_order = np.argsort(keys, kind='stable')
+        self._row_bounds = np.searchsorted(keys[self._row_order], np.arange(self.n_records + 1))
+
+        # Pares (termo, registro, peso do campo). Cada texto distinto de um
+        # campo é separado em palavras uma vez só, e os registros com esse
+        # texto recebem as mesmas palavras.
+        word_ids = {}
+        pair_terms, pair_records, pair_weights = [], [], []
+        for column, weight in fields.items():
+            codes, texts = pd.factorize(records[column].astype(str))
+            text_words = [
+                [word_ids.setdefault(word, len(word_ids)) for word in set(tokenize(text))]
+                for text in texts
+            ]
+            lengths = np.array([len(words) for words in text_words], dtype='int64')
+            words = np.fromiter(itertools.chain.from_iterable(text_words), dtype='int64', count=lengths.sum())
+            text_starts = np.cumsum(lengths) - lengths
+
+            counts = lengths[codes]
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            pair_terms.append(words[np.repeat(text_starts[codes], counts) + offsets])
+            pair_records.append(np.repeat(np.arange(self.n_records), counts))
+            pair_weights.append(np.full(counts.sum(), weight))
+
+        # Vocabulário ordenado; listas de registros agrupadas por termo, com
+        # o maior peso quando a palavra aparece em mais de um campo
+        words = list(word_ids)
+        order = np.argsort(np.array(words, dtype=object), kind='stable')
+        self.vocabulary = [words[i] for i in order]
+        rank = np.empty(len(words), dtype='int64')
+        rank[order] = np.arange(len(words))
+
+        terms = rank[np.concatenate(pair_terms)]
+        records = np.concatenate(pair_records)
+        weights = np.concatenate(pair_weights)
+        order = np.lexsort((-weights, records, terms))
+        terms, records, weights = terms[order], records[order], weights[order]
+        first = np.r_[True, (terms[1:] != terms[:-1]) | (records[1:] != records[:-1])]
+
+        self._records = records[first]
+        self._weights = weights[first]
+        self._bounds = np.searchsorted(terms[first], np.arange(len(words) + 1))
+
+        # Índice de trigramas do vocabulário: trigrama -> termos
+        grams = {}
+        for term, word in enumerate(self.vocabulary):
+            for gram in trigrams(word):
+                grams.setdefault(gram, []).append(term)
+        self._grams = {gram: np.array(terms, dtype='int64') for gram, terms in grams.items()}
+        self._gram_counts = np.array([len(trigrams(word)) for word in self.vocabulary], dtype='int64')
+
+    # Termos parecidos com a palavra: (termos, similaridade)
+    def _fuzzy_terms(self, word):
+        query = trigrams(word)
+        lists = [self._grams[gram] for gram in query if gram in self._grams]
+        if not lists:
+            return np.array([], dtype='int64'), np.array([], dtype='float64')
+
+        terms, shared = np.unique(np.concatenate(lists), return_counts=True)
+        similarity = shared / (len(query) + self._gram_counts[terms] - shared)
+        keep = similarity >= FUZZY_THRESHOLD
+        return terms[keep], similarity[keep]
+
+    # Pontuação de cada registro para uma palavra da busca: a melhor entre os
+    # termos que casam com ela (igual, prefixo ou parecido), vezes o peso do
+    # campo
+    def _word_scores(self, word):
+        scores = np.zeros(self.n_records)
+
+        lo = bisect.bisect_left(self.vocabulary, word)
+        hi = bisect.bisect_left(self.vocabulary, word + "\uffff")
+        if lo < hi:
+            start, end = self._bounds[lo], self._bounds[hi]
+            values = np.full(end - start, PREFIX_SCORE)
+            if self.vocabulary[lo] == word:
+                values[: self._bounds[lo + 1] - start] = EXACT_SCORE
+            records = self._records[start:end]
+            np.maximum.at(scores, records, values * self._weights[start:end])
+
+        if len(word) >= FUZZY_MIN_LENGTH:
+            terms, similarity = self._fuzzy_terms(word)
+            if len(terms) > 0:
+                counts = self._bounds[terms + 1] - self._bounds[terms]
+                idx = np.concatenate([np.arange(self._bounds[t], self._bounds[t + 1]) for t in terms])
+                values = np.repeat(FUZZY_SCORE * similarity, counts) * self._weights[idx]
+                np.maximum.at(scores, self._records[idx], values)
+
+        return scores
+
+    # Linhas (posições no dataframe original) que casam com todas as
+    # palavras da busca, da maior para a menor pontuação, e a pontuação de
+    # cada uma. No máximo `limit` linhas.
+    def search(self, query, limit=50):
+        words = tokenize(query)
+        if not words:
+            return np.array([], dtype='int64'), np.array([], dtype='float64')
+
+        total = np.zeros(self.n_records)
+        matched = np.ones(self.n_records, dtype=bool)
+        for word in dict.fromkeys(words):
+            scores = self._word_scores(word)
+            matched &= scores > 0
+            total += scores
+
+        # Cada registro tem ao menos uma linha, então bastam os `limit`
+        # melhores registros (seleção parcial em vez de ordenar todos)
+        candidates = np.flatnonzero(matched)
+        if len(candidates) > limit:
+            best = np.argpartition(-total[candidates], limit - 1)[:limit]
+            candidates = np.sort(candidates[best])
+        order = np.lexsort((candidates, -total[candidates]))
+        candidates = candidates[order]
+
+        positions, row_scores = [], []
+        found = 0
+        for record in candidates:
+            rows = np.sort(self._row_order[self._row_bounds[record]:self._row_bounds[record + 1]])
+            rows = rows[: limit - found]
+            positions.append(rows)
+            row_scores.append(np.full(len(rows), total[record]))
+            found += len(rows)
+            if found >= limit:
+                break
+
+        if not positions:
+            return np.array([], dtype='int64'), np.array([], dtype='float64')
+        return np.concatenate(positions), np.concatenate(row_scores)
+
+
+#========================================================================
+#==================== Autocompletar de Cidades e Localidades ============
+#========================================================================
+# Vocabulário ordenado de países, cidades e localidades, montado a partir
+# das combinações distintas (país, cidade, localidade). As cidades de um
+# conjunto de países saem de um dicionário, sem varrer os dados. O
+# autocompletar compara os trigramas do texto digitado com os de cada
+# cidade e localidade (índice de trigramas -> lugares) e soma um bônus
+# quando o nome começa com o texto.
+class PlaceIndex:
+
+    def __init__(self, places):
+        places = places.loc[:, ["country", "city", "locality"]].astype(str).drop_duplicates()
+
+        self.countries = sorted(places["country"].unique())
+        self._cities = {
+            country: sorted(group["city"].unique())
+            for country, group in places.groupby("country", sort=False)
+        }
+
+        # Lugares do autocompletar: cada cidade e cada localidade, com a
+        # cidade e o país a que pertencem
+        cities = places.loc[:, ["country", "city"]].drop_duplicates().assign(name=lambda d: d["city"], kind="city")
+        localities = places.assign(name=places["locality"], kind="locality")
+        entries = (
+            pd.concat([cities, localities], ignore_index=True)
+            .drop_duplicates(["country", "city", "name"])
+            .sort_values(["kind", "name"], kind='stable')
+            .reset_index(drop=True)
+        )
+        self.entries = entries.loc[:, ["name", "kind", "city", "country"]]
+
+        normalized = [" ".join(tokenize(name)) for name in entries["name"]]
+        self._normalized = normalized
+        grams = {}
+        for entry, name in enumerate(normalized):
+            for gram in trigrams(name):
+                grams.setdefault(gram, []).append(entry)
+        self._grams = {gram: np.array(ids, dtype='int64') for gram, ids in grams.items()}
+        self._gram_counts = np.array([len(trigrams(name)) for name in normalized], dtype='int64')
+        self._country_codes = pd.Categorical(entries["country"], categories=self.countries).codes
+
+    # Cidades (ordenadas) dos países escolhidos; None são todos os países
+    def cities(self, countries=None):
+        if countries is None:
+            countries = self.countries
+        return sorted({city for country in countries for city in self._cities.get(country, [])})
+
+    # Cidades e localidades mais parecidas com o texto, nos países
+    # escolhidos: dataframe com nome, tipo (city/locality), cidade, país e
+    # similaridade, da mais para a menos parecida
+    def complete(self, text, countries=None, limit=10):
+        query = " ".join(tokenize(text))
+        columns = list(self.entries.columns) + ["similarity"]
+        if not query:
+            return pd.DataFrame(columns=columns)
+
+        grams = trigrams(query)
+        lists = [self._grams[gram] for gram in grams if gram in self._grams]
+        if not lists:
+            return pd.DataFrame(columns=columns)
+
+        ids, shared = np.unique(np.concatenate(lists), return_counts=True)
+        similarity = shared / (len(grams) + self._gram_counts[ids] - shared)
+        prefix = np.array([self._normalized[i].startswith(query) for i in ids])
+        similarity = np.where(prefix, np.maximum(similarity, PREFIX_SCORE), similarity)
+
+        keep = similarity >= FUZZY_THRESHOLD
+        if countries is not None:
+            codes = [self.countries.index(c) for c in countries if c in self._cities]
+            keep &= np.isin(self._country_codes[ids], codes)
+        ids, similarity = ids[keep], similarity[keep]
+
+        order = np.lexsort((ids, -similarity))[:limit]
+        return self.entries.take(ids[order]).assign(similarity=similarity[order].round(3)).reset_index(drop=True)
@@ -0,0 +1,309 @@
+# Libraries
+import numpy as np
+import pandas as pd
+
+
+#========================================================================
+#==================== Grade de Clusters por Zoom ========================
+#========================================================================
+# Colunas usadas pela grade
+GRID_COLUMNS = ["latitude", "longitude", "aggregate_rating", "votes"]
+
+# Pesos possíveis do mapa de densidade (além da simples contagem)
+DENSITY_WEIGHTS = ["votes", "aggregate_rating"]
+
+# Grade fixa do mapa de densidade na área visível: 64 x 48 células, ou
+# 16 px por célula num mapa de 1024 x 768
+DENSITY_BINS = (64, 48)
+
+# Nível mais fino da grade: 2^20 células por eixo (~40 m no equador)
+MAX_LEVEL = 20
+
+# Cada tile de 256 px do Leaflet é dividido em 4x4 células, então um cluster
+# cobre ~64 px na tela, próximo do raio padrão do Leaflet.markercluster
+CELL_LEVELS = 2
+
+# Limite de latitude da projeção Web Mercator usada pelos tiles
+MAX_LATITUDE = 85.05112878
+
+TILE_SIZE = 256
+
+# Raio médio da Terra, para as distâncias em km
+EARTH_RADIUS_KM = 6371.0088
+
+# Raio inicial da busca dos mais próximos; a busca multiplica o raio por 4
+# até achar restaurantes suficientes
+NEAREST_START_KM = 1.0
+
+
+# Posição (x, y) em [0, 1) na projeção Web Mercator, como nos tiles do mapa
+def mercator(latitude, longitude):
+    lat = np.radians(np.clip(np.asarray(latitude, dtype='float64'), -MAX_LATITUDE, MAX_LATITUDE))
+    x = (np.asarray(longitude, dtype='float64') + 180.0) / 360.0
+    y = (1.0 - np.arcsinh(np.tan(lat)) / np.pi) / 2.0
+    return np.clip(x, 0.0, np.nextafter(1.0, 0)), np.clip(y, 0.0, np.nextafter(1.0, 0))
+
+
+# Latitude e longitude de uma posição (x, y) da projeção Web Mercator
+def inverse_mercator(x, y):
+    latitude = np.degrees(np.arctan(np.sinh(np.pi * (1.0 - 2.0 * np.asarray(y, dtype='float64')))))
+    longitude = np.asarray(x, dtype='float64') * 360.0 - 180.0
+    return latitude, longitude
+
+
+# Espalha os bits de v (até 32 bits) nas posições pares de um uint64
+def _spread_bits(v):
+    v = v.astype('uint64')
+    v = (v | (v << np.uint64(16))) & np.uint64(0x0000FFFF0000FFFF)
+    v = (v | (v << np.uint64(8))) & np.uint64(0x00FF00FF00FF00FF)
+    v = (v | (v << np.uint64(4))) & np.uint64(0x0F0F0F0F0F0F0F0F)
+    v = (v | (v << np.uint64(2))) & np.uint64(0x3333333333333333)
+    v = (v | (v << np.uint64(1))) & np.uint64(0x5555555555555555)
+    return v
+
+
+# Código da célula no nível mais fino, com os bits de x e y intercalados
+# (quadkey / curva Z). A célula de um nível mais grosso é o mesmo código
+# deslocado: code >> 2 * (MAX_LEVEL - nível), como nos prefixos de um geohash.
+def quadkeys(latitude, longitude):
+    x, y = mercator(latitude, longitude)
+    cells = 2 ** MAX_LEVEL
+    ix = (x * cells).astype('uint32')
+    iy = (y * cells).astype('uint32')
+    return _spread_bits(ix) | (_spread_bits(iy) << np.uint64(1))
+
+
+# Maior zoom em que a caixa (lat_min, lat_max, lon_min, lon_max) cabe num
+# mapa de width x height pixels
+def fit_zoom(lat_min, lat_max, lon_min, lon_max, width, height, max_zoom=18):
+    x0, y1 = mercator(lat_min, lon_min)
+    x1, y0 = mercator(lat_max, lon_max)
+    span_x = max(float(x1 - x0), 1e-12)
+    span_y = max(float(y1 - y0), 1e-12)
+    zoom = np.floor(np.log2(min(width / (TILE_SIZE * span_x), height / (TILE_SIZE * span_y))))
+    return int(np.clip(zoom, 0, max_zoom))
+
+
+# Distância em km (fórmula de haversine) entre um ponto e vários
+def haversine_km(latitude, longitude, latitudes, longitudes):
+    lat1, lon1 = np.radians(latitude), np.radians(longitude)
+    lat2, lon2 = np.radians(latitudes), np.radians(longitudes)
+    a = np.sin((lat2 - lat1) / 2) ** 2 + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+# Caixas (lat_min, lat_max, lon_min, lon_max) que contêm o círculo de
+# radius_km em volta do ponto. Um círculo que cruza a linha de 180° vira
+# duas caixas, uma de cada lado.
+def radius_bounds(latitude, longitude, radius_km):
+    angle = radius_km / EARTH_RADIUS_KM
+    lat_min = latitude - np.degrees(angle)
+    lat_max = latitude + np.degrees(angle)
+    if lat_min <= -90 or lat_max >= 90 or angle >= np.pi / 2:
+        return [(max(lat_min, -90.0), min(lat_max, 90.0), -180.0, 180.0)]
+
+    delta = np.degrees(np.arcsin(min(np.sin(angle) / np.cos(np.radians(latitude)), 1.0)))
+    lon_min, lon_max = longitude - delta, longitude + delta
+    if lon_max - lon_min >= 360:
+        return [(lat_min, lat_max, -180.0, 180.0)]
+    if lon_min < -180:
+        return [(lat_min, lat_max, lon_min + 360, 180.0), (lat_min, lat_max, -180.0, lon_max)]
+    if lon_max > 180:
+        return [(lat_min, lat_max, lon_min, 180.0), (lat_min, lat_max, -180.0, lon_max - 360)]
+    return [(lat_min, lat_max, lon_min, lon_max)]
+
+
+# Caixa (lat_min, lat_max, lon_min, lon_max) visível num mapa de width x
+# height pixels centrado em `center` no `zoom`
+def viewport_bounds(center, zoom, width, height):
+    x, y = mercator(center[0], center[1])
+    half_x = width / (2 * TILE_SIZE * 2 ** zoom)
+    half_y = height / (2 * TILE_SIZE * 2 ** zoom)
+    lat_max, lon_min = inverse_mercator(x - half_x, y - half_y)
+    lat_min, lon_max = inverse_mercator(x + half_x, y + half_y)
+    return float(lat_min), float(lat_max), float(lon_min), float(lon_max)
+
+
+# Grade hierárquica dos restaurantes. As linhas são ordenadas uma vez pelo
+# quadkey, então em qualquer nível as linhas de uma mesma célula ficam
+# contíguas e os clusters de um zoom saem de somas por trechos (reduceat),
+# sem groupby nem ordenação por consulta. A mesma ordem serve de índice
+# espacial para as buscas por área, raio e mais próximos.
+class GridClusters:
+
+    def __init__(self, dataframe):
+        codes = quadkeys(dataframe["latitude"], dataframe["longitude"])
+        order = np.argsort(codes, kind='stable')
+
+        self.n_rows = len(dataframe)
+        self._order = order
+        self._codes = codes[order]
+        self._rank = np.empty(self.n_rows, dtype='int64')
+        self._rank[order] = np.arange(self.n_rows)
+        self._latitude = dataframe["latitude"].to_numpy(dtype='float64')[order]
+        self._longitude = dataframe["longitude"].to_numpy(dtype='float64')[order]
+        self._x, self._y = mercator(self._latitude, self._longitude)
+        self._rating = dataframe["aggregate_rating"].to_numpy(dtype='float64').round(6)[order]
+        self._weights = {
+            "votes": dataframe["votes"].to_numpy(dtype='float64')[order],
+            "aggregate_rating": self._rating,
+        }
+
+    # Posições (na ordem do quadkey) das linhas selecionadas. `positions` são
+    # posições no dataframe original, como as do FilterIndex.select.
+    def _sorted_positions(self, positions):
+        if positions is None:
+            return np.arange(self.n_rows)
+        mask = np.zeros(self.n_rows, dtype=bool)
+        mask[self._rank[positions]] = True
+        return np.flatnonzero(mask)
+
+    # Posições (no dataframe original, em ordem) das linhas selecionadas
+    # dentro da caixa (lat_min, lat_max, lon_min, lon_max). A caixa é coberta
+    # por no máximo 2x2 células de um nível da grade; cada célula é um trecho
+    # contíguo dos quadkeys ordenados (busca binária), e só esses candidatos
+    # são comparados com a caixa.
+    def within(self, bounds, positions=None):
+        lat_min, lat_max, lon_min, lon_max = bounds
+        lon_min, lon_max = max(lon_min, -180.0), min(lon_max, 180.0)
+        if lat_min > lat_max or lon_min > lon_max:
+            return np.array([], dtype='int64')
+
+        x0, y1 = mercator(lat_min, lon_min)
+        x1, y0 = mercator(lat_max, lon_max)
+        span = max(float(x1 - x0), float(y1 - y0), 1e-12)
+        level = int(np.clip(np.floor(-np.log2(span)), 0, MAX_LEVEL))
+
+        cells = 2 ** level
+        xs = np.arange(int(x0 * cells), int(x1 * cells) + 1)
+        ys = np.arange(int(y0 * cells), int(y1 * cells) + 1)
+        gx, gy = np.meshgrid(xs, ys)
+        prefixes = _spread_bits(gx.ravel()) | (_spread_bits(gy.ravel()) << np.uint64(1))
+
+        shift = np.uint64(2 * (MAX_LEVEL - level))
+        starts = np.searchsorted(self._codes, prefixes << shift)
+        ends = np.searchsorted(self._codes, (prefixes + np.uint64(1)) << shift)
+        idx = np.concatenate([np.arange(a, b) for a, b in zip(starts, ends)])
+
+        inside = (
+            (self._latitude[idx] >= lat_min) & (self._latitude[idx] <= lat_max)
+            & (self._longitude[idx] >= lon_min) & (self._longitude[idx] <= lon_max)
+        )
+        idx = idx[inside]
+        if positions is not None:
+            selected = np.zeros(self.n_rows, dtype=bool)
+            selected[self._rank[positions]] = True
+            idx = idx[selected[idx]]
+
+        return np.sort(self._order[idx])
+
+    # Clusters do zoom do mapa: centroide, quantidade de restaurantes e nota
+    # média de cada célula ocupada. O tamanho do resultado depende do número
+    # de células ocupadas, não do número de linhas.
+    def clusters(self, zoom, positions=None):
+        level = min(zoom + CELL_LEVELS, MAX_LEVEL)
+        idx = self._sorted_positions(positions)
+        if len(idx) == 0:
+            return pd.DataFrame(
+                {
+                    "latitude": pd.Series(dtype='float64'),
+                    "longitude": pd.Series(dtype='float64'),
+                    "restaurants": pd.Series(dtype='int64'),
+                    "aggregate_rating": pd.Series(dtype='float64'),
+                }
+            )
+
+        keys = self._codes[idx] >> np.uint64(2 * (MAX_LEVEL - level))
+        starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+        counts = np.diff(np.r_[starts, len(keys)])
+
+        return pd.DataFrame(
+            {
+                "latitude": np.add.reduceat(self._latitude[idx], starts) / counts,
+                "longitude": np.add.reduceat(self._longitude[idx], starts) / counts,
+                "restaurants": counts,
+                "aggregate_rating": np.add.reduceat(self._rating[idx], starts) / counts,
+            }
+        )
+
+    # Zoom e centro que enquadram as linhas selecionadas num mapa de
+    # width x height pixels
+    def fit(self, width, height, positions=None):
+        idx = self._sorted_positions(positions)
+        if len(idx) == 0:
+            return [0.0, 0.0], 1
+
+        lat = self._latitude[idx]
+        lon = self._longitude[idx]
+        lat_min, lat_max, lon_min, lon_max = lat.min(), lat.max(), lon.min(), lon.max()
+        zoom = fit_zoom(lat_min, lat_max, lon_min, lon_max, width, height)
+
+        # Centro da caixa na projeção do mapa (não a média das latitudes)
+        x0, y1 = mercator(lat_min, lon_min)
+        x1, y0 = mercator(lat_max, lon_max)
+        center_lat, center_lon = inverse_mercator((x0 + x1) / 2, (y0 + y1) / 2)
+        return [float(center_lat), float(center_lon)], zoom
+
+    # Restaurantes selecionados a até radius_km do ponto: (posições no
+    # dataframe original, distâncias em km), do mais próximo ao mais longe.
+    # Só as células que cobrem o círculo são lidas.
+    def radius(self, latitude, longitude, radius_km, positions=None):
+        idx = np.concatenate(
+            [self.within(box, positions) for box in radius_bounds(latitude, longitude, radius_km)]
+        ).astype('int64')
+        rank = self._rank[idx]
+        distances = haversine_km(latitude, longitude, self._latitude[rank], self._longitude[rank])
+
+        inside = distances <= radius_km
+        idx, distances = idx[inside], distances[inside]
+        order = np.argsort(distances, kind='stable')
+        return idx[order], distances[order]
+
+    # Os k restaurantes selecionados mais próximos do ponto (até radius_km,
+    # se informado), no mesmo formato de radius. O raio da busca começa em
+    # NEAREST_START_KM e é multiplicado por 4 até o círculo ter k
+    # restaurantes: com k pontos dentro de um raio r, os k mais próximos
+    # estão todos dentro dele.
+    def nearest(self, latitude, longitude, k=10, radius_km=None, positions=None):
+        max_km = np.pi * EARTH_RADIUS_KM if radius_km is None else radius_km
+        search_km = min(NEAREST_START_KM, max_km)
+        while True:
+            idx, distances = self.radius(latitude, longitude, search_km, positions)
+            if len(idx) >= k or search_km >= max_km:
+                return idx[:k], distances[:k]
+            search_km = min(search_km * 4, max_km)
+
+    # Densidade dos restaurantes selecionados na caixa (lat_min, lat_max,
+    # lon_min, lon_max), somada com np.histogram2d numa grade fixa de `bins`
+    # (colunas, linhas) na projeção do mapa: centro e peso de cada célula não
+    # vazia. O peso é a quantidade de restaurantes ou a soma de `weight`
+    # ("votes" ou "aggregate_rating"). Linhas fora da caixa são ignoradas;
+    # passar as posições de within() evita ler as demais.
+    def density(self, bounds, positions=None, weight=None, bins=DENSITY_BINS):
+        lat_min, lat_max, lon_min, lon_max = bounds
+        x0, y1 = mercator(lat_min, max(lon_min, -180.0))
+        x1, y0 = mercator(lat_max, min(lon_max, 180.0))
+
+        idx = np.arange(self.n_rows) if positions is None else self._rank[positions]
+        if len(idx) == 0 or x1 <= x0 or y1 <= y0:
+            return pd.DataFrame(
+                {
+                    "latitude": pd.Series(dtype='float64'),
+                    "longitude": pd.Series(dtype='float64'),
+                    "weight": pd.Series(dtype='float64'),
+                }
+            )
+
+        hist, x_edges, y_edges = np.histogram2d(
+            self._x[idx],
+            self._y[idx],
+            bins=bins,
+            range=[[float(x0), float(x1)], [float(y0), float(y1)]],
+            weights=None if weight is None else self._weights[weight][idx],
+        )
+        ix, iy = np.nonzero(hist)
+        latitude, longitude = inverse_mercator(
+            (x_edges[ix] + x_edges[ix + 1]) / 2,
+            (y_edges[iy] + y_edges[iy + 1]) / 2,
+        )
+        return pd.DataFrame({"latitude": latitude, "longitude": longitude, "weight": hist[ix, iy]})
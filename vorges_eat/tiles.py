@@ -0,0 +1,146 @@
+# Libraries
+import json
+import os
+
+import numpy as np
+
+from vorges_eat.maps import MAP_COLUMNS, popup_html
+from vorges_eat.spatial import GridClusters, mercator
+
+
+#========================================================================
+#==================== Tiles GeoJSON por Zoom ============================
+#========================================================================
+# Os tiles seguem o esquema {z}/{x}/{y} do Leaflet/OpenStreetMap (Web
+# Mercator, y de cima para baixo). Até CLUSTER_MAX_ZOOM cada tile tem os
+# clusters da grade daquele zoom; em POINT_ZOOM cada tile tem um ponto por
+# restaurante, com os campos do popup do mapa. Acima de POINT_ZOOM o cliente
+# usa os tiles de POINT_ZOOM (overzoom).
+POINT_ZOOM = 12
+CLUSTER_MAX_ZOOM = POINT_ZOOM - 1
+
+# Arquivo de descrição do conjunto de tiles (no estilo TileJSON)
+TILES_METADATA = "tiles.json"
+
+# Campos do popup de cada restaurante (os mesmos do mapa da página Países)
+POINT_FIELDS = [column for column in MAP_COLUMNS if column not in ("latitude", "longitude")]
+
+
+# Tile (x, y) do zoom que contém cada posição
+def tile_xy(latitude, longitude, zoom):
+    x, y = mercator(latitude, longitude)
+    n = 2 ** zoom
+    return (x * n).astype('int64'), (y * n).astype('int64')
+
+
+# Tiles (x, y) do zoom que cobrem a caixa (lat_min, lat_max, lon_min, lon_max)
+def tile_range(bounds, zoom):
+    lat_min, lat_max, lon_min, lon_max = bounds
+    x0, y0 = tile_xy(np.array([lat_max]), np.array([max(lon_min, -180.0)]), zoom)
+    x1, y1 = tile_xy(np.array([lat_min]), np.array([min(lon_max, 180.0)]), zoom)
+    return [(x, y) for x in range(int(x0[0]), int(x1[0]) + 1) for y in range(int(y0[0]), int(y1[0]) + 1)]
+
+
+# Agrupa as features por tile: {(x, y): [feature, ...]}
+def _group_by_tile(xs, ys, features):
+    tiles = {}
+    for x, y, feature in zip(xs.tolist(), ys.tolist(), features):
+        tiles.setdefault((x, y), []).append(feature)
+    return tiles
+
+
+def _point(latitude, longitude, properties):
+    return {
+        "type": "Feature",
+        "geometry": {"type": "Point", "coordinates": [longitude, latitude]},
+        "properties": properties,
+    }
+
+
+# Tiles de clusters de um zoom, a partir da grade: {(x, y): [feature, ...]}.
+# Cada célula da grade fica inteira dentro de um tile, então o tile do
+# centroide é o tile do cluster.
+def cluster_tiles(grid, zoom):
+    clusters = grid.clusters(zoom)
+    latitude = clusters["latitude"].round(6)
+    longitude = clusters["longitude"].round(6)
+    features = [
+        _point(lat, lon, {"restaurants": count, "aggregate_rating": rating})
+        for lat, lon, count, rating in zip(
+            latitude.tolist(),
+            longitude.tolist(),
+            clusters["restaurants"].tolist(),
+            clusters["aggregate_rating"].round(2).tolist(),
+        )
+    ]
+    xs, ys = tile_xy(latitude.to_numpy(), longitude.to_numpy(), zoom)
+    return _group_by_tile(xs, ys, features)
+
+
+# Tiles de pontos: um ponto por restaurante, com os campos e o html do popup
+def point_tiles(dataframe, zoom=POINT_ZOOM):
+    latitude = dataframe["latitude"].astype('float64').round(6)
+    longitude = dataframe["longitude"].astype('float64').round(6)
+    fields = dataframe[POINT_FIELDS].astype({"aggregate_rating": 'float64'}).round({"aggregate_rating": 6})
+    fields = fields.astype({column: str for column in ("restaurant_name", "currency", "cuisines", "color_name")})
+    fields["popup"] = popup_html(dataframe)
+    features = [
+        _point(lat, lon, properties)
+        for lat, lon, properties in zip(latitude.tolist(), longitude.tolist(), fields.to_dict('records'))
+    ]
+    xs, ys = tile_xy(latitude.to_numpy(), longitude.to_numpy(), zoom)
+    return _group_by_tile(xs, ys, features)
+
+
+# Todos os tiles: {(z, x, y): FeatureCollection}
+def build_tiles(dataframe):
+    grid = GridClusters(dataframe)
+    tiles = {}
+    for zoom in range(CLUSTER_MAX_ZOOM + 1):
+        for (x, y), features in cluster_tiles(grid, zoom).items():
+            tiles[(zoom, x, y)] = features
+    for (x, y), features in point_tiles(dataframe).items():
+        tiles[(POINT_ZOOM, x, y)] = features
+
+    return {key: {"type": "FeatureCollection", "features": features} for key, features in tiles.items()}
+
+
+# Grava os tiles em tiles_dir/{z}/{x}/{y}.geojson e o tiles.json
+def write_tiles(dataframe, tiles_dir):
+    tiles = build_tiles(dataframe)
+    for (zoom, x, y), collection in tiles.items():
+        directory = os.path.join(tiles_dir, str(zoom), str(x))
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, f"{y}.geojson"), "w", encoding="utf-8") as f:
+            json.dump(collection, f, ensure_ascii=False, separators=(",", ":"))
+
+    lat = dataframe["latitude"].astype('float64')
+    lon = dataframe["longitude"].astype('float64')
+    metadata = {
+        "format": "geojson",
+        "scheme": "xyz",
+        "tiles": ["{z}/{x}/{y}.geojson"],
+        "minzoom": 0,
+        "maxzoom": POINT_ZOOM,
+        "cluster_maxzoom": CLUSTER_MAX_ZOOM,
+        "bounds": [round(float(lon.min()), 6), round(float(lat.min()), 6),
+                   round(float(lon.max()), 6), round(float(lat.max()), 6)],
+        "fields": POINT_FIELDS + ["popup"],
+        "count": len(tiles),
+    }
+    with open(os.path.join(tiles_dir, TILES_METADATA), "w", encoding="utf-8") as f:
+        json.dump(metadata, f, indent=2)
+    return len(tiles)
+
+
+# Features dos tiles gravados que cobrem a caixa no zoom do mapa (acima de
+# POINT_ZOOM, os tiles de pontos). Só os arquivos desses tiles são lidos.
+def read_tiles(tiles_dir, bounds, zoom):
+    zoom = min(int(zoom), POINT_ZOOM)
+    features = []
+    for x, y in tile_range(bounds, zoom):
+        path = os.path.join(tiles_dir, str(zoom), str(x), f"{y}.geojson")
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                features.extend(json.load(f)["features"])
+    return {"type": "FeatureCollection", "features": features}